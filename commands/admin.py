@@ -6,9 +6,14 @@ from discord import Embed
 from discord.ext import commands
 from utils.utils import get_db_connection, clean_team_key, format_team_name
 from utils.common import commissioner_only, admin_only
+from utils.settings_cache import settings_cache
 from utils.command_logger import log_command
+from utils.league_templates import (
+    DEFAULT_TEMPLATES, apply_league_template, get_template, get_unfinished_run, list_templates,
+    save_template, snapshot_layout
+)
+from utils.team_owners import resolve_league
 from datetime import datetime, timedelta
-import asyncio
 
 DEFAULT_COMMISSIONER_ROLES = {"Commish", "Commissioners", "Commissioner"}
 ""
@@ -100,7 +105,8 @@ def setup_admin_commands(bot: commands.Bot):
             "1386985225560653844": "pro",   # Pro Annual
         }
 
-        entitlements = await get_guild_entitlements(guild_id)
+        # Just purchased: bypass the cache so the new entitlement is seen
+        entitlements = await get_guild_entitlements(guild_id, force_refresh=True)
         found_sku = next((e["sku_id"] for e in entitlements if e["sku_id"] in OTP_SKUS and e.get("ends_at") is None), None)
 
         if not found_sku:
@@ -133,9 +139,20 @@ def setup_admin_commands(bot: commands.Bot):
 
     @admin_only()
     @admin_group.command(name="setup-league", description="Create a league-ready structure with channels and permissions.")
-    @app_commands.describe(remove_existing_channels="Choose whether to delete all existing categories and channels.")
+    @app_commands.describe(
+        remove_existing_channels="Choose whether to delete existing categories and channels that aren't in the template.",
+        template="League layout to build (defaults to your league type's dynasty template)."
+    )
     @log_command("admin setup-league")
-    async def setup_league(interaction: discord.Interaction, remove_existing_channels: bool = False):
+    async def setup_league(interaction: discord.Interaction, remove_existing_channels: bool = False, template: str = None):
+        server_id = str(interaction.guild.id)
+        unfinished = await get_unfinished_run(server_id)
+        template_name = template or (unfinished[0] if unfinished else DEFAULT_TEMPLATES[resolve_league(server_id)])
+        layout = await get_template(server_id, template_name)
+        if layout is None:
+            await interaction.response.send_message(f"❌ No league template named `{template_name}`.", ephemeral=True)
+            return
+
         class ConfirmSetupView(discord.ui.View):
             def __init__(self, user, remove_existing):
                 super().__init__(timeout=30)
@@ -148,7 +165,7 @@ def setup_admin_commands(bot: commands.Bot):
                     await i.response.send_message("You're not authorized to confirm this action.", ephemeral=True)
                     return
                 await i.response.defer(ephemeral=True)
-                await run_league_setup(i, self.remove_existing)
+                await run_league_setup(i, template_name, layout, self.remove_existing)
                 self.stop()
 
             @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
@@ -159,98 +176,85 @@ def setup_admin_commands(bot: commands.Bot):
                 await i.response.send_message("Setup canceled.", ephemeral=True)
                 self.stop()
 
+        resuming = ""
+        if unfinished and unfinished[0] == template_name:
+            resuming = f"\n🔁 Resuming an unfinished `{unfinished[0]}` setup."
+            # A run started with deletes resumes with them
+            remove_existing_channels = remove_existing_channels or unfinished[1]
         await interaction.response.send_message(
-            f"⚠️ This will set up a fresh league structure.{f' It will also delete all existing channels.' if remove_existing_channels else ''}\nDo you want to continue?",
+            f"⚠️ This will set up the `{template_name}` league structure.{f' It will also delete existing channels that are not part of it.' if remove_existing_channels else ''}{resuming}\nDo you want to continue?",
             view=ConfirmSetupView(interaction.user, remove_existing_channels),
             ephemeral=True
         )
 
-    async def run_league_setup(interaction: discord.Interaction, remove_existing: bool):
-        guild = interaction.guild
-        total_created = 0
-
-        if remove_existing:
-            for cat in guild.categories:
-                for ch in cat.channels:
-                    await ch.delete()
-                await cat.delete()
-            for ch in guild.text_channels:
-                await ch.delete()
+    @setup_league.autocomplete("template")
+    async def setup_league_template_autocomplete(interaction: discord.Interaction, current: str):
+        names = await list_templates(interaction.guild.id)
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in names if current.lower() in name.lower()
+        ][:25]
 
+    async def run_league_setup(interaction: discord.Interaction, template_name: str, layout: dict, remove_existing: bool):
+        guild = interaction.guild
         server_id = str(guild.id)
         allowed_roles = DEFAULT_COMMISSIONER_ROLES.copy()
         try:
-            with get_db_connection("keys") as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT new_value FROM server_settings
-                    WHERE server_id = ? AND setting = 'commissioner_roles'
-                """, (server_id,))
-                row = cursor.fetchone()
-                if row:
-                    allowed_roles = {r.strip() for r in row[0].split(",")}
+            configured_roles = settings_cache.get(server_id, "commissioner_roles")
+            if configured_roles:
+                allowed_roles = {r.strip() for r in configured_roles.split(",")}
         except Exception as e:
             print(f"[setup-league] Failed to load commissioner roles: {e}")
 
         commish_roles = [role for role in guild.roles if role.name in allowed_roles]
 
-        structure = {
-            "Commish": [("commish-chat", "commish_only"), ("trilo-commands", "commish_only")],
-            "Main Channels": [("main-chat", "public"), ("live-streams", "public"), ("announcements", "public_read_commish_write")],
-            "League Info": [("league-info", "public_read_commish_write"), ("league-rules", "public_read_commish_write"), ("team-assignments", "public_read_commish_write"), ("team-conferences", "public_read_commish_write")],
-            "Matchups": [("team-1-vs-team-2", "public"), ("team-3-vs-team-4", "public")]
-        }
-
-        async def create_with_permissions(category, name, access_level):
-            overwrites = {guild.default_role: discord.PermissionOverwrite()}
-            if access_level == "commish_only":
-                overwrites[guild.default_role].read_messages = False
-                for r in commish_roles:
-                    overwrites[r] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
-            elif access_level == "public_read_commish_write":
-                overwrites[guild.default_role].read_messages = True
-                overwrites[guild.default_role].send_messages = False
-                for r in commish_roles:
-                    overwrites[r] = discord.PermissionOverwrite(send_messages=True)
-            else:
-                overwrites[guild.default_role].read_messages = True
-                overwrites[guild.default_role].send_messages = True
+        # Only the missing categories/channels are created (and, with remove_existing, extras deleted)
+        plan, applier = await apply_league_template(interaction, template_name, layout, commish_roles, remove_existing)
+        created_channels = [c for c in applier.created if not isinstance(c, discord.CategoryChannel)]
+        created_categories = [c.name for c in applier.created if isinstance(c, discord.CategoryChannel)]
 
-            return await guild.create_text_channel(name, overwrites=overwrites, category=category)
+        if applier.errors:
+            await interaction.followup.send(
+                f"⚠️ {len(applier.errors)} step(s) of the `{template_name}` setup failed. "
+                "Run `/admin setup-league` again to finish the remaining channels.",
+                ephemeral=True
+            )
 
-        
-        created_channels = []
-
-        for cat_name, ch_list in structure.items():
-            category = await guild.create_category(cat_name)
-            for ch_name, level in ch_list:
-                channel = await create_with_permissions(category, ch_name, level)
-                created_channels.append(channel.mention)
-
-                if ch_name == "main-chat":
-                    try:
-                        await guild.edit(system_channel=channel)
-                        print("[Trilo] System channel set to #main-chat")
-                    except Exception as e:
-                        print(f"[Trilo] Failed to set system channel: {e}")
-
-                                     
         # Send embed summary to commish-chat
-        await asyncio.sleep(1)  # Short delay to ensure channels are synced
         commish_channel = next((c for c in guild.text_channels if c.name == "commish-chat"), None)
         if commish_channel:
             embed = discord.Embed(
                 title="🏗️ League Setup Complete",
-                description=f"Trilo has created {len(created_channels)} channels across multiple categories.",
+                description=(
+                    f"Trilo has created {len(created_channels)} channels across multiple categories "
+                    f"from the `{template_name}` template."
+                    + (f" {plan.kept} channels were already in place." if plan.kept else "")
+                ),
                 color=discord.Color.green()
             )
-            embed.add_field(name="Categories Created", value="\n".join(structure.keys()), inline=False)
-            embed.add_field(name="Removed Old Channels", value="✅ Yes" if remove_existing else "❌ No", inline=False)
+            embed.add_field(name="Categories Created", value="\n".join(created_categories) or "None (all already existed)", inline=False)
+            embed.add_field(name="Removed Old Channels", value=f"✅ Yes ({applier.deleted})" if remove_existing else "❌ No", inline=False)
             embed.set_footer(text="Trilo • The Dynasty League Assistant")
             await commish_channel.send(embed=embed)
-        
+
         print(f"[Trilo] League setup completed in {guild.name} ({guild.id}) with {len(created_channels)} channels.")
 
+    @admin_only()
+    @admin_group.command(name="save-league-template", description="Save this server's categories and channels as a reusable league template.")
+    @app_commands.describe(name="Name for the template (used with /admin setup-league).")
+    @log_command("admin save-league-template")
+    async def save_league_template(interaction: discord.Interaction, name: str):
+        name = name.strip().lower()
+        try:
+            await save_template(interaction.guild.id, name, snapshot_layout(interaction.guild), interaction.user.id)
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            return
+        await interaction.response.send_message(
+            f"✅ Saved this server's layout as `{name}`. Use `/admin setup-league template:{name}` to apply it.",
+            ephemeral=True
+        )
+
     
     
     @admin_group.command(name="guide", description="View a comprehensive setup walkthrough to help you get started.")
@@ -484,7 +488,7 @@ def setup_admin_commands(bot: commands.Bot):
         # Check Discord entitlements
         try:
             from utils.entitlements import get_guild_entitlements
-            entitlements = await get_guild_entitlements(guild_id)
+            entitlements = await get_guild_entitlements(guild_id, force_refresh=True)
             
             # Check for active entitlements
             active_skus = []
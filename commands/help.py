@@ -111,6 +111,7 @@ def get_comprehensive_overview():
             "• `/admin activate-annual` — Activate annual subscription\n"
             "• `/admin check-subscription` — Check subscription status\n"
             "• `/admin setup-league` — Create league structure\n"
+            "• `/admin save-league-template` — Save layout as a template\n"
             "• `/admin guide` — Setup walkthrough"
         ),
         color=discord.Color.gold()
@@ -230,6 +231,7 @@ def get_comprehensive_overview():
             "• `/records check-record` — Check team's record\n"
             "• `/records view-all-records` — View all records\n"
             "• `/records set-record` — Manually set record\n"
+            "• `/records undo-result` — Undo the last result in a matchup\n"
             "• `/records clear-team-record` — Clear team record\n"
             "• `/records clear-all` — Wipe all records"
         ),
@@ -266,6 +268,7 @@ def get_admin_help(audience: str):
                 "• `/admin activate-annual` — Activate annual subscription\n"
                 "• `/admin check-subscription` — Check subscription status\n"
                 "• `/admin setup-league` — Create league structure\n"
+                "• `/admin save-league-template` — Save layout as a template\n"
                 "• `/admin guide` — Setup walkthrough\n\n"
                 "**Subscription Management:**\n"
                 "• `/admin purchase` — View premium plans\n"
@@ -466,6 +469,7 @@ def get_records_help(audience: str):
                 "Manage win/loss records for your league teams.\n\n"
                 "**Management Commands:**\n"
                 "• `/records set-record` — Manually set record\n"
+                "• `/records undo-result` — Undo the last result in a matchup\n"
                 "• `/records clear-team-record` — Clear team record\n"
                 "• `/records clear-all` — Wipe all records\n\n"
                 "**Viewing Commands:**\n"
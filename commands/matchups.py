@@ -6,7 +6,23 @@ from discord import app_commands, ui
 from discord import ui, Interaction, ButtonStyle
 import asyncio
 from typing import Literal
-from utils.utils import get_db_connection, clean_team_key, strip_status_suffix, apply_status_suffix, format_team_name
+from utils.utils import clean_team_key, strip_status_suffix, apply_status_suffix, format_team_name
+from utils.async_db import db
+from utils.team_owners import load_team_owners, resolve_league
+from utils.channel_provisioning import ChannelJob, provision_matchup_channels, tracker_content
+from utils.vision_cache import image_cache_key, vision_cache
+from utils.image_preprocessing import PREPROCESS_VERSION, image_preprocessor
+from utils.matchup_store import matchup_store
+from utils.tracker_sync import sync_category_trackers
+from utils.matchup_tags import tag_category_users
+from utils.permission_sync import sync_category_permissions
+from utils.channel_teardown import teardown_categories
+from utils.autocomplete_index import autocomplete_index
+from utils.team_matcher import team_matcher
+from utils.vision_extraction import MatchupStreamParser, stream_matchup_extraction
+from utils.vision_scheduler import QueuePositionReporter, VisionJob, vision_scheduler
+from utils.game_results import channel_context, record_game
+from utils.standings import standing_rows, standings
 from utils.common import commissioner_only, subscription_required, ALL_PREMIUM_SKUS
 from commands.settings import is_record_tracking_enabled, get_server_setting, is_matchup_auto_confirm_enabled
 from utils.command_logger import log_command
@@ -16,7 +32,7 @@ import base64
 import io
 from PIL import Image
 import aiohttp
-from typing import List, Tuple, Optional
+from typing import AsyncIterable, Awaitable, Callable, List, Tuple, Optional, Union
 import openai
 from openai import OpenAI
 import re
@@ -36,107 +52,109 @@ def _tables_for_guild_id(guild_id: str) -> tuple[str, str]:
         return "nfl_teams", "nfl_team_records"
     return "cfb_teams", "cfb_team_records"
 
-async def process_matchup_image(image_url: str) -> Tuple[Optional[str], List[str]]:
+def _load_tracker_snapshot(conn, teams_table: str, records_table: str, server_id: str, team1_key: str, team2_key: str):
+    """Records and owner rows for both sides of a matchup (runs on a database thread)."""
+    cursor = conn.cursor()
+
+    def get_record(team_key):
+        cursor.execute(
+            f"SELECT wins, losses FROM {records_table} WHERE server_id = ? AND team_name = ?",
+            (server_id, team_key)
+        )
+        return cursor.fetchone() or (0, 0)
+
+    rec1 = get_record(team1_key)
+    rec2 = get_record(team2_key)
+
+    cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team1_key.lower(), server_id))
+    user1 = cursor.fetchone()
+    cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team2_key.lower(), server_id))
+    user2 = cursor.fetchone()
+    return rec1, rec2, user1, user2
+
+def _add_permission_sync_fields(embed: discord.Embed, sync) -> None:
+    """Add edited / already-synced / failed channel counts from a permission sync."""
+    progress = sync.progress
+    embed.add_field(
+        name="🔄 Channels",
+        value=f"`{progress['synced']}` updated · `{progress['skipped']}` already in sync",
+        inline=False
+    )
+    failed = [job.channel.name for job in sync.jobs if job.error]
+    if failed:
+        embed.add_field(
+            name="⚠️ Failed Channels",
+            value="\n".join(f"• {name}" for name in failed[:10]) + (f"\n+ {len(failed) - 10} more" if len(failed) > 10 else ""),
+            inline=False
+        )
+
+# Bump whenever the prompt, model or response parsing changes so cached
+# extractions from the old prompt stop matching
+VISION_MODEL = "gpt-4o-mini"  # Faster and cheaper for text extraction
+EXTRACTION_PROMPT_VERSION = "2"  # Structured JSON output (utils.vision_extraction)
+
+
+async def process_matchup_image(
+    image_url: str,
+    on_matchup: Optional[Callable[[str], Awaitable[None]]] = None,
+    guild_id=None,
+    on_position: Optional[Callable[[VisionJob, int], None]] = None
+) -> Tuple[Optional[str], List[str]]:
     """
     Process an uploaded image to extract matchup information using OpenAI Vision API
+
+    The OpenAI call waits its turn in utils.vision_scheduler (on_position gets the
+    queue position), and the response is streamed (utils.vision_extraction):
+    on_matchup is awaited with each validated matchup as soon as it arrives.
+    Repeat uploads of the same image are answered from utils.vision_cache.
     
     Returns:
         Tuple of (category_name, list_of_matchups)
     """
     try:
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {OPENAI_API_KEY}"
-        }
-        
-        payload = {
-            "model": "gpt-4o-mini",  # Faster and cheaper for text extraction
-            "messages": [
-            {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": """Extract matchup information from this image.
-
-OUTPUT
-- Return only the lines under MATCHUPS in the form: Team1 vs Team2
-- One matchup per line. No numbering or extra text.
-
-CATEGORY
-- Derive a category like Week N / Playoffs / Bowl Games / Championship when present.
-- Use the most prominent identifier. If none is visible, use a generic label like Matchups.
-
-MATCHUP PARSING
-- The left side is the first team (away) and the right side is the second team (home). Treat AT/@ or column layout as away→home.
-- Ignore scores, records, dates, and UI.
-- Use the separator exactly: " vs " (space-vs-space).
-
-COLLEGE (CFB) NAMES
-- Keep the school/team wording visible in the image (city or school name is fine).
-- Remove rankings or seed numbers (e.g., 24 Florida vs 1 Alabama → Florida vs Alabama).
-
-NFL NAMES (when the image is clearly NFL)
-- Convert any city/abbr/logo to the canonical nickname only (no city):
-  Bills, Dolphins, Patriots, Jets, Ravens, Bengals, Browns, Steelers, Texans, Colts,
-  Jaguars, Titans, Broncos, Chiefs, Raiders, Chargers, Cowboys, Giants, Eagles, Commanders,
-  Bears, Lions, Packers, Vikings, Falcons, Panthers, Saints, Buccaneers, Cardinals, Rams, 49ers, Seahawks
-- Keep exact casing/spelling above (e.g., 49ers as digits).
-
-ORDER & DEDUP
-- Read top→bottom in the left column, then top→bottom in the right column.
-- If a matchup repeats, include it only once.
-
-FORMAT
-Return exactly:
-CATEGORY: [category name]
-MATCHUPS:
-Team1 vs Team2
-Team3 vs Team4
-... (one per line)
-
-If a row is incomplete or unreadable, skip it rather than guessing."""
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": image_url
-                            }
-                        }
-                    ]
-                }
-            ],
-            "max_tokens": 1000,
-            "temperature": 0.1  # Low temperature for more consistent extraction
-        }
-        
-        # Use async aiohttp instead of blocking requests library
         async with aiohttp.ClientSession() as session:
-            async with session.post("https://api.openai.com/v1/chat/completions", 
-                                   headers=headers, json=payload) as response:
+            # Download once so the bytes can be hashed, preprocessed and sent inline
+            async with session.get(image_url) as response:
                 if response.status != 200:
-                    text = await response.text()
-                    print(f"OpenAI API error: {response.status} - {text}")
+                    print(f"Image download error: {response.status}")
                     return None, []
-                
-                result = await response.json()
-                content = result['choices'][0]['message']['content']
-        
-        # Parse the response
-        lines = content.strip().split('\n')
-        category_name = None
-        matchups = []
-        
-        in_matchups_section = False
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith("CATEGORY:"):
-                category_name = line.replace("CATEGORY:", "").strip()
-            elif line == "MATCHUPS:":
-                in_matchups_section = True
-            elif in_matchups_section and line and " vs " in line:
-                matchups.append(line)
+                image_bytes = await response.read()
+                content_type = response.content_type or "image/png"
+
+            prompt_version = f"{VISION_MODEL}:{EXTRACTION_PROMPT_VERSION}:{PREPROCESS_VERSION}"
+            cache_key = image_cache_key(image_bytes, prompt_version)
+            cached = await vision_cache.get(cache_key)
+            if cached is not None:
+                if on_matchup:
+                    for matchup in cached[1]:
+                        await on_matchup(matchup)
+                return cached
+
+            # Crop/grayscale/downscale in a worker process to cut upload size and tokens
+            upload_bytes, upload_type = await image_preprocessor.process(image_bytes, content_type)
+            image_data_url = f"data:{upload_type};base64,{base64.b64encode(upload_bytes).decode('ascii')}"
+
+            parser = MatchupStreamParser()
+
+            async def extract(job: VisionJob):
+                async for matchup in stream_matchup_extraction(session, OPENAI_API_KEY, VISION_MODEL, image_data_url, parser):
+                    if on_matchup:
+                        await on_matchup(matchup)
+                if parser.usage:
+                    job.tokens_used = parser.usage.get("total_tokens")
+
+            try:
+                await vision_scheduler.submit(guild_id, extract, on_position=on_position)
+            except Exception as e:
+                # Keep whatever already streamed (callers may have queued it), but don't cache a partial read
+                print(f"Error streaming extraction: {e}")
+                return parser.category, parser.matchups
+
+        category_name, matchups = parser.category, parser.matchups
+
+        # Only cache usable extractions so a bad read can be retried
+        if matchups:
+            await vision_cache.put(cache_key, prompt_version, category_name, matchups)
         
         return category_name, matchups
         
@@ -145,6 +163,16 @@ If a row is incomplete or unreadable, skip it rather than guessing."""
         return None, []
 
 
+async def _iter_matchups(matchups):
+    """Iterate a matchup list or an async stream of matchups the same way"""
+    if hasattr(matchups, "__aiter__"):
+        async for matchup in matchups:
+            yield matchup
+    else:
+        for matchup in matchups:
+            yield matchup
+
+
 
 
 class WinnerButtonsView(ui.View):
@@ -168,44 +196,21 @@ class WinnerButtonsView(ui.View):
     def make_callback(self, winner: str, loser: str):
         async def callback(interaction: Interaction):
             try:
-                with get_db_connection("teams") as conn:
-                    cursor = conn.cursor()
-                    teams_table, records_table = _tables_for_guild_id(self.guild_id)
-                    # Check if winner or loser is CPU (not assigned to a user)
-                    cursor.execute(
-                        f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?",
-                        (winner.lower(), str(self.guild_id))
-                    )
-                    winner_user = cursor.fetchone()
-
-                    cursor.execute(
-                        f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?",
-                        (loser.lower(), str(self.guild_id))
-                    )
-                    loser_user = cursor.fetchone()
+                teams_table, records_table = _tables_for_guild_id(self.guild_id)
 
-                    # Only log records for user-controlled teams
-                    if winner_user:
-                        cursor.execute(f"""
-                            INSERT INTO {records_table} (server_id, team_name, wins, losses)
-                            VALUES (?, ?, 1, 0)
-                            ON CONFLICT(server_id, team_name) DO UPDATE SET wins = wins + 1
-                        """, (str(self.guild_id), winner))
-
-                    if loser_user:
-                        cursor.execute(f"""
-                            INSERT INTO {records_table} (server_id, team_name, wins, losses)
-                            VALUES (?, ?, 0, 1)
-                            ON CONFLICT(server_id, team_name) DO UPDATE SET losses = losses + 1
-                        """, (str(self.guild_id), loser))
+                def record_result(conn):
+                    # Appends to the game log; only user-controlled sides are counted
+                    record_game(conn, league, str(self.guild_id), winner, loser, "button",
+                                recorded_by=interaction.user.id, **channel_context(interaction.channel))
+                    return standing_rows(conn, league, str(self.guild_id), [winner, loser])
 
-                    conn.commit()
+                league = resolve_league(self.guild_id)
+                standings.apply(self.guild_id, league, await db.run("teams", record_result))
 
                 server_id = str(self.guild_id)
 
-                with get_db_connection("teams") as conn:
+                def build_displays(conn):
                     cursor = conn.cursor()
-                    teams_table, records_table = _tables_for_guild_id(server_id)
                     # Re-check user control status
                     cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (winner.lower(), server_id))
                     winner_user = cursor.fetchone()
@@ -231,6 +236,9 @@ class WinnerButtonsView(ui.View):
                             loser_display += f" ({rec[0]}-{rec[1]})"
                     else:
                         loser_display += " (CPU)"
+                    return winner_display, loser_display
+
+                winner_display, loser_display = await db.run("teams", build_displays, write=False)
 
                 await interaction.response.edit_message(
                     content=f"📊 Recorded result: **{winner_display}** wins over **{loser_display}**.",
@@ -266,25 +274,12 @@ class ShowRecordsEditPromptView(ui.View):
 
         for channel, msg, team1_key, team2_key in self.created_messages:
             try:
-                with get_db_connection("teams") as conn:
-                    cursor = conn.cursor()
-
-                    def get_record(team_key):
-                        cursor.execute("""
-                            SELECT wins, losses FROM cfb_team_records
-                            WHERE server_id = ? AND team_name = ?
-                        """, (server_id, team_key))
-                        return cursor.fetchone() or (0, 0)
-
-                    rec1 = get_record(team1_key)
-                    rec2 = get_record(team2_key)
-                    
-                    cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team1_key.lower(), server_id))
-                    user1 = cursor.fetchone()
-                    cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team2_key.lower(), server_id))
-                    user2 = cursor.fetchone()
-                    team1_cpu = user1 is None
-                    team2_cpu = user2 is None
+                rec1, rec2, user1, user2 = await db.run(
+                    "teams", _load_tracker_snapshot, "cfb_teams", "cfb_team_records", server_id, team1_key, team2_key,
+                    write=False
+                )
+                team1_cpu = user1 is None
+                team2_cpu = user2 is None
 
                 pretty_team1 = format_team_name(team1_key)
                 pretty_team2 = format_team_name(team2_key)
@@ -338,25 +333,12 @@ class ShowRecordsEditPromptViewUnified(ui.View):
 
         for channel, msg, team1_key, team2_key in self.created_messages:
             try:
-                with get_db_connection("teams") as conn:
-                    cursor = conn.cursor()
-
-                    def get_record(team_key):
-                        cursor.execute(
-                            f"SELECT wins, losses FROM {records_table} WHERE server_id = ? AND team_name = ?",
-                            (server_id, team_key)
-                        )
-                        return cursor.fetchone() or (0, 0)
-
-                    rec1 = get_record(team1_key)
-                    rec2 = get_record(team2_key)
-
-                    cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team1_key.lower(), server_id))
-                    user1 = cursor.fetchone()
-                    cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team2_key.lower(), server_id))
-                    user2 = cursor.fetchone()
-                    team1_cpu = user1 is None
-                    team2_cpu = user2 is None
+                rec1, rec2, user1, user2 = await db.run(
+                    "teams", _load_tracker_snapshot, teams_table, records_table, server_id, team1_key, team2_key,
+                    write=False
+                )
+                team1_cpu = user1 is None
+                team2_cpu = user2 is None
 
                 pretty_team1 = format_team_name(team1_key)
                 pretty_team2 = format_team_name(team2_key)
@@ -395,23 +377,6 @@ class ShowRecordsEditPromptViewUnified(ui.View):
         self.stop()
 
 
-def prettify_team(name):
-    name = name.strip()
-
-    # Handle specific replacements first
-    fixed_cases = {
-        "texas a&m": "Texas A&M",
-        "fcs school": "FCS School"
-    }
-
-    key = name.lower()
-    if key in fixed_cases:
-        return fixed_cases[key]
-
-    # Capitalize acronyms
-    acronyms = {"usc", "lsu", "ucla", "fiu", "fau", "smu", "byu", "tcu", "unlv", "utsa", "uab", "usf", "ucf", "umass", "uconn"}
-    return " ".join([w.upper() if w.lower() in acronyms else w.capitalize() for w in name.split()])
-
 def determine_best_category_name(category_names):
     """
     Determine the best category name from multiple extracted category names.
@@ -541,11 +506,18 @@ def setup_matchup_commands(bot: commands.Bot):
         
         try:
             resolved_league = _resolve_league(interaction)
+
+            # Auto-confirm: no preview, so matchups go straight into channel creation as they stream in
+            if is_matchup_auto_confirm_enabled(str(interaction.guild.id)):
+                await stream_matchups_from_images(interaction, images, category_name, game_status, roles_allowed)
+                return
+
             all_matchups = []
             all_categories = []
             
-            # Process all images in parallel for faster processing
-            tasks = [process_matchup_image(image.url) for image in images]
+            # Process all images in parallel, sharing the global vision scheduler with every other guild
+            reporter = QueuePositionReporter(interaction)
+            tasks = [process_matchup_image(image.url, guild_id=interaction.guild.id, on_position=reporter) for image in images]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Process results
@@ -582,27 +554,32 @@ def setup_matchup_commands(bot: commands.Bot):
                 )
                 return
             
+            # Snap OCR'd team names ("Miami FL", "Texs A&M") onto the league's valid teams in one pass;
+            # typo matches are fine here because the preview below shows them before anything is created
+            sides = [[name.strip() for name in matchup.split(" vs ", 1)] for matchup in all_matchups if " vs " in matchup]
+            resolved = iter(await team_matcher.resolve_pairs(resolved_league, sides, fuzzy=True))
+            for i, matchup in enumerate(all_matchups):
+                if " vs " not in matchup:
+                    continue
+                names = [name.strip() for name in matchup.split(" vs ", 1)]
+                teams = next(resolved)
+                all_matchups[i] = " vs ".join(
+                    format_team_name(team) if team else name for name, team in zip(names, teams)
+                )
+
             # Use the user-provided category name instead of extracted one
             final_category = category_name
             
             # Check for CPU vs CPU games that will be skipped
+            owners = await load_team_owners(interaction.guild.id, leagues=(_resolve_league(interaction),))
             cpu_vs_cpu_count = 0
-            with get_db_connection("teams") as conn:
-                cursor = conn.cursor()
-                for matchup in all_matchups:
-                    team1_raw, team2_raw = (matchup.split(" vs ") if " vs " in matchup else
-                                            matchup.split("-vs-") if "-vs-" in matchup else ("Team 1", "Team 2"))
-                    team1_key = clean_team_key(team1_raw.strip())
-                    team2_key = clean_team_key(team2_raw.strip())
-                    
-                    teams_table, _, _ = _tables_for_league(interaction)
-                    cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team1_key.lower(), str(interaction.guild.id)))
-                    user1 = cursor.fetchone()
-                    cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team2_key.lower(), str(interaction.guild.id)))
-                    user2 = cursor.fetchone()
-                    
-                    if user1 is None and user2 is None:
-                        cpu_vs_cpu_count += 1
+            for matchup in all_matchups:
+                team1_raw, team2_raw = (matchup.split(" vs ") if " vs " in matchup else
+                                        matchup.split("-vs-") if "-vs-" in matchup else ("Team 1", "Team 2"))
+                team1_key = clean_team_key(team1_raw.strip())
+                team2_key = clean_team_key(team2_raw.strip())
+                if owners.is_cpu(team1_key) and owners.is_cpu(team2_key):
+                    cpu_vs_cpu_count += 1
 
             # Show preview and ask for confirmation
             preview_embed = discord.Embed(
@@ -686,62 +663,31 @@ def setup_matchup_commands(bot: commands.Bot):
                     )
                     self.stop()
             
-            # Check if auto-confirm is enabled
-            server_id = str(interaction.guild.id)
-            auto_confirm = is_matchup_auto_confirm_enabled(server_id)
+            # Show the preview with a confirmation button
+            view = ConfirmImageMatchupsView(interaction.user)
             
-            if auto_confirm:
-                # Auto-confirm enabled: create matchups immediately
-                await interaction.followup.send(
-                    f"⚡ Creating matchups for {final_category}...",
-                    ephemeral=True
-                )
-                
-                # Create the matchups directly
-                if resolved_league == "nfl":
-                    await create_matchups_internal_nfl(
-                        interaction,
-                        final_category,
-                        all_matchups,
-                        game_status,
-                        roles_allowed,
-                        skip_cpu_vs_cpu=True
-                    )
-                else:
-                    await create_matchups_internal(
-                        interaction, 
-                        final_category, 
-                        all_matchups, 
-                        game_status, 
-                        roles_allowed,
-                        skip_cpu_vs_cpu=True
-                    )
-            else:
-                # Auto-confirm disabled: show confirmation button
-                view = ConfirmImageMatchupsView(interaction.user)
-                
-                # Try to send the preview with retry logic for network issues
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        await interaction.followup.send(embed=preview_embed, view=view, ephemeral=True)
-                        break  # Success, exit retry loop
-                    except (discord.HTTPException, TimeoutError, asyncio.TimeoutError) as send_error:
-                        if attempt < max_retries - 1:
-                            print(f"Failed to send preview (attempt {attempt + 1}/{max_retries}): {send_error}")
-                            await asyncio.sleep(1)  # Wait 1 second before retry
-                        else:
-                            # Final attempt failed, try sending a simpler message
-                            print(f"All attempts failed to send preview. Error: {send_error}")
-                            try:
-                                await interaction.followup.send(
-                                    "✅ Matchups extracted successfully! However, I couldn't display the preview. "
-                                    "Please use the manual creation command or try again.",
-                                    ephemeral=True
-                                )
-                            except:
-                                pass
-                            raise
+            # Try to send the preview with retry logic for network issues
+            max_retries = 3
+            for attempt in range(max_retries):
+                try:
+                    await interaction.followup.send(embed=preview_embed, view=view, ephemeral=True)
+                    break  # Success, exit retry loop
+                except (discord.HTTPException, TimeoutError, asyncio.TimeoutError) as send_error:
+                    if attempt < max_retries - 1:
+                        print(f"Failed to send preview (attempt {attempt + 1}/{max_retries}): {send_error}")
+                        await asyncio.sleep(1)  # Wait 1 second before retry
+                    else:
+                        # Final attempt failed, try sending a simpler message
+                        print(f"All attempts failed to send preview. Error: {send_error}")
+                        try:
+                            await interaction.followup.send(
+                                "✅ Matchups extracted successfully! However, I couldn't display the preview. "
+                                "Please use the manual creation command or try again.",
+                                ephemeral=True
+                            )
+                        except:
+                            pass
+                        raise
             
         except Exception as e:
             print(f"Error in create_matchups_from_image: {e}")
@@ -756,10 +702,75 @@ def setup_matchup_commands(bot: commands.Bot):
                 pass
 
 
+    async def stream_matchups_from_images(
+        interaction: discord.Interaction,
+        images: List[discord.Attachment],
+        category_name: str,
+        game_status: bool,
+        roles_allowed: str
+    ):
+        """
+        Extract every image concurrently and create channels while the responses stream in.
+        Image 1's matchups are created first, then image 2's, and so on, so channel order
+        matches the screenshots.
+        """
+        resolved_league = _resolve_league(interaction)
+        queues = [asyncio.Queue() for _ in images]
+        reporter = QueuePositionReporter(interaction)
+
+        async def extract(image, queue):
+            try:
+                return await process_matchup_image(
+                    image.url, on_matchup=queue.put, guild_id=interaction.guild.id, on_position=reporter
+                )
+            finally:
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(extract(image, queue)) for image, queue in zip(images, queues)]
+
+        async def matchups_in_order():
+            for queue in queues:
+                while (matchup := await queue.get()) is not None:
+                    # Snap OCR'd names onto the league's valid teams before the channel is named.
+                    # Nobody sees a preview on this path, so only exact and alias matches count.
+                    names = [name.strip() for name in matchup.split(" vs ", 1)]
+                    [teams] = await team_matcher.resolve_pairs(resolved_league, [names], fuzzy=False)
+                    yield " vs ".join(format_team_name(team) if team else name for name, team in zip(names, teams))
+
+        stream = matchups_in_order()
+        try:
+            first = await stream.__anext__()  # anext() is 3.10+
+        except StopAsyncIteration:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await interaction.followup.send(
+                "❌ Could not extract matchup information from any of the images. Please make sure the images clearly show team matchups.", 
+                ephemeral=True
+            )
+            return
+
+        async def all_matchups():
+            yield first
+            async for matchup in stream:
+                yield matchup
+
+        await interaction.followup.send(f"⚡ Creating matchups for {category_name}...", ephemeral=True)
+        create = create_matchups_internal_nfl if resolved_league == "nfl" else create_matchups_internal
+        await create(interaction, category_name, all_matchups(), game_status, roles_allowed, skip_cpu_vs_cpu=True)
+
+        for i, result in enumerate(await asyncio.gather(*tasks, return_exceptions=True), 1):
+            if isinstance(result, Exception) or not result[1]:
+                try:
+                    await interaction.followup.send(
+                        f"⚠️ Could not extract matchup information from image {i}. Skipping this image.", 
+                        ephemeral=True
+                    )
+                except discord.HTTPException as send_error:
+                    print(f"Could not send followup message for image {i}: {send_error}")
+
     async def create_matchups_internal(
         interaction: discord.Interaction,
         category_name: str,
-        matchups: List[str],
+        matchups: Union[List[str], AsyncIterable[str]],
         game_status: bool,
         roles_allowed: str,
         skip_cpu_vs_cpu: bool = False
@@ -786,58 +797,58 @@ def setup_matchup_commands(bot: commands.Bot):
         created_status_messages = []
         channel_names, skipped = [], []
         cpu_vs_cpu_skipped = []
-
-        for matchup in matchups:
-            team1_raw, team2_raw = (matchup.split(" vs ") if " vs " in matchup else
-                                    matchup.split("-vs-") if "-vs-" in matchup else ("Team 1", "Team 2"))
-
-            team1_key = clean_team_key(team1_raw.strip())
-            team2_key = clean_team_key(team2_raw.strip())
+        failed = []
+        jobs, job_teams = [], []
+        existing_names = {ch.name for ch in category.channels}
+        owners = await load_team_owners(guild.id, leagues=("cfb",))
+
+        async def plan_jobs():
+            # Jobs are planned as matchups arrive, so a streamed extraction starts creating right away
+            async for matchup in _iter_matchups(matchups):
+                team1_raw, team2_raw = (matchup.split(" vs ") if " vs " in matchup else
+                                        matchup.split("-vs-") if "-vs-" in matchup else ("Team 1", "Team 2"))
+
+                team1_key = clean_team_key(team1_raw.strip())
+                team2_key = clean_team_key(team2_raw.strip())
             
-            # Check if both teams are CPU (no assigned user)
-            with get_db_connection("teams") as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team1_key.lower(), str(guild.id)))
-                user1 = cursor.fetchone()
-                cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team2_key.lower(), str(guild.id)))
-                user2 = cursor.fetchone()
-
-            # Skip CPU vs CPU games if flag is set
-            if skip_cpu_vs_cpu and user1 is None and user2 is None:
-                cpu_vs_cpu_skipped.append(matchup)
-                continue
+                # Check if both teams are CPU (no assigned user)
+                user1 = owners.get(team1_key)
+                user2 = owners.get(team2_key)
 
-            channel_name = matchup.lower().replace(" ", "-")
-            existing_channel = discord.utils.get(category.channels, name=channel_name)
-            if existing_channel:
-                skipped.append(channel_name)
-                continue
-
-            channel = await guild.create_text_channel(channel_name, category=category)
-            channel_names.append(channel_name)
-
-            team1_cpu = user1 is None
-            team2_cpu = user2 is None
-
-            pretty_team1 = format_team_name(team1_key)
-            pretty_team2 = format_team_name(team2_key)
-
-            if game_status:
-                msg = await channel.send(
-                    f"🏁 **Game Status Tracker**\nReact below to update this matchup's status:\n\n"
-                    f"✅ Completed\n"
-                    f"🎲 Fair Sim\n"
-                    f"🟥 - ☑️ Force Win **{pretty_team1}{' (CPU)' if team1_cpu else ''}**\n"
-                    f"🟦 - ☑️ Force Win **{pretty_team2}{' (CPU)' if team2_cpu else ''}**",
-                    silent=True  # Add this line
-                )
-                await msg.add_reaction("✅")
-                await msg.add_reaction("🎲")
-                await msg.add_reaction("🟥")
-                await msg.add_reaction("🟦")
-                created_status_messages.append((channel, msg, team1_key, team2_key))
+                # Skip CPU vs CPU games if flag is set
+                if skip_cpu_vs_cpu and user1 is None and user2 is None:
+                    cpu_vs_cpu_skipped.append(matchup)
+                    continue
 
-            await asyncio.sleep(0.1)  # Rate limiting
+                channel_name = matchup.lower().replace(" ", "-")
+                if channel_name in existing_names:
+                    skipped.append(channel_name)
+                    continue
+                existing_names.add(channel_name)
+
+                content = None
+                if game_status:
+                    content = tracker_content(format_team_name(team1_key), format_team_name(team2_key), user1 is None, user2 is None)
+                job = ChannelJob(len(jobs), channel_name, content)
+                jobs.append(job)
+                job_teams.append((team1_key, team2_key))
+                yield job
+
+        planned = plan_jobs()
+        if not hasattr(matchups, "__aiter__"):
+            planned = [job async for job in planned]
+        await provision_matchup_channels(interaction, category, planned)
+
+        stored = []
+        for job, (team1_key, team2_key) in zip(jobs, job_teams):
+            if job.channel is None:
+                failed.append(job.channel_name)
+                continue
+            channel_names.append(job.channel_name)
+            stored.append((job.channel.id, team1_key, team2_key, job.message.id if job.message else None))
+            if job.message is not None:
+                created_status_messages.append((job.channel, job.message, team1_key, team2_key))
+        await matchup_store.record_channels(guild.id, category, "cfb", stored)
 
         # Send success message
         embed = discord.Embed(
@@ -864,6 +875,12 @@ def setup_matchup_commands(bot: commands.Bot):
                 value="\n".join([f"• {matchup}" for matchup in cpu_vs_cpu_skipped]),
                 inline=False
             )
+        if failed:
+            embed.add_field(
+                name=f"❌ Failed to Create – {len(failed)}",
+                value="\n".join([name.replace('-', ' ').title() for name in failed]),
+                inline=False
+            )
 
         await interaction.followup.send(embed=embed, ephemeral=False)
 
@@ -881,7 +898,7 @@ def setup_matchup_commands(bot: commands.Bot):
     async def create_matchups_internal_nfl(
         interaction: discord.Interaction,
         category_name: str,
-        matchups: List[str],
+        matchups: Union[List[str], AsyncIterable[str]],
         game_status: bool,
         roles_allowed: str,
         skip_cpu_vs_cpu: bool = False
@@ -903,56 +920,56 @@ def setup_matchup_commands(bot: commands.Bot):
         created_status_messages = []
         channel_names, skipped = [], []
         cpu_vs_cpu_skipped = []
+        failed = []
+        jobs, job_teams = [], []
+        existing_names = {ch.name for ch in category.channels}
+        owners = await load_team_owners(guild.id, leagues=("nfl",))
 
-        for matchup in matchups:
-            team1_raw, team2_raw = (matchup.split(" vs ") if " vs " in matchup else
-                                    matchup.split("-vs-") if "-vs-" in matchup else ("Team 1", "Team 2"))
+        async def plan_jobs():
+            # Jobs are planned as matchups arrive, so a streamed extraction starts creating right away
+            async for matchup in _iter_matchups(matchups):
+                team1_raw, team2_raw = (matchup.split(" vs ") if " vs " in matchup else
+                                        matchup.split("-vs-") if "-vs-" in matchup else ("Team 1", "Team 2"))
 
-            team1_key = clean_team_key(team1_raw.strip())
-            team2_key = clean_team_key(team2_raw.strip())
+                team1_key = clean_team_key(team1_raw.strip())
+                team2_key = clean_team_key(team2_raw.strip())
 
-            with get_db_connection("teams") as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT user_id FROM nfl_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team1_key.lower(), str(guild.id)))
-                user1 = cursor.fetchone()
-                cursor.execute("SELECT user_id FROM nfl_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team2_key.lower(), str(guild.id)))
-                user2 = cursor.fetchone()
+                user1 = owners.get(team1_key)
+                user2 = owners.get(team2_key)
 
-            if skip_cpu_vs_cpu and user1 is None and user2 is None:
-                cpu_vs_cpu_skipped.append(matchup)
-                continue
+                if skip_cpu_vs_cpu and user1 is None and user2 is None:
+                    cpu_vs_cpu_skipped.append(matchup)
+                    continue
 
-            channel_name = matchup.lower().replace(" ", "-")
-            existing_channel = discord.utils.get(category.channels, name=channel_name)
-            if existing_channel:
-                skipped.append(channel_name)
+                channel_name = matchup.lower().replace(" ", "-")
+                if channel_name in existing_names:
+                    skipped.append(channel_name)
+                    continue
+                existing_names.add(channel_name)
+
+                content = None
+                if game_status:
+                    content = tracker_content(format_team_name(team1_key), format_team_name(team2_key), user1 is None, user2 is None)
+                job = ChannelJob(len(jobs), channel_name, content)
+                jobs.append(job)
+                job_teams.append((team1_key, team2_key))
+                yield job
+
+        planned = plan_jobs()
+        if not hasattr(matchups, "__aiter__"):
+            planned = [job async for job in planned]
+        await provision_matchup_channels(interaction, category, planned)
+
+        stored = []
+        for job, (team1_key, team2_key) in zip(jobs, job_teams):
+            if job.channel is None:
+                failed.append(job.channel_name)
                 continue
-
-            channel = await guild.create_text_channel(channel_name, category=category)
-            channel_names.append(channel_name)
-
-            team1_cpu = user1 is None
-            team2_cpu = user2 is None
-
-            pretty_team1 = format_team_name(team1_key)
-            pretty_team2 = format_team_name(team2_key)
-
-            if game_status:
-                msg = await channel.send(
-                    f"🏁 **Game Status Tracker**\nReact below to update this matchup's status:\n\n"
-                    f"✅ Completed\n"
-                    f"🎲 Fair Sim\n"
-                    f"🟥 - ☑️ Force Win **{pretty_team1}{' (CPU)' if team1_cpu else ''}**\n"
-                    f"🟦 - ☑️ Force Win **{pretty_team2}{' (CPU)' if team2_cpu else ''}**",
-                    silent=True
-                )
-                await msg.add_reaction("✅")
-                await msg.add_reaction("🎲")
-                await msg.add_reaction("🟥")
-                await msg.add_reaction("🟦")
-                created_status_messages.append((channel, msg, team1_key, team2_key))
-
-            await asyncio.sleep(0.1)
+            channel_names.append(job.channel_name)
+            stored.append((job.channel.id, team1_key, team2_key, job.message.id if job.message else None))
+            if job.message is not None:
+                created_status_messages.append((job.channel, job.message, team1_key, team2_key))
+        await matchup_store.record_channels(guild.id, category, "nfl", stored)
 
         embed = discord.Embed(
             title="📁 Matchup Channels Created",
@@ -977,6 +994,12 @@ def setup_matchup_commands(bot: commands.Bot):
                 value="\n".join([f"• {m}" for m in cpu_vs_cpu_skipped]),
                 inline=False
             )
+        if failed:
+            embed.add_field(
+                name=f"❌ Failed to Create – {len(failed)}",
+                value="\n".join([name.replace('-', ' ').title() for name in failed]),
+                inline=False
+            )
 
         await interaction.followup.send(embed=embed, ephemeral=False)
 
@@ -1041,52 +1064,45 @@ def setup_matchup_commands(bot: commands.Bot):
 
         created_status_messages = []
         channel_names, skipped = [], []
+        failed = []
+        jobs, job_teams = [], []
+        existing_names = {ch.name for ch in category.channels}
+        owners = await load_team_owners(guild.id, leagues=(resolved_league,))
 
         for matchup in matchups:
             channel_name = matchup.lower().replace(" ", "-")
-            existing_channel = discord.utils.get(category.channels, name=channel_name)
-            if existing_channel:
+            if channel_name in existing_names:
                 skipped.append(channel_name)
                 continue
-
-            channel = await guild.create_text_channel(channel_name, category=category)
-            channel_names.append(channel_name)
+            existing_names.add(channel_name)
 
             team1_raw, team2_raw = (matchup.split(" vs ") if " vs " in matchup else
                                     matchup.split("-vs-") if "-vs-" in matchup else ("Team 1", "Team 2"))
 
             team1_key = clean_team_key(team1_raw.strip())
             team2_key = clean_team_key(team2_raw.strip())
-            
-            with get_db_connection("teams") as conn:
-                cursor = conn.cursor()
-                teams_table, _, _ = _tables_for_league(interaction)
-                cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team1_key.lower(), str(guild.id)))
-                user1 = cursor.fetchone()
-                cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team2_key.lower(), str(guild.id)))
-                user2 = cursor.fetchone()
-
-            team1_cpu = user1 is None
-            team2_cpu = user2 is None
-
-            
-            pretty_team1 = format_team_name(team1_key)
-            pretty_team2 = format_team_name(team2_key)
 
+            content = None
             if game_status:
-                msg = await channel.send(
-                    f"🏁 **Game Status Tracker**\nReact below to update this matchup's status:\n\n"
-                    f"✅ Completed\n"
-                    f"🎲 Fair Sim\n"
-                    f"🟥 - ☑️ Force Win **{pretty_team1}{' (CPU)' if team1_cpu else ''}**\n"
-                    f"🟦 - ☑️ Force Win **{pretty_team2}{' (CPU)' if team2_cpu else ''}**",
-                    silent=True  # Add this line
+                content = tracker_content(
+                    format_team_name(team1_key), format_team_name(team2_key),
+                    owners.is_cpu(team1_key), owners.is_cpu(team2_key)
                 )
-                await msg.add_reaction("✅")
-                await msg.add_reaction("🎲")
-                await msg.add_reaction("🟥")
-                await msg.add_reaction("🟦")
-                created_status_messages.append((channel, msg, team1_key, team2_key))
+            jobs.append(ChannelJob(len(jobs), channel_name, content))
+            job_teams.append((team1_key, team2_key))
+
+        await provision_matchup_channels(interaction, category, jobs)
+
+        stored = []
+        for job, (team1_key, team2_key) in zip(jobs, job_teams):
+            if job.channel is None:
+                failed.append(job.channel_name)
+                continue
+            channel_names.append(job.channel_name)
+            stored.append((job.channel.id, team1_key, team2_key, job.message.id if job.message else None))
+            if job.message is not None:
+                created_status_messages.append((job.channel, job.message, team1_key, team2_key))
+        await matchup_store.record_channels(guild.id, category, resolved_league, stored)
 
         embed = discord.Embed(
             title="📁 Matchup Channels Created",
@@ -1105,6 +1121,12 @@ def setup_matchup_commands(bot: commands.Bot):
                 value="\n".join([name.replace('-', ' ').title() for name in skipped]),
                 inline=False
             )
+        if failed:
+            embed.add_field(
+                name=f"❌ Failed to Create – {len(failed)}",
+                value="\n".join([name.replace('-', ' ').title() for name in failed]),
+                inline=False
+            )
 
         await interaction.followup.send(embed=embed, ephemeral=False)
 
@@ -1117,9 +1139,6 @@ def setup_matchup_commands(bot: commands.Bot):
                 ephemeral=True
             )
 
-        # Adding a small delay to avoid rate-limiting
-        await asyncio.sleep(0.1)  # Adjust the delay if necessary
-
     # Adding autocomplete for category_name
     @create_matchups.autocomplete("category_name")
     async def category_autocomplete(interaction: discord.Interaction, current: str):
@@ -1152,13 +1171,8 @@ def setup_matchup_commands(bot: commands.Bot):
     @create_matchups.autocomplete("matchup_19")
     @create_matchups.autocomplete("matchup_20")
     async def matchup_autocomplete(interaction: discord.Interaction, current: str):
-        conn = get_db_connection("matchups")
-        cursor = conn.cursor()
-        _, _, matchups_table = _tables_for_league(interaction)
-        cursor.execute(f"SELECT matchup FROM \"{matchups_table}\" WHERE matchup LIKE ?", (f"{current.lower()}%",))
-        rows = cursor.fetchall()
-        await interaction.response.autocomplete(choices=[discord.app_commands.Choice(name=m[0], value=m[0]) for m in rows[:10]])
-        conn.close()
+        matchups = await autocomplete_index.matchups(resolve_league(str(interaction.guild.id)), current)
+        await interaction.response.autocomplete(choices=[discord.app_commands.Choice(name=m, value=m) for m in matchups])
 
     # Adding autocomplete for roles_allowed
     @create_matchups.autocomplete("roles_allowed")
@@ -1241,23 +1255,23 @@ def setup_matchup_commands(bot: commands.Bot):
                     return
 
                 await i.response.defer(ephemeral=True)
-                deleted_channels = []
+                teardowns = await teardown_categories(i, self.categories, self.reuse_category)
+
+                deleted_channels = [
+                    f"{name} (in {teardown.category.name})" for teardown in teardowns for name in teardown.deleted
+                ]
+                failed_channels = [
+                    f"{name} (in {teardown.category.name})" for teardown in teardowns for name in teardown.failed
+                ]
                 deleted_categories = []
-
-                for category in self.categories:
-                    # Always delete all channels in the category
-                    for ch in category.channels:
-                        await ch.delete()
-                        deleted_channels.append(f"{ch.name} (in {category.name})")
-                    
+                for teardown in teardowns:
                     # Delete or retain the category based on user choice
                     if self.reuse_category:
-                        # Keep the category name but remove all channels
-                        deleted_categories.append(f"{category.name} (channels deleted, category retained)")
+                        deleted_categories.append(f"{teardown.category.name} (channels deleted, category retained)")
+                    elif teardown.category_deleted:
+                        deleted_categories.append(f"{teardown.category.name} (completely deleted)")
                     else:
-                        # Delete the category completely
-                        await category.delete()
-                        deleted_categories.append(f"{category.name} (completely deleted)")
+                        failed_channels.append(f"{teardown.category.name} (category kept: some channels could not be deleted)")
 
                 # Create appropriate embed based on what was retained
                 if self.reuse_category:
@@ -1284,7 +1298,14 @@ def setup_matchup_commands(bot: commands.Bot):
                     )
                     embed.add_field(
                         name="Removed Categories",
-                        value="\n".join(f"• {cat}" for cat in deleted_categories),
+                        value="\n".join(f"• {cat}" for cat in deleted_categories) or "None",
+                        inline=False
+                    )
+
+                if failed_channels:
+                    embed.add_field(
+                        name="⚠️ Not Deleted",
+                        value="\n".join(f"• {ch}" for ch in failed_channels[:10]) + (f"\n... and {len(failed_channels) - 10} more" if len(failed_channels) > 10 else ""),
                         inline=False
                     )
 
@@ -1354,79 +1375,26 @@ def setup_matchup_commands(bot: commands.Bot):
             await interaction.followup.send(f"Category '{category_name}' not found.", ephemeral=True)
             return
 
-        # Database setup
-        conn = get_db_connection("teams")
-        cursor = conn.cursor()
-
-        # Special case mappings (before hyphen replacement)
-        special_mapping = {
-            "texas-am": "texas a&m"
-        }
-
-        status_suffixes = {"✅", "🎲", "☑️"}
-
-        for channel in category.channels:
-            # Remove status suffix (✅, 🎲, ☑️)
-            base_name = channel.name
-            for emoji in status_suffixes:
-                if base_name.endswith(f"-{emoji}"):
-                    base_name = base_name[:-(len(emoji) + 1)]
-                    break
-
-            if "-vs-" not in base_name:
-                continue
-
-            raw_team1, raw_team2 = base_name.split("-vs-")
-            team1_key = clean_team_key(raw_team1)
-            team2_key = clean_team_key(raw_team2)
-
-            pretty_team1 = format_team_name(team1_key)
-            pretty_team2 = format_team_name(team2_key)
-
-            # Fetch user IDs from the DB (try CFB, then NFL)
-            cursor.execute(
-                "SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?",
-                (team1_key.lower(), str(guild.id))
-            )
-            user1 = cursor.fetchone()
-            if not user1:
-                cursor.execute(
-                    "SELECT user_id FROM nfl_teams WHERE LOWER(team_name) = ? AND server_id = ?",
-                    (team1_key.lower(), str(guild.id))
-                )
-                user1 = cursor.fetchone()
+        jobs = await tag_category_users(guild, category)
+        failed = [job for job in jobs if job.error]
 
-            cursor.execute(
-                "SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?",
-                (team2_key.lower(), str(guild.id))
-            )
-            user2 = cursor.fetchone()
-            if not user2:
-                cursor.execute(
-                    "SELECT user_id FROM nfl_teams WHERE LOWER(team_name) = ? AND server_id = ?",
-                    (team2_key.lower(), str(guild.id))
-                )
-                user2 = cursor.fetchone()
-
-            user1_id = user1[0] if user1 else None
-            user2_id = user2[0] if user2 else None
-
-            # Send message
-            if user1_id and user2_id:
-                await channel.send(f"**{pretty_team1} vs {pretty_team2}**\n\n<@{user1_id}>\n<@{user2_id}>")
-            elif user1_id:
-                await channel.send(f"**{pretty_team1} vs CPU ({pretty_team2})**\n\n<@{user1_id}>")
-            elif user2_id:
-                await channel.send(f"**{pretty_team2} vs CPU ({pretty_team1})**\n\n<@{user2_id}>")
-            else:
-                await channel.send(f"No representatives found for {pretty_team1} or {pretty_team2}.")
-
-        conn.close()
         embed = discord.Embed(
             title="📣 Users Tagged in Matchup Channels",
             description=f"Player tags completed for matchups in **{category_name}**.",
             color=discord.Color.blue()
         )
+        if failed:
+            embed.description = (
+                f"Player tags sent in `{len(jobs) - len(failed)}` of `{len(jobs)}` matchup channels "
+                f"in **{category_name}**."
+            )
+            embed.add_field(
+                name="⚠️ Failed Channels",
+                value="\n".join(f"• {job.channel.name}" for job in failed[:10]),
+                inline=False
+            )
+            if len(failed) > 10:
+                embed.set_footer(text=f"+ {len(failed) - 10} more not shown")
         await interaction.followup.send(embed=embed, ephemeral=False)
 
 
@@ -1460,9 +1428,6 @@ def setup_matchup_commands(bot: commands.Bot):
             await interaction.response.send_message(f"No category named '{category_name}' found.", ephemeral=True)
             return
 
-        conn = get_db_connection("teams")
-        cursor = conn.cursor()
-
         status_suffixes = {"✅", "🎲", "☑️", "❎", "❌"}
         matchup_channels = []
 
@@ -1481,6 +1446,7 @@ def setup_matchup_commands(bot: commands.Bot):
 
         server_id = str(guild.id)
         lines = []
+        owners = await load_team_owners(server_id)
 
         for ch, raw_name, emoji in matchup_channels:
             team1_raw, team2_raw = raw_name.split("-vs-")
@@ -1490,20 +1456,16 @@ def setup_matchup_commands(bot: commands.Bot):
             pretty_team1 = format_team_name(team1_key)
             pretty_team2 = format_team_name(team2_key)
 
-            cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team1_key.lower(), server_id))
-            user1 = cursor.fetchone()
-            cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team2_key.lower(), server_id))
-            user2 = cursor.fetchone()
+            user1 = owners.get(team1_key)
+            user2 = owners.get(team2_key)
 
-            user1_mention = f"<@{user1[0]}>" if user1 else "CPU"
-            user2_mention = f"<@{user2[0]}>" if user2 else "CPU"
+            user1_mention = f"<@{user1}>" if user1 else "CPU"
+            user2_mention = f"<@{user2}>" if user2 else "CPU"
 
             line = f"**{pretty_team1}** vs **{pretty_team2}**\n{user1_mention} vs {user2_mention}{f' {emoji}' if emoji else ''}\n\n"
 
             lines.append(line)
 
-        conn.close()
-
         # Combine all lines into a single message
         if lines:
             message_content = f"🆚 **Matchups in {category_name}**\n\n" + "".join(lines)
@@ -1568,68 +1530,8 @@ def setup_matchup_commands(bot: commands.Bot):
             await interaction.followup.send(f"❌ No category named '{category_name}' found.", ephemeral=True)
             return
 
-        updated_channels = []
-
-        with get_db_connection("teams") as conn:
-            cursor = conn.cursor()
-
-            for channel in category.channels:
-                name = strip_status_suffix(channel.name)
-
-                if "-vs-" not in name:
-                    continue
-
-                team1_raw, team2_raw = name.split("-vs-")
-                team1_key = clean_team_key(team1_raw)
-                team2_key = clean_team_key(team2_raw)
-
-                pretty_team1 = format_team_name(team1_key)
-                pretty_team2 = format_team_name(team2_key)
-
-                def get_record(team_key):
-                    cursor.execute(
-                        "SELECT wins, losses FROM cfb_team_records WHERE server_id = ? AND team_name = ?",
-                        (server_id, team_key)
-                    )
-                    return cursor.fetchone() or (0, 0)
-
-                rec1 = get_record(team1_key)
-                rec2 = get_record(team2_key)
-
-                cursor.execute(
-                    "SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?",
-                    (team1_key.lower(), server_id)
-                )
-                user1 = cursor.fetchone()
-                cursor.execute(
-                    "SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?",
-                    (team2_key.lower(), server_id)
-                )
-                user2 = cursor.fetchone()
-
-                team1_cpu = user1 is None
-                team2_cpu = user2 is None
-
-                content = (
-                    f"🏁 **Game Status Tracker**\nReact below to update this matchup's status:\n\n"
-                    f"✅ Completed\n"
-                    f"🎲 Fair Sim\n"
-                    f"🟥 - ☑️ Force Win **{pretty_team1} {'(CPU)' if team1_cpu else f'({rec1[0]}-{rec1[1]})'}**\n"
-                    f"🟦 - ☑️ Force Win **{pretty_team2} {'(CPU)' if team2_cpu else f'({rec2[0]}-{rec2[1]})'}**\n\n"
-                    "*Records current as of recent sync — may not reflect live records.*"
-                )
-
-                try:
-                    messages = [msg async for msg in channel.history(limit=10)]
-                    target = next(
-                        (m for m in messages if m.author.id == interaction.client.user.id and "Game Status Tracker" in m.content),
-                        None
-                    )
-                    if target:
-                        await target.edit(content=content)
-                        updated_channels.append(channel.name)
-                except Exception as e:
-                    print(f"[Update Error] Failed in {channel.name}: {e}")
+        result = await sync_category_trackers(guild, category, interaction.client.user.id)
+        updated_channels = result.updated
 
         embed = discord.Embed(
             title="🔄 Game Status Messages Synced",
@@ -1649,9 +1551,16 @@ def setup_matchup_commands(bot: commands.Bot):
             )
             if len(updated_channels) > 10:
                 embed.set_footer(text=f"+ {len(updated_channels) - 10} more not shown")
+        elif result.unchanged:
+            embed.description = f"All game status messages under **{category_name}** are already up to date."
         else:
             embed.description = "No matchup messages were updated. Double-check channel formatting."
 
+        if result.unchanged and updated_channels:
+            embed.add_field(name="⏭️ Already Current", value=f"`{len(result.unchanged)}` unchanged", inline=True)
+        if result.failed:
+            embed.add_field(name="⚠️ Failed", value="\n".join(f"• {name}" for name in result.failed[:10]), inline=False)
+
         await interaction.followup.send(embed=embed, ephemeral=False)
 
 
@@ -1680,23 +1589,16 @@ def setup_matchup_commands(bot: commands.Bot):
         await interaction.response.defer(thinking=True)
 
         try:
-            # Make category public
+            # Make category public and sync the child channels that differ
             overwrite = {guild.default_role: discord.PermissionOverwrite(view_channel=True)}
-            await category.edit(overwrites=overwrite)
-
-            # Sync all child channels
-            for channel in category.channels:
-                try:
-                    await channel.edit(sync_permissions=True)
-                    await asyncio.sleep(0.1)
-                except Exception:
-                    continue
+            sync = await sync_category_permissions(interaction, category, overwrite, label="Making category public")
 
             embed = discord.Embed(
                 title="🌐 Category Made Public",
                 description=f"All channels in **{category_name}** are now visible to everyone in the server.",
                 color=discord.Color.green()
             )
+            _add_permission_sync_fields(embed, sync)
             await interaction.followup.send(embed=embed, ephemeral=False)
 
 
@@ -1748,14 +1650,8 @@ def setup_matchup_commands(bot: commands.Bot):
                 overwrites[role] = discord.PermissionOverwrite(view_channel=True)
 
         try:
-            await category.edit(overwrites=overwrites)
-            for channel in category.channels:
-                try:
-                    await channel.edit(sync_permissions=True)
-                    await asyncio.sleep(0.1)
-                except Exception:
-                    continue
-            
+            sync = await sync_category_permissions(interaction, category, overwrites, label="Making category private")
+
             embed = discord.Embed(
                 title="🔒 Category Made Private",
                 description=f"All channels in **{category_name}** are now restricted to select roles.",
@@ -1764,7 +1660,7 @@ def setup_matchup_commands(bot: commands.Bot):
 
             # Extract role names with view_channel permission
             allowed_roles = [
-                role.name for role, perms in category.overwrites.items()
+                role.name for role, perms in overwrites.items()
                 if isinstance(role, discord.Role) and perms.view_channel
             ]
 
@@ -1774,6 +1670,7 @@ def setup_matchup_commands(bot: commands.Bot):
                 inline=False
             )
 
+            _add_permission_sync_fields(embed, sync)
             await interaction.followup.send(embed=embed, ephemeral=False)
 
 
@@ -1866,6 +1763,8 @@ def setup_matchup_commands(bot: commands.Bot):
             targets = cat.channels
 
         created_status_messages = []
+        league = resolve_league(server_id)
+        owners = await load_team_owners(server_id, leagues=(league,))
 
         for ch in targets:
             if "-vs-" not in ch.name:
@@ -1876,22 +1775,19 @@ def setup_matchup_commands(bot: commands.Bot):
             team1_key = clean_team_key(team1_raw)
             team2_key = clean_team_key(team2_raw)
 
-            with get_db_connection("teams") as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team1_key.lower(), server_id))
-                user1 = cursor.fetchone()
-                cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (team2_key.lower(), server_id))
-                user2 = cursor.fetchone()
-
-            team1_cpu = user1 is None
-            team2_cpu = user2 is None
+            team1_cpu = owners.is_cpu(team1_key)
+            team2_cpu = owners.is_cpu(team2_key)
 
             pretty_team1 = format_team_name(team1_key)
             pretty_team2 = format_team_name(team2_key)
 
             # Delete old status message if it exists
-            messages = [msg async for msg in ch.history(limit=20)]
-            old_tracker = next((m for m in messages if m.author.id == interaction.client.user.id and "Game Status Tracker" in m.content), None)
+            record = await matchup_store.get_by_channel(ch.id)
+            if record:
+                old_tracker = ch.get_partial_message(int(record.tracker_message_id)) if record.tracker_message_id else None
+            else:
+                messages = [msg async for msg in ch.history(limit=20)]
+                old_tracker = next((m for m in messages if m.author.id == interaction.client.user.id and "Game Status Tracker" in m.content), None)
 
             if old_tracker:
                 try:
@@ -1913,6 +1809,11 @@ def setup_matchup_commands(bot: commands.Bot):
             await msg.add_reaction("🟥")
             await msg.add_reaction("🟦")
 
+            if record:
+                await matchup_store.set_tracker(ch.id, msg.id)
+            else:
+                await matchup_store.record_channels(guild.id, ch.category, league, [(ch.id, team1_key, team2_key, msg.id)])
+
             created_status_messages.append((ch, msg, team1_key, team2_key))
             await asyncio.sleep(0.1)
 
@@ -4,7 +4,8 @@ import discord
 from discord.ext import commands
 from discord import app_commands, ui, ButtonStyle, Interaction
 from enum import Enum
-from utils.utils import get_db_connection
+from utils.async_db import db
+from utils.settings_cache import settings_cache
 from utils.common import commissioner_only, subscription_required, PRO_SKUS
 from utils.command_logger import log_command
 from discord import Interaction
@@ -26,40 +27,26 @@ ATTRIBUTE_CHOICES = [
 ]
 
 
-def test_database_connection(database_name: str) -> bool:
+async def test_database_connection(database_name: str) -> bool:
     """Test if a database connection can be established"""
     try:
-        with get_db_connection(database_name) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-            return True
+        await db.fetchone(database_name, "SELECT 1")
+        return True
     except Exception as e:
         print(f"[database_test] Failed to connect to {database_name}: {e}")
         return False
 
-def log_points_action(interaction: discord.Interaction, title: str, description: str, color: discord.Color):
+async def log_points_action(interaction: discord.Interaction, title: str, description: str, color: discord.Color):
     server_id = str(interaction.guild.id)
     try:
-        # Test database connection first
-        if not test_database_connection("keys"):
-            print(f"[attributes_log] Cannot connect to keys database for server {server_id}")
-            return None
-            
-        with get_db_connection("keys") as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT new_value FROM server_settings
-                WHERE server_id = ? AND setting = 'attributes_log_channel'
-            """, (server_id,))
-            row = cursor.fetchone()
-
-        if row:
-            log_channel = interaction.guild.get_channel(int(row[0]))
+        log_channel_id = settings_cache.get(server_id, "attributes_log_channel")
+
+        if log_channel_id:
+            log_channel = interaction.guild.get_channel(int(log_channel_id))
             if log_channel:
                 embed = discord.Embed(title=title, description=description, color=color)
                 embed.set_footer(text=f"Trilo • The Dynasty League Assistant")
-                return log_channel.send(embed=embed)
+                return await log_channel.send(embed=embed)
             else:
                 print(f"[attributes_log] Log channel not found for server {server_id}")
         else:
@@ -80,10 +67,7 @@ class ConfirmClearAllPointsView(ui.View):
             return
 
         try:
-            with get_db_connection("attributes") as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM attribute_points WHERE server_id = ?", (self.server_id,))
-                conn.commit()
+            await db.execute("attributes", "DELETE FROM attribute_points WHERE server_id = ?", (self.server_id,))
 
             await interaction.response.edit_message(
                 content="🧹 All attribute points have been cleared for this server.",
@@ -116,32 +100,33 @@ class ConfirmClearAllPointsView(ui.View):
 def setup_points_commands(bot: commands.Bot):
     attributes_group = app_commands.Group(name="attributes", description="Attribute points system")
 
-    def update_points_balance(user_id: int, server_id: str, amount: int):
-        try:
-            with get_db_connection("attributes") as conn:
-                cursor = conn.cursor()
+    def _apply_points_balance(conn, user_id: int, server_id: str, amount: int):
+        cursor = conn.cursor()
 
-                cursor.execute(
-                    "SELECT available, total_earned FROM attribute_points WHERE user_id = ? AND server_id = ?",
-                    (user_id, server_id)
-                )
-                result = cursor.fetchone()
-
-                if result:
-                    new_available = result[0] + amount
-                    new_total = result[1] + amount
-                    cursor.execute(
-                        "UPDATE attribute_points SET available = ?, total_earned = ?, last_updated = datetime('now', 'localtime') WHERE user_id = ? AND server_id = ?",
-                        (new_available, new_total, user_id, server_id)
-                    )
-                else:
-                    cursor.execute(
-                        "INSERT INTO attribute_points (user_id, server_id, available, total_earned, created_at, last_updated) VALUES (?, ?, ?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'))",
-                        (user_id, server_id, amount, amount)
-                    )
-                conn.commit()
-                print(f"[update_points_balance] Successfully updated points for user {user_id}: +{amount}")
-                return True
+        cursor.execute(
+            "SELECT available, total_earned FROM attribute_points WHERE user_id = ? AND server_id = ?",
+            (user_id, server_id)
+        )
+        result = cursor.fetchone()
+
+        if result:
+            new_available = result[0] + amount
+            new_total = result[1] + amount
+            cursor.execute(
+                "UPDATE attribute_points SET available = ?, total_earned = ?, last_updated = datetime('now', 'localtime') WHERE user_id = ? AND server_id = ?",
+                (new_available, new_total, user_id, server_id)
+            )
+        else:
+            cursor.execute(
+                "INSERT INTO attribute_points (user_id, server_id, available, total_earned, created_at, last_updated) VALUES (?, ?, ?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'))",
+                (user_id, server_id, amount, amount)
+            )
+
+    async def update_points_balance(user_id: int, server_id: str, amount: int):
+        try:
+            await db.run("attributes", _apply_points_balance, user_id, server_id, amount)
+            print(f"[update_points_balance] Successfully updated points for user {user_id}: +{amount}")
+            return True
         except Exception as e:
             print(f"[update_points_balance] Error updating points for user {user_id}: {e}")
             return False
@@ -162,7 +147,7 @@ def setup_points_commands(bot: commands.Bot):
             return
 
         # Test database connections before proceeding
-        if not test_database_connection("attributes"):
+        if not await test_database_connection("attributes"):
             await interaction.response.send_message("⚠️ Database connection error. Please contact an administrator.", ephemeral=True)
             return
 
@@ -187,56 +172,52 @@ def setup_points_commands(bot: commands.Bot):
 
                 if member:
                     # Update points and check if successful
-                    if update_points_balance(member.id, server_id, amount):
+                    if await update_points_balance(member.id, server_id, amount):
                         # Log to attributes_log only if points were successfully updated
                         try:
-                            with get_db_connection("attributes") as conn:
-                                cursor = conn.cursor()
-                                cursor.execute(
-                                    "INSERT INTO attributes_log (user_id, server_id, amount, reason, given_by, created_at) VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))",
-                                    (member.id, server_id, amount, reason, interaction.user.id)
-                                )
-                                conn.commit()
-                                print(f"[give_points] Logged points for user {member.id}: +{amount}")
+                            await db.execute(
+                                "attributes",
+                                "INSERT INTO attributes_log (user_id, server_id, amount, reason, given_by, created_at) VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))",
+                                (member.id, server_id, amount, reason, interaction.user.id)
+                            )
+                            print(f"[give_points] Logged points for user {member.id}: +{amount}")
                         except Exception as e:
                             print(f"[give_points] Failed to log to attributes_log for user {member.id}: {e}")
                         
                         # Verify points were actually stored
                         try:
-                            with get_db_connection("attributes") as conn:
-                                cursor = conn.cursor()
-                                cursor.execute(
-                                    "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
-                                    (member.id, server_id)
-                                )
-                                verification = cursor.fetchone()
-                                if verification and verification[0] >= amount:
-                                    print(f"[give_points] Verification successful for user {member.id}: {verification[0]} points available")
-                                    successes.append(member.mention)
+                            verification = await db.fetchone(
+                                "attributes",
+                                "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
+                                (member.id, server_id)
+                            )
+                            if verification and verification[0] >= amount:
+                                print(f"[give_points] Verification successful for user {member.id}: {verification[0]} points available")
+                                successes.append(member.mention)
                                     
-                                    # Send DM notification to the user
-                                    try:
-                                        dm_embed = discord.Embed(
-                                            title="🎁 Attribute Points Received!",
-                                            description=f"You have received **{amount} attribute point{'s' if amount != 1 else ''}**!",
-                                            color=discord.Color.from_rgb(243, 170, 7)
-                                        )
-                                        dm_embed.add_field(name="Total Available", value=f"{verification[0]}pt(s)", inline=True)
-                                        dm_embed.add_field(name="Given By", value=interaction.user.display_name, inline=True)
-                                        dm_embed.add_field(name="League", value=interaction.guild.name, inline=True)
-                                        dm_embed.add_field(name="Reason", value=reason, inline=False)
-                                        dm_embed.add_field(name="", value="", inline=False)  # Spacing
-                                        dm_embed.add_field(name="—", value="*Do not reply to this DM. Send all attribute commands to Trilo in your league.*", inline=False)
-                                        dm_embed.set_footer(text="Trilo • The Dynasty League Assistant")
+                                # Send DM notification to the user
+                                try:
+                                    dm_embed = discord.Embed(
+                                        title="🎁 Attribute Points Received!",
+                                        description=f"You have received **{amount} attribute point{'s' if amount != 1 else ''}**!",
+                                        color=discord.Color.from_rgb(243, 170, 7)
+                                    )
+                                    dm_embed.add_field(name="Total Available", value=f"{verification[0]}pt(s)", inline=True)
+                                    dm_embed.add_field(name="Given By", value=interaction.user.display_name, inline=True)
+                                    dm_embed.add_field(name="League", value=interaction.guild.name, inline=True)
+                                    dm_embed.add_field(name="Reason", value=reason, inline=False)
+                                    dm_embed.add_field(name="", value="", inline=False)  # Spacing
+                                    dm_embed.add_field(name="—", value="*Do not reply to this DM. Send all attribute commands to Trilo in your league.*", inline=False)
+                                    dm_embed.set_footer(text="Trilo • The Dynasty League Assistant")
                                         
-                                        await member.send(embed=dm_embed)
-                                        print(f"[give_points] DM sent to user {member.id} for {amount} points received")
-                                    except Exception as e:
-                                        print(f"[give_points] Failed to send DM to user {member.id}: {e}")
+                                    await member.send(embed=dm_embed)
+                                    print(f"[give_points] DM sent to user {member.id} for {amount} points received")
+                                except Exception as e:
+                                    print(f"[give_points] Failed to send DM to user {member.id}: {e}")
                                     
-                                else:
-                                    print(f"[give_points] Verification failed for user {member.id}: expected at least {amount}, got {verification[0] if verification else 'None'}")
-                                    failures.append(f"{member.mention} (verification failed)")
+                            else:
+                                print(f"[give_points] Verification failed for user {member.id}: expected at least {amount}, got {verification[0] if verification else 'None'}")
+                                failures.append(f"{member.mention} (verification failed)")
                         except Exception as e:
                             print(f"[give_points] Verification error for user {member.id}: {e}")
                             failures.append(f"{member.mention} (verification error)")
@@ -290,7 +271,7 @@ def setup_points_commands(bot: commands.Bot):
             return
 
         # Test database connections before proceeding
-        if not test_database_connection("attributes"):
+        if not await test_database_connection("attributes"):
             await interaction.response.send_message("⚠️ Database connection error. Please contact an administrator.", ephemeral=True)
             return
 
@@ -313,56 +294,52 @@ def setup_points_commands(bot: commands.Bot):
         for member in role_members:
             try:
                 # Update points and check if successful
-                if update_points_balance(member.id, server_id, amount):
+                if await update_points_balance(member.id, server_id, amount):
                     # Log to attributes_log only if points were successfully updated
                     try:
-                        with get_db_connection("attributes") as conn:
-                            cursor = conn.cursor()
-                            cursor.execute(
-                                "INSERT INTO attributes_log (user_id, server_id, amount, reason, given_by, created_at) VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))",
-                                (member.id, server_id, amount, reason, interaction.user.id)
-                            )
-                            conn.commit()
-                            print(f"[give_points_to_role] Logged points for user {member.id}: +{amount}")
+                        await db.execute(
+                            "attributes",
+                            "INSERT INTO attributes_log (user_id, server_id, amount, reason, given_by, created_at) VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))",
+                            (member.id, server_id, amount, reason, interaction.user.id)
+                        )
+                        print(f"[give_points_to_role] Logged points for user {member.id}: +{amount}")
                     except Exception as e:
                         print(f"[give_points_to_role] Failed to log to attributes_log for user {member.id}: {e}")
                     
                     # Verify points were actually stored
                     try:
-                        with get_db_connection("attributes") as conn:
-                            cursor = conn.cursor()
-                            cursor.execute(
-                                "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
-                                (member.id, server_id)
-                            )
-                            verification = cursor.fetchone()
-                            if verification and verification[0] >= amount:
-                                print(f"[give_points_to_role] Verification successful for user {member.id}: {verification[0]} points available")
-                                successes.append(member.mention)
+                        verification = await db.fetchone(
+                            "attributes",
+                            "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
+                            (member.id, server_id)
+                        )
+                        if verification and verification[0] >= amount:
+                            print(f"[give_points_to_role] Verification successful for user {member.id}: {verification[0]} points available")
+                            successes.append(member.mention)
                                 
-                                # Send DM notification to the user
-                                try:
-                                    dm_embed = discord.Embed(
-                                        title="🎁 Attribute Points Received!",
-                                        description=f"You have received **{amount} attribute point{'s' if amount != 1 else ''}**!",
-                                        color=discord.Color.from_rgb(243, 170, 7)
-                                    )
-                                    dm_embed.add_field(name="Total Available", value=f"{verification[0]}pt(s)", inline=True)
-                                    dm_embed.add_field(name="Given By", value=interaction.user.display_name, inline=True)
-                                    dm_embed.add_field(name="League", value=interaction.guild.name, inline=True)
-                                    dm_embed.add_field(name="Reason", value=reason, inline=False)
-                                    dm_embed.add_field(name="", value="", inline=False)  # Spacing
-                                    dm_embed.add_field(name="—", value="*Do not reply to this DM. Send all attribute commands to Trilo in your league.*", inline=False)
-                                    dm_embed.set_footer(text="Trilo • The Dynasty League Assistant")
+                            # Send DM notification to the user
+                            try:
+                                dm_embed = discord.Embed(
+                                    title="🎁 Attribute Points Received!",
+                                    description=f"You have received **{amount} attribute point{'s' if amount != 1 else ''}**!",
+                                    color=discord.Color.from_rgb(243, 170, 7)
+                                )
+                                dm_embed.add_field(name="Total Available", value=f"{verification[0]}pt(s)", inline=True)
+                                dm_embed.add_field(name="Given By", value=interaction.user.display_name, inline=True)
+                                dm_embed.add_field(name="League", value=interaction.guild.name, inline=True)
+                                dm_embed.add_field(name="Reason", value=reason, inline=False)
+                                dm_embed.add_field(name="", value="", inline=False)  # Spacing
+                                dm_embed.add_field(name="—", value="*Do not reply to this DM. Send all attribute commands to Trilo in your league.*", inline=False)
+                                dm_embed.set_footer(text="Trilo • The Dynasty League Assistant")
                                     
-                                    await member.send(embed=dm_embed)
-                                    print(f"[give_points_to_role] DM sent to user {member.id} for {amount} points received")
-                                except Exception as e:
-                                    print(f"[give_points_to_role] Failed to send DM to user {member.id}: {e}")
+                                await member.send(embed=dm_embed)
+                                print(f"[give_points_to_role] DM sent to user {member.id} for {amount} points received")
+                            except Exception as e:
+                                print(f"[give_points_to_role] Failed to send DM to user {member.id}: {e}")
                                 
-                            else:
-                                print(f"[give_points_to_role] Verification failed for user {member.id}: expected at least {amount}, got {verification[0] if verification else 'None'}")
-                                failures.append(f"{member.mention} (verification failed)")
+                        else:
+                            print(f"[give_points_to_role] Verification failed for user {member.id}: expected at least {amount}, got {verification[0] if verification else 'None'}")
+                            failures.append(f"{member.mention} (verification failed)")
                     except Exception as e:
                         print(f"[give_points_to_role] Verification error for user {member.id}: {e}")
                         failures.append(f"{member.mention} (verification error)")
@@ -410,13 +387,11 @@ def setup_points_commands(bot: commands.Bot):
         user_id = interaction.user.id
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
-                (user_id, server_id)
-            )
-            row = cursor.fetchone()
+        row = await db.fetchone(
+            "attributes",
+            "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
+            (user_id, server_id)
+        )
 
         points = row[0] if row else 0
         await interaction.response.send_message(
@@ -456,29 +431,26 @@ def setup_points_commands(bot: commands.Bot):
         user_id = interaction.user.id
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
-                (user_id, server_id)
-            )
-            row = cursor.fetchone()
-            available_points = row[0] if row else 0
+        row = await db.fetchone(
+            "attributes",
+            "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
+            (user_id, server_id)
+        )
+        available_points = row[0] if row else 0
 
-            if available_points < amount:
-                await interaction.response.send_message(
-                    f"You only have **{available_points}** points available and can't request to spend {amount}.",
-                    ephemeral=True
-                )
-                return
+        if available_points < amount:
+            await interaction.response.send_message(
+                f"You only have **{available_points}** points available and can't request to spend {amount}.",
+                ephemeral=True
+            )
+            return
 
-            cursor.execute("""
-                INSERT INTO attribute_requests (
-                    user_id, server_id, player, attribute, amount, status, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, 'pending', datetime('now', 'localtime'), datetime('now', 'localtime'))
-            """, (user_id, server_id, player, attribute, amount))
-            request_number = cursor.lastrowid
-            conn.commit()
+        cursor = await db.execute("attributes", """
+            INSERT INTO attribute_requests (
+                user_id, server_id, player, attribute, amount, status, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, 'pending', datetime('now', 'localtime'), datetime('now', 'localtime'))
+        """, (user_id, server_id, player, attribute, amount))
+        request_number = cursor.lastrowid
 
         await interaction.response.send_message(
             f"📨 **Request #{request_number} Submitted**\n"
@@ -526,7 +498,7 @@ def setup_points_commands(bot: commands.Bot):
     async def approve_all_requests(interaction: Interaction, user: discord.Member = None):
         server_id = str(interaction.guild.id)
         
-        with get_db_connection("attributes") as conn:
+        def approve_pending(conn):
             cursor = conn.cursor()
             
             # Get all pending requests (filtered by user if specified)
@@ -546,10 +518,6 @@ def setup_points_commands(bot: commands.Bot):
                 """, (server_id,))
             pending_requests = cursor.fetchall()
             
-            if not pending_requests:
-                await interaction.response.send_message("📭 No pending requests to approve.", ephemeral=True)
-                return
-            
             # Check if all users have enough points
             failed_requests = []
             successful_requests = []
@@ -564,17 +532,10 @@ def setup_points_commands(bot: commands.Bot):
                 else:
                     successful_requests.append((req_id, user_id, player, attribute, amount))
             
-            if failed_requests:
-                # Show failed requests first
-                failed_msg = "⚠️ **Some requests cannot be approved due to insufficient points:**\n"
-                for req_id, user_id, player, attribute, amount, available in failed_requests:
-                    failed_msg += f"• Request #{req_id}: <@{user_id}> needs {amount}pt for {player} ({attribute}) but only has {available}pt\n"
-                
-                await interaction.response.send_message(failed_msg, ephemeral=True)
-                return
+            if not pending_requests or failed_requests:
+                return pending_requests, failed_requests, successful_requests
             
             # Process all successful requests
-            approved_count = 0
             for req_id, user_id, player, attribute, amount in successful_requests:
                 # Update user's available points
                 cursor.execute("SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?", (user_id, server_id))
@@ -584,9 +545,25 @@ def setup_points_commands(bot: commands.Bot):
                 
                 cursor.execute("UPDATE attribute_points SET available = ? WHERE user_id = ? AND server_id = ?", (new_available, user_id, server_id))
                 cursor.execute("UPDATE attribute_requests SET status = 'approved', updated_at = datetime('now', 'localtime') WHERE request_number = ?", (req_id,))
-                approved_count += 1
             
-            conn.commit()
+            return pending_requests, failed_requests, successful_requests
+
+        pending_requests, failed_requests, successful_requests = await db.run("attributes", approve_pending)
+            
+        if not pending_requests:
+            await interaction.response.send_message("📭 No pending requests to approve.", ephemeral=True)
+            return
+            
+        if failed_requests:
+            # Show failed requests first
+            failed_msg = "⚠️ **Some requests cannot be approved due to insufficient points:**\n"
+            for req_id, user_id, player, attribute, amount, available in failed_requests:
+                failed_msg += f"• Request #{req_id}: <@{user_id}> needs {amount}pt for {player} ({attribute}) but only has {available}pt\n"
+            
+            await interaction.response.send_message(failed_msg, ephemeral=True)
+            return
+
+        approved_count = len(successful_requests)
         
         # Build detailed response message
         if user:
@@ -607,10 +584,12 @@ def setup_points_commands(bot: commands.Bot):
                 user = interaction.guild.get_member(user_id)
                 if user:
                     # Get current available points for this user to show remaining
-                    with get_db_connection("attributes") as conn:
-                        cursor = conn.cursor()
-                        cursor.execute("SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?", (user_id, server_id))
-                        current_available = cursor.fetchone()[0]
+                    current_row = await db.fetchone(
+                        "attributes",
+                        "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
+                        (user_id, server_id)
+                    )
+                    current_available = current_row[0]
                     
                     dm_embed = discord.Embed(
                         title="✅ Attribute Request Approved!",
@@ -649,7 +628,7 @@ def setup_points_commands(bot: commands.Bot):
     async def deny_all_requests(interaction: Interaction, user: discord.Member = None, reason: str = "No reason provided"):
         server_id = str(interaction.guild.id)
         
-        with get_db_connection("attributes") as conn:
+        def deny_pending(conn):
             cursor = conn.cursor()
             
             # Get all pending requests (filtered by user if specified)
@@ -670,15 +649,7 @@ def setup_points_commands(bot: commands.Bot):
             
             pending_requests = cursor.fetchall()
             
-            if not pending_requests:
-                if user:
-                    await interaction.response.send_message(f"📭 No pending requests from {user.mention} to deny.", ephemeral=True)
-                else:
-                    await interaction.response.send_message("📭 No pending requests to deny.", ephemeral=True)
-                return
-            
             # Deny all requests
-            denied_count = 0
             for req_id, user_id, player, attribute, amount in pending_requests:
                 cursor.execute("UPDATE attribute_requests SET status = 'denied', updated_at = datetime('now', 'localtime') WHERE request_number = ?", (req_id,))
                 
@@ -687,10 +658,19 @@ def setup_points_commands(bot: commands.Bot):
                     INSERT INTO attributes_log (user_id, server_id, amount, reason, given_by, created_at)
                     VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))
                 """, (user_id, server_id, 0, f"Request #{req_id} denied: {reason}", interaction.user.id))
-                
-                denied_count += 1
             
-            conn.commit()
+            return pending_requests
+
+        pending_requests = await db.run("attributes", deny_pending)
+            
+        if not pending_requests:
+            if user:
+                await interaction.response.send_message(f"📭 No pending requests from {user.mention} to deny.", ephemeral=True)
+            else:
+                await interaction.response.send_message("📭 No pending requests to deny.", ephemeral=True)
+            return
+
+        denied_count = len(pending_requests)
         
         # Build detailed response message
         if user:
@@ -753,16 +733,13 @@ def setup_points_commands(bot: commands.Bot):
     async def autocomplete_pending_requests(interaction: discord.Interaction, current: str):
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT request_number, user_id, player, attribute, amount
-                FROM attribute_requests
-                WHERE status = 'pending' AND server_id = ?
-                ORDER BY timestamp DESC
-                LIMIT 25
-            """, (server_id,))
-            rows = cursor.fetchall()
+        rows = await db.fetchall("attributes", """
+            SELECT request_number, user_id, player, attribute, amount
+            FROM attribute_requests
+            WHERE status = 'pending' AND server_id = ?
+            ORDER BY timestamp DESC
+            LIMIT 25
+        """, (server_id,))
 
         results = []
         for req_id, user_id, player, attribute, amount in rows:
@@ -778,89 +755,92 @@ def setup_points_commands(bot: commands.Bot):
     async def handle_request_action(interaction: Interaction, request_number: int, decision: str, reason: str = "No reason provided"):
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT user_id, amount, player, attribute, status
-                FROM attribute_requests
-                WHERE request_number = ? AND server_id = ?
-            """, (request_number, server_id))
-            request = cursor.fetchone()
+        request = await db.fetchone("attributes", """
+            SELECT user_id, amount, player, attribute, status
+            FROM attribute_requests
+            WHERE request_number = ? AND server_id = ?
+        """, (request_number, server_id))
 
-            if not request:
-                await interaction.response.send_message("❌ No matching request found.", ephemeral=True)
-                return
+        if not request:
+            await interaction.response.send_message("❌ No matching request found.", ephemeral=True)
+            return
 
-            user_id, amount, player, attribute, current_status = request
+        user_id, amount, player, attribute, current_status = request
 
-            if current_status != "pending":
-                await interaction.response.send_message("⚠️ This request has already been processed.", ephemeral=True)
-                return
+        if current_status != "pending":
+            await interaction.response.send_message("⚠️ This request has already been processed.", ephemeral=True)
+            return
 
-            if decision == "deny":
-                cursor.execute("UPDATE attribute_requests SET status = 'denied', updated_at = datetime('now', 'localtime') WHERE request_number = ?", (request_number,))
+        if decision == "deny":
+            def deny(conn):
+                conn.execute("UPDATE attribute_requests SET status = 'denied', updated_at = datetime('now', 'localtime') WHERE request_number = ?", (request_number,))
                 
                 # Log the denied request with reason to attributes_log
-                cursor.execute("""
+                conn.execute("""
                     INSERT INTO attributes_log (user_id, server_id, amount, reason, given_by, created_at)
                     VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))
                 """, (user_id, server_id, 0, f"Request #{request_number} denied: {reason}", interaction.user.id))
-                
-                conn.commit()
 
-                await interaction.response.send_message(
-                    f"❌ Request #{request_number} by <@{user_id}> to upgrade `{attribute}` on **{player}** has been **denied**.\n📌 **Reason:** {reason}",
-                    ephemeral=False
-                )
+            await db.run("attributes", deny)
 
-                # Send DM notification to the user
-                try:
-                    user = interaction.guild.get_member(user_id)
-                    if user:
-                        dm_embed = discord.Embed(
-                            title="❌ Attribute Request Denied",
-                            description=f"Your request to upgrade **{attribute}** on **{player}** has been denied.",
-                            color=discord.Color.red()
-                        )
-                        dm_embed.add_field(name="Request #", value=f"#{request_number}", inline=True)
-                        dm_embed.add_field(name="Points Requested", value=f"{amount}pt(s)", inline=True)
-                        dm_embed.add_field(name="Denied By", value=interaction.user.display_name, inline=True)
-                        dm_embed.add_field(name="League", value=interaction.guild.name, inline=True)
-                        dm_embed.add_field(name="Reason", value=reason, inline=False)
-                        dm_embed.add_field(name="", value="", inline=False)  # Spacing
-                        dm_embed.add_field(name="—", value="*Do not reply to this DM. Send all attribute commands to Trilo in your league.*", inline=False)
-                        dm_embed.set_footer(text="Trilo • The Dynasty League Assistant")
-                        
-                        await user.send(embed=dm_embed)
-                        print(f"[deny_request] DM sent to user {user_id} for denied request #{request_number}")
-                except Exception as e:
-                    print(f"[deny_request] Failed to send DM to user {user_id}: {e}")
-
-                await log_points_action(
-                    interaction,
-                    "❌ Attribute Request Denied",
-                    f"**User:** <@{user_id}>\n**Player:** {player}\n**Attribute:** `{attribute}`\n**Amount:** {amount}pt(s)\n**Request #:** {request_number}\n**Reason:** {reason}",
-                    discord.Color.red()
-                )
-                return
+            await interaction.response.send_message(
+                f"❌ Request #{request_number} by <@{user_id}> to upgrade `{attribute}` on **{player}** has been **denied**.\n📌 **Reason:** {reason}",
+                ephemeral=False
+            )
 
-            # Approve path
-            cursor.execute("SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?", (user_id, server_id))
-            available_row = cursor.fetchone()
-            available_points = available_row[0] if available_row else 0
+            # Send DM notification to the user
+            try:
+                user = interaction.guild.get_member(user_id)
+                if user:
+                    dm_embed = discord.Embed(
+                        title="❌ Attribute Request Denied",
+                        description=f"Your request to upgrade **{attribute}** on **{player}** has been denied.",
+                        color=discord.Color.red()
+                    )
+                    dm_embed.add_field(name="Request #", value=f"#{request_number}", inline=True)
+                    dm_embed.add_field(name="Points Requested", value=f"{amount}pt(s)", inline=True)
+                    dm_embed.add_field(name="Denied By", value=interaction.user.display_name, inline=True)
+                    dm_embed.add_field(name="League", value=interaction.guild.name, inline=True)
+                    dm_embed.add_field(name="Reason", value=reason, inline=False)
+                    dm_embed.add_field(name="", value="", inline=False)  # Spacing
+                    dm_embed.add_field(name="—", value="*Do not reply to this DM. Send all attribute commands to Trilo in your league.*", inline=False)
+                    dm_embed.set_footer(text="Trilo • The Dynasty League Assistant")
+                    
+                    await user.send(embed=dm_embed)
+                    print(f"[deny_request] DM sent to user {user_id} for denied request #{request_number}")
+            except Exception as e:
+                print(f"[deny_request] Failed to send DM to user {user_id}: {e}")
 
-            if available_points < amount:
-                await interaction.response.send_message(
-                    f"⚠️ Cannot approve — <@{user_id}> only has {available_points} available points (requested {amount}).",
-                    ephemeral=True
-                )
-                return
+            await log_points_action(
+                interaction,
+                "❌ Attribute Request Denied",
+                f"**User:** <@{user_id}>\n**Player:** {player}\n**Attribute:** `{attribute}`\n**Amount:** {amount}pt(s)\n**Request #:** {request_number}\n**Reason:** {reason}",
+                discord.Color.red()
+            )
+            return
+
+        # Approve path
+        available_row = await db.fetchone(
+            "attributes",
+            "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
+            (user_id, server_id)
+        )
+        available_points = available_row[0] if available_row else 0
+
+        if available_points < amount:
+            await interaction.response.send_message(
+                f"⚠️ Cannot approve — <@{user_id}> only has {available_points} available points (requested {amount}).",
+                ephemeral=True
+            )
+            return
+
+        new_available = available_points - amount
 
-            new_available = available_points - amount
-            cursor.execute("UPDATE attribute_points SET available = ? WHERE user_id = ? AND server_id = ?", (new_available, user_id, server_id))
-            cursor.execute("UPDATE attribute_requests SET status = 'approved', updated_at = datetime('now', 'localtime') WHERE request_number = ?", (request_number,))
-            conn.commit()
+        def approve(conn):
+            conn.execute("UPDATE attribute_points SET available = ? WHERE user_id = ? AND server_id = ?", (new_available, user_id, server_id))
+            conn.execute("UPDATE attribute_requests SET status = 'approved', updated_at = datetime('now', 'localtime') WHERE request_number = ?", (request_number,))
+
+        await db.run("attributes", approve)
 
         await interaction.response.send_message(
             f"✅ Request #{request_number} by <@{user_id}> to upgrade `{attribute}` on **{player}** for **{amount}pt(s)** has been **approved**.",
@@ -904,15 +884,12 @@ def setup_points_commands(bot: commands.Bot):
     async def list_requests(interaction: discord.Interaction):
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT request_number, user_id, player, attribute, amount
-                FROM attribute_requests
-                WHERE status = 'pending' AND server_id = ?
-                ORDER BY timestamp ASC
-            """, (server_id,))
-            requests = cursor.fetchall()
+        requests = await db.fetchall("attributes", """
+            SELECT request_number, user_id, player, attribute, amount
+            FROM attribute_requests
+            WHERE status = 'pending' AND server_id = ?
+            ORDER BY timestamp ASC
+        """, (server_id,))
 
         if not requests:
             await interaction.response.send_message("✅ There are no pending attribute requests at the moment.", ephemeral=True)
@@ -938,16 +915,13 @@ def setup_points_commands(bot: commands.Bot):
             await interaction.response.send_message("🚫 You can only view your own request history.", ephemeral=True)
             return
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT request_number, player, attribute, amount, status
-                FROM attribute_requests
-                WHERE user_id = ? AND server_id = ?
-                ORDER BY request_number DESC
-                LIMIT 10
-            """, (target.id, server_id))
-            records = cursor.fetchall()
+        records = await db.fetchall("attributes", """
+            SELECT request_number, player, attribute, amount, status
+            FROM attribute_requests
+            WHERE user_id = ? AND server_id = ?
+            ORDER BY request_number DESC
+            LIMIT 10
+        """, (target.id, server_id))
 
         if not records:
             msg = "📭 You have no upgrade request history yet." if target.id == viewer.id else f"📭 <@{target.id}> has no request history."
@@ -977,34 +951,29 @@ def setup_points_commands(bot: commands.Bot):
         user_id = interaction.user.id
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT status, user_id FROM attribute_requests
-                WHERE request_number = ? AND server_id = ?
-            """, (request_number, server_id))
-            request = cursor.fetchone()
+        request = await db.fetchone("attributes", """
+            SELECT status, user_id FROM attribute_requests
+            WHERE request_number = ? AND server_id = ?
+        """, (request_number, server_id))
 
-            if not request:
-                await interaction.response.send_message("❌ No matching request found.", ephemeral=True)
-                return
+        if not request:
+            await interaction.response.send_message("❌ No matching request found.", ephemeral=True)
+            return
 
-            status, request_user_id = request
+        status, request_user_id = request
 
-            if request_user_id != user_id:
-                await interaction.response.send_message("🚫 You can only cancel your own requests.", ephemeral=True)
-                return
+        if request_user_id != user_id:
+            await interaction.response.send_message("🚫 You can only cancel your own requests.", ephemeral=True)
+            return
 
-            if status != "pending":
-                await interaction.response.send_message("⚠️ Only pending requests can be canceled.", ephemeral=True)
-                return
+        if status != "pending":
+            await interaction.response.send_message("⚠️ Only pending requests can be canceled.", ephemeral=True)
+            return
 
-            cursor.execute("""
-                DELETE FROM attribute_requests
-                WHERE request_number = ? AND user_id = ? AND server_id = ?
-            """, (request_number, user_id, server_id))
-            conn.commit()
+        await db.execute("attributes", """
+            DELETE FROM attribute_requests
+            WHERE request_number = ? AND user_id = ? AND server_id = ?
+        """, (request_number, user_id, server_id))
 
         await interaction.response.send_message(f"🗑️ Request `#{request_number}` has been canceled successfully.", ephemeral=False)
         
@@ -1036,39 +1005,38 @@ def setup_points_commands(bot: commands.Bot):
 
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
+        row = await db.fetchone(
+            "attributes",
+            "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
+            (user.id, server_id)
+        )
 
-            cursor.execute(
-                "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
-                (user.id, server_id)
-            )
-            row = cursor.fetchone()
+        if not row:
+            await interaction.response.send_message(f"{user.mention} does not have any points on record.", ephemeral=True)
+            return
 
-            if not row:
-                await interaction.response.send_message(f"{user.mention} does not have any points on record.", ephemeral=True)
-                return
+        available = row[0]
+        if available < amount:
+            await interaction.response.send_message(
+                f"{user.mention} only has **{available}** points available. Cannot revoke {amount}.",
+                ephemeral=True
+            )
+            return
 
-            available = row[0]
-            if available < amount:
-                await interaction.response.send_message(
-                    f"{user.mention} only has **{available}** points available. Cannot revoke {amount}.",
-                    ephemeral=True
-                )
-                return
+        new_available = available - amount
 
-            new_available = available - amount
-            cursor.execute(
+        def revoke(conn):
+            conn.execute(
                 "UPDATE attribute_points SET available = ? WHERE user_id = ? AND server_id = ?",
                 (new_available, user.id, server_id)
             )
 
-            cursor.execute("""
+            conn.execute("""
                 INSERT INTO attributes_log (user_id, server_id, amount, reason, given_by, created_at)
                 VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))
             """, (user.id, server_id, -amount, reason, interaction.user.id))
 
-            conn.commit()
+        await db.run("attributes", revoke)
 
         await interaction.response.send_message(
             f"🚫 Revoked **{amount} points** from {user.mention}\n📌 **Reason:** {reason}",
@@ -1110,13 +1078,11 @@ def setup_points_commands(bot: commands.Bot):
     async def check_user_points(interaction: discord.Interaction, user: discord.Member):
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
-                (user.id, server_id)
-            )
-            row = cursor.fetchone()
+        row = await db.fetchone(
+            "attributes",
+            "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
+            (user.id, server_id)
+        )
 
         available = row[0] if row else 0
 
@@ -1132,15 +1098,12 @@ def setup_points_commands(bot: commands.Bot):
     async def view_all_points(interaction: discord.Interaction):
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT user_id, available
-                FROM attribute_points
-                WHERE server_id = ?
-                ORDER BY available DESC
-            """, (server_id,))
-            records = cursor.fetchall()
+        records = await db.fetchall("attributes", """
+            SELECT user_id, available
+            FROM attribute_points
+            WHERE server_id = ?
+            ORDER BY available DESC
+        """, (server_id,))
 
         if not records:
             await interaction.response.send_message("📭 No users have points recorded yet.", ephemeral=True)
@@ -1181,32 +1144,32 @@ def setup_points_commands(bot: commands.Bot):
     async def revoke_all_from_user(interaction: discord.Interaction, user: discord.Member, reason: str = "No reason provided"):
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("attributes") as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
-                (user.id, server_id)
-            )
-            row = cursor.fetchone()
+        row = await db.fetchone(
+            "attributes",
+            "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?",
+            (user.id, server_id)
+        )
 
-            if not row:
-                await interaction.response.send_message(f"{user.mention} does not have any points on record.", ephemeral=True)
-                return
+        if not row:
+            await interaction.response.send_message(f"{user.mention} does not have any points on record.", ephemeral=True)
+            return
 
-            available = row[0]
-            if available == 0:
-                await interaction.response.send_message(f"{user.mention} already has 0 points.", ephemeral=True)
-                return
+        available = row[0]
+        if available == 0:
+            await interaction.response.send_message(f"{user.mention} already has 0 points.", ephemeral=True)
+            return
 
-            cursor.execute(
+        def reset(conn):
+            conn.execute(
                 "UPDATE attribute_points SET available = 0 WHERE user_id = ? AND server_id = ?",
                 (user.id, server_id)
             )
-            cursor.execute("""
+            conn.execute("""
                 INSERT INTO attributes_log (user_id, server_id, amount, reason, given_by, created_at)
                 VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))
             """, (user.id, server_id, -available, f"Full reset: {reason}", interaction.user.id))
-            conn.commit()
+
+        await db.run("attributes", reset)
 
         await interaction.response.send_message(
             f"🛑 **Reset {available} points** from {user.mention}\n📌 **Reason:** {reason}",
@@ -2,18 +2,24 @@ import discord
 from discord import app_commands, ui, ButtonStyle, Interaction
 from discord.ext import commands
 import sqlite3
-from utils.utils import get_db_connection, format_team_name, clean_team_key, format_team_name
+from utils.utils import format_team_name, clean_team_key, format_team_name
+from utils.async_db import db
+from utils.game_results import clear_record, reset_records, set_record, undo_last_game
+from utils.standings import standing_rows, standings
+from utils.autocomplete_index import autocomplete_index
+from utils.team_matcher import team_matcher
+from utils.team_owners import resolve_league
 from utils.common import commissioner_only, subscription_required, CORE_SKUS
 from commands.settings import is_record_tracking_enabled, get_server_setting
 from utils.command_logger import log_command
 
 
 class ConfirmDeleteRecordsView(ui.View):
-    def __init__(self, interaction: Interaction, server_id: str, records_table: str):
+    def __init__(self, interaction: Interaction, server_id: str, league: str):
         super().__init__(timeout=30)
         self.interaction = interaction
         self.server_id = server_id
-        self.records_table = records_table
+        self.league = league
 
     @ui.button(label="Yes, Clear All", style=ButtonStyle.danger)
     async def confirm(self, interaction: Interaction, button: ui.Button):
@@ -22,10 +28,10 @@ class ConfirmDeleteRecordsView(ui.View):
             return
 
         try:
-            with get_db_connection("teams") as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"DELETE FROM {self.records_table} WHERE server_id = ?", (self.server_id,))
-                conn.commit()
+            # Logged as a reset so the cleared season can still be rebuilt from the log
+            await db.run("teams", reset_records, self.league, self.server_id, recorded_by=interaction.user.id)
+            standings.invalidate(self.server_id, self.league)
+            autocomplete_index.invalidate_guild(self.server_id)
 
             await interaction.response.edit_message(
                 content="🧹 All team win/loss records have been cleared.",
@@ -50,13 +56,13 @@ class ConfirmDeleteRecordsView(ui.View):
         self.stop()
 
 class ConfirmDeleteSingleRecordView(ui.View):
-    def __init__(self, interaction: Interaction, server_id: str, team_key: str, display_name: str, records_table: str):
+    def __init__(self, interaction: Interaction, server_id: str, team_key: str, display_name: str, league: str):
         super().__init__(timeout=30)
         self.interaction = interaction
         self.server_id = server_id
         self.team_key = team_key
         self.display_name = display_name
-        self.records_table = records_table
+        self.league = league
 
     @ui.button(label="Yes, Clear Record", style=ButtonStyle.danger)
     async def confirm(self, interaction: Interaction, button: ui.Button):
@@ -65,10 +71,9 @@ class ConfirmDeleteSingleRecordView(ui.View):
             return
 
         try:
-            with get_db_connection("teams") as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"DELETE FROM {self.records_table} WHERE server_id = ? AND team_name = ?", (self.server_id, self.team_key))
-                conn.commit()
+            await db.run("teams", clear_record, self.league, self.server_id, self.team_key, recorded_by=interaction.user.id)
+            standings.apply(self.server_id, self.league, [], removed=[self.team_key])
+            autocomplete_index.invalidate_guild(self.server_id)
 
             await interaction.response.edit_message(
                 content=f"🧹 Record for **{self.display_name}** has been cleared.",
@@ -120,8 +125,7 @@ def setup_records_commands(bot: commands.Bot):
             return
         
         server_id = str(interaction.guild.id)
-        records_table, _ = _tables_for_league(interaction)
-        view = ConfirmDeleteRecordsView(interaction, server_id, records_table)
+        view = ConfirmDeleteRecordsView(interaction, server_id, resolve_league(server_id))
 
         await interaction.response.send_message(
             "⚠️ Are you sure you want to clear **all** team win/loss records for this server?",
@@ -146,8 +150,7 @@ def setup_records_commands(bot: commands.Bot):
         team_key = clean_team_key(team_name)
         display_name = format_team_name(team_key)
 
-        records_table, _ = _tables_for_league(interaction)
-        view = ConfirmDeleteSingleRecordView(interaction, server_id, team_key, display_name, records_table)
+        view = ConfirmDeleteSingleRecordView(interaction, server_id, team_key, display_name, resolve_league(server_id))
 
         await interaction.response.send_message(
             f"⚠️ Are you sure you want to clear the win/loss record for **{display_name}**?",
@@ -158,20 +161,11 @@ def setup_records_commands(bot: commands.Bot):
     @clear_single_team_record.autocomplete("team_name")
     async def autocomplete_team_name(interaction: discord.Interaction, current: str):
         server_id = str(interaction.guild.id)
-        records_table, _ = _tables_for_league(interaction)
-        with get_db_connection("teams") as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT DISTINCT team_name FROM {records_table}
-                WHERE server_id = ? AND team_name LIKE ?
-                ORDER BY team_name ASC
-                LIMIT 10
-            """, (server_id, f"{current.lower()}%"))
-            results = cursor.fetchall()
+        results = await autocomplete_index.record_teams(server_id, resolve_league(server_id), current)
 
         return [
             discord.app_commands.Choice(name=team.replace("-", " ").title(), value=team)
-            for team, in results
+            for team in results
         ]
     
     @subscription_required(allowed_skus=CORE_SKUS)
@@ -187,17 +181,15 @@ def setup_records_commands(bot: commands.Bot):
             return
 
         server_id = str(interaction.guild.id)
-        team_key = clean_team_key(team_name)
+        # Typed names ("Miami FL", "Ohio St") resolve to the stored team key
+        team_key = await team_matcher.resolve(resolve_league(server_id), team_name) or clean_team_key(team_name)
         pretty_name = format_team_name(team_key)
 
         records_table, _ = _tables_for_league(interaction)
-        with get_db_connection("teams") as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT wins, losses FROM {records_table}
-                WHERE server_id = ? AND team_name = ?
-            """, (server_id, team_key))
-            record = cursor.fetchone()
+        record = await db.fetchone("teams", f"""
+            SELECT wins, losses FROM {records_table}
+            WHERE server_id = ? AND team_name = ?
+        """, (server_id, team_key))
 
         if record:
             wins, losses = record
@@ -208,20 +200,11 @@ def setup_records_commands(bot: commands.Bot):
     @check_team_record.autocomplete("team_name")
     async def autocomplete_team_name(interaction: discord.Interaction, current: str):
         server_id = str(interaction.guild.id)
-        records_table, _ = _tables_for_league(interaction)
-        with get_db_connection("teams") as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT DISTINCT team_name FROM {records_table}
-                WHERE server_id = ? AND team_name LIKE ?
-                ORDER BY team_name ASC
-                LIMIT 10
-            """, (server_id, f"{current.lower()}%"))
-            results = cursor.fetchall()
+        results = await autocomplete_index.record_teams(server_id, resolve_league(server_id), current)
 
         return [
             discord.app_commands.Choice(name=team.replace("-", " ").title(), value=team)
-            for team, in results
+            for team in results
         ]
 
     @subscription_required(allowed_skus=CORE_SKUS)
@@ -237,54 +220,12 @@ def setup_records_commands(bot: commands.Bot):
 
         server_id = str(interaction.guild.id)
 
-        records_table, teams_table = _tables_for_league(interaction)
-        with get_db_connection("teams") as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT r.team_name, r.wins, r.losses
-                FROM {records_table} r
-                JOIN {teams_table} t ON r.server_id = t.server_id AND r.team_name = t.team_name
-                WHERE r.server_id = ?
-            """, (server_id,))
-            rows = cursor.fetchall()
-
-        if not rows:
+        # Materialized ranking; the embed is cached until a record changes
+        embed = await standings.embed(server_id, resolve_league(server_id))
+        if embed is None:
             await interaction.response.send_message("📭 No win/loss records found for this server.", ephemeral=True)
             return
 
-        # Calculate win % and sort
-        records = []
-        for team, wins, losses in rows:
-            games = wins + losses
-            win_pct = wins / games if games > 0 else 0
-            records.append((team, wins, losses, win_pct))
-
-        records.sort(key=lambda x: (-x[3], -x[1]))  # Sort by win%, then wins
-
-        # Format standings
-        lines = []
-        medals = ["🥇", "🥈", "🥉"]
-        for i, (team, wins, losses, win_pct) in enumerate(records[:32], start=1):
-            pretty_team = format_team_name(team)
-
-            # Try to find the user assigned to this team
-            cursor.execute(f"""
-                SELECT user_id FROM {teams_table}
-                WHERE server_id = ? AND team_name = ?
-            """, (server_id, team))
-            owner_row = cursor.fetchone()
-            user_tag = f"<@{owner_row[0]}>" if owner_row else "CPU"
-
-            prefix = medals[i-1] if i <= 3 else f"{i}."
-            lines.append(f"**{prefix} {user_tag} — {pretty_team} — {wins}-{losses}**")
-
-
-
-        embed = discord.Embed(
-            title="🏆 Team Records",
-            description="\n".join(lines[:32]),
-            color=discord.Color.gold()
-        )
         await interaction.response.send_message(embed=embed, ephemeral=False)
 
     @subscription_required(allowed_skus=CORE_SKUS)
@@ -312,13 +253,10 @@ def setup_records_commands(bot: commands.Bot):
 
         # Lookup team for the user
         _, teams_table = _tables_for_league(interaction)
-        with get_db_connection("teams") as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"""
-                SELECT team_name FROM {teams_table}
-                WHERE server_id = ? AND user_id = ?
-            """, (server_id, user.id))
-            result = cursor.fetchone()
+        result = await db.fetchone("teams", f"""
+            SELECT team_name FROM {teams_table}
+            WHERE server_id = ? AND user_id = ?
+        """, (server_id, user.id))
 
         if not result:
             await interaction.response.send_message(f"❌ {user.mention} does not have a team assigned.", ephemeral=True)
@@ -328,16 +266,14 @@ def setup_records_commands(bot: commands.Bot):
         pretty_name = format_team_name(team_key)
 
         try:
-            records_table, _ = _tables_for_league(interaction)
-            with get_db_connection("teams") as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"""
-                    INSERT INTO {records_table} (server_id, team_name, wins, losses, last_updated)
-                    VALUES (?, ?, ?, ?, datetime('now', 'localtime'))
-                    ON CONFLICT(server_id, team_name)
-                    DO UPDATE SET wins = excluded.wins, losses = excluded.losses, last_updated = datetime('now', 'localtime')
-                """, (server_id, team_key, wins, losses))
-                conn.commit()
+            league = resolve_league(server_id)
+
+            def write_record(conn):
+                set_record(conn, league, server_id, team_key, wins, losses, recorded_by=interaction.user.id)
+                return standing_rows(conn, league, server_id, [team_key])
+
+            standings.apply(server_id, league, await db.run("teams", write_record))
+            autocomplete_index.invalidate_guild(server_id)
 
             await interaction.response.send_message(
                 f"✅ Record for **{pretty_name}** ({user.mention}) set to **{wins}-{losses}**.",
@@ -349,6 +285,53 @@ def setup_records_commands(bot: commands.Bot):
 
 
 
+    @subscription_required(allowed_skus=CORE_SKUS)
+    @commissioner_only()
+    @records_group.command(name="undo-result", description="Undo the last game result recorded in a matchup channel.")
+    @app_commands.describe(channel="Matchup channel to undo the last result in (defaults to this channel)")
+    @log_command("records undo-result")
+    async def undo_game_result(interaction: discord.Interaction, channel: discord.TextChannel = None):
+
+        server_id = str(interaction.guild.id)
+        if not is_record_tracking_enabled(server_id):
+            await interaction.response.send_message("⚠️ Record tracking is not enabled in this server.", ephemeral=True)
+            return
+
+        channel = channel or interaction.channel
+        league = resolve_league(server_id)
+
+        def undo(conn):
+            undone = undo_last_game(conn, league, server_id, channel_id=channel.id, recorded_by=interaction.user.id)
+            if not undone:
+                return None, []
+            _, winner, loser, _ = undone
+            return undone, standing_rows(conn, league, server_id, [winner, loser])
+
+        try:
+            undone, rows = await db.run("teams", undo)
+        except Exception as e:
+            print(f"[undo_game_result] Error: {e}")
+            await interaction.response.send_message("⚠️ Failed to undo the result.", ephemeral=True)
+            return
+
+        if not undone:
+            await interaction.response.send_message(f"📭 No recorded results to undo in {channel.mention}.", ephemeral=True)
+            return
+
+        _, winner, loser, week = undone
+        # A team undone back to 0-0 no longer has a records row
+        kept = {row[0] for row in rows}
+        standings.apply(server_id, league, rows, removed=[team for team in (winner, loser) if team not in kept])
+        records = {team: (wins, losses) for team, wins, losses, _ in rows}
+        winner_str = f" ({records[winner][0]}-{records[winner][1]})" if winner in records else ""
+        loser_str = f" ({records[loser][0]}-{records[loser][1]})" if loser in records else ""
+        await interaction.response.send_message(
+            f"↩️ Undid **{format_team_name(winner)}** over **{format_team_name(loser)}**"
+            f"{f' ({week})' if week else ''}. Records now: **{format_team_name(winner)}**{winner_str}, "
+            f"**{format_team_name(loser)}**{loser_str}.",
+            ephemeral=True
+        )
+
     # Overview command removed - use /help feature records instead
 
     bot.tree.add_command(records_group)
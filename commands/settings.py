@@ -2,67 +2,41 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Literal
-from utils.utils import get_db_connection
+from utils.async_db import db
+from utils.settings_cache import settings_cache
 from utils.common import commissioner_only, subscription_required, ALL_PREMIUM_SKUS
 from typing import Union
 from utils.command_logger import log_command
 
 
 def get_server_setting(server_id: str, setting: str) -> Union[str, None]:
-    """Get a server setting value from database, return None if not set"""
-    with get_db_connection("keys") as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-                SELECT new_value FROM server_settings
-                WHERE server_id = ? AND setting = ?
-            """,
-            (server_id, setting),
-        )
-        row = cursor.fetchone()
-        return row[0] if row and row[0] else None
+    """Get a server setting value (cached per guild), return None if not set"""
+    value = settings_cache.get(server_id, setting)
+    return value if value else None
 
 
 def is_record_tracking_enabled(server_id: str) -> bool:
-    with get_db_connection("keys") as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT new_value FROM server_settings
-            WHERE server_id = ? AND setting = 'record_tracking_enabled'
-        """, (server_id,))
-        row = cursor.fetchone()
-        return row and row[0].strip().lower() == "on"
+    value = settings_cache.get(server_id, "record_tracking_enabled")
+    return bool(value) and value.strip().lower() == "on"
 
 
 def is_matchup_auto_confirm_enabled(server_id: str) -> bool:
     """Check if auto-confirm is enabled for create-from-image matchups"""
-    with get_db_connection("keys") as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT new_value FROM server_settings
-            WHERE server_id = ? AND setting = 'matchup_auto_confirm'
-        """, (server_id,))
-        row = cursor.fetchone()
-        return row and row[0].strip().lower() == "on"
+    value = settings_cache.get(server_id, "matchup_auto_confirm")
+    return bool(value) and value.strip().lower() == "on"
 
 
 def get_commissioner_roles(server_id: str) -> set:
-    """Get commissioner roles from database, fallback to default if not set"""
-    with get_db_connection("keys") as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT new_value FROM server_settings
-            WHERE server_id = ? AND setting = 'commissioner_roles'
-        """, (server_id,))
-        row = cursor.fetchone()
-        
-        if row and row[0]:
-            # Parse comma-separated roles from database
-            roles = {role.strip() for role in row[0].split(",")}
-            return roles
-        else:
-            # Fallback to default roles
-            return {"Commish", "Commissioners", "Commissioner", "commish", "commissioners", "commissioner"}
+    """Get commissioner roles from settings, fallback to default if not set"""
+    value = settings_cache.get(server_id, "commissioner_roles")
+
+    if value:
+        # Parse comma-separated roles from settings
+        roles = {role.strip() for role in value.split(",")}
+        return roles
+    else:
+        # Fallback to default roles
+        return {"Commish", "Commissioners", "Commissioner", "commish", "commissioners", "commissioner"}
 
 
 def setup_settings_commands(bot: commands.Bot):
@@ -166,14 +140,12 @@ def setup_settings_commands(bot: commands.Bot):
 
 
         # Insert or update the setting
-        with get_db_connection("keys") as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO server_settings (server_id, setting, new_value, created_at, updated_at)
-                VALUES (?, ?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'))
-                ON CONFLICT(server_id, setting) DO UPDATE SET new_value = excluded.new_value, updated_at = datetime('now', 'localtime')
-            """, (server_id, setting, value_to_store))
-            conn.commit()
+        await db.execute("keys", """
+            INSERT INTO server_settings (server_id, setting, new_value, created_at, updated_at)
+            VALUES (?, ?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'))
+            ON CONFLICT(server_id, setting) DO UPDATE SET new_value = excluded.new_value, updated_at = datetime('now', 'localtime')
+        """, (server_id, setting, value_to_store))
+        settings_cache.invalidate(server_id)
 
         if setting in {"attributes_log_channel", "stream_watch_channel"}:
             channel = interaction.guild.get_channel(int(value_to_store))
@@ -256,13 +228,10 @@ def setup_settings_commands(bot: commands.Bot):
     async def view_settings(interaction: discord.Interaction):
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("keys") as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT setting, new_value FROM server_settings
-                WHERE server_id = ?
-            """, (server_id,))
-            settings = cursor.fetchall()
+        settings = await db.fetchall("keys", """
+            SELECT setting, new_value FROM server_settings
+            WHERE server_id = ?
+        """, (server_id,))
 
         if not settings:
             await interaction.response.send_message("⚙️ This server has no custom settings yet.", ephemeral=True)
@@ -312,10 +281,8 @@ def setup_settings_commands(bot: commands.Bot):
 
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("keys") as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM server_settings WHERE server_id = ? AND setting = ?", (server_id, setting))
-            conn.commit()
+        await db.execute("keys", "DELETE FROM server_settings WHERE server_id = ? AND setting = ?", (server_id, setting))
+        settings_cache.invalidate(server_id)
 
         await interaction.response.send_message(f"🗑️ Setting `{setting}` has been reset.", ephemeral=False)
 
@@ -328,10 +295,8 @@ def setup_settings_commands(bot: commands.Bot):
 
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("keys") as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM server_settings WHERE server_id = ?", (server_id,))
-            conn.commit()
+        await db.execute("keys", "DELETE FROM server_settings WHERE server_id = ?", (server_id,))
+        settings_cache.invalidate(server_id)
 
         await interaction.response.send_message("🧹 All settings for this server have been cleared.", ephemeral=False)
 
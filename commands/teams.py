@@ -3,7 +3,12 @@ import discord
 from discord import app_commands, ui, ButtonStyle, Interaction
 from discord.ext import commands
 import sqlite3
-from utils.utils import get_db_connection, format_team_name, clean_team_key, format_team_name
+from utils.utils import format_team_name, clean_team_key, format_team_name
+from utils.async_db import db
+from utils.standings import standings
+from utils.autocomplete_index import autocomplete_index
+from utils.team_matcher import team_matcher
+from utils.team_owners import resolve_league
 from utils.common import commissioner_only, subscription_required, ALL_PREMIUM_SKUS
 from commands.settings import is_record_tracking_enabled, get_server_setting
 from utils.command_logger import log_command
@@ -25,6 +30,62 @@ def setup_team_commands(bot: commands.Bot):
             return "nfl_teams", "nfl_valid_teams"
         return "cfb_teams", "cfb_valid_teams"
 
+    async def _assign_team(interaction: discord.Interaction, user: discord.Member, team_name_lower: str, team_name: str):
+        """Assign user to a validated team; returns (response message, ephemeral)"""
+        teams_table, _ = _tables_for_league(interaction)
+
+        # Check if the team is already assigned to another user
+        existing_assignment = await db.fetchone(
+            "teams",
+            f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?",
+            (team_name_lower, str(interaction.guild.id))
+        )
+
+        if existing_assignment:
+            # If the team is already assigned to a user, notify the commissioner
+            assigned_user_id = existing_assignment[0]
+            try:
+                assigned_user = await interaction.guild.fetch_member(assigned_user_id)
+                return f"'{team_name}' is already assigned to {assigned_user.mention}. Please choose another team.", True
+            except discord.NotFound:
+                # User no longer exists, remove the assignment and continue
+                await db.execute("teams", f"DELETE FROM {teams_table} WHERE user_id = ? AND server_id = ?", (assigned_user_id, str(interaction.guild.id)))
+                standings.invalidate(interaction.guild.id)
+                autocomplete_index.invalidate_guild(interaction.guild.id)
+
+        # Proceed with assigning the user to the team after validation
+        server_id = str(interaction.guild.id)  # Get the server ID
+
+        def reassign(conn):
+            cursor = conn.cursor()
+
+            # Check if the user is already assigned to a team in this server
+            cursor.execute(f"SELECT team_name FROM {teams_table} WHERE user_id = ? AND server_id = ?", (user.id, server_id))
+            existing_team = cursor.fetchone()
+
+            # Remove the previous team assignment if the user is already assigned to a team
+            if existing_team:
+                cursor.execute(f"DELETE FROM {teams_table} WHERE user_id = ? AND server_id = ?", (user.id, server_id))
+
+            # Now assign the user to the new team
+            cursor.execute(
+                f"INSERT INTO {teams_table} (team_name, user_id, server_id, created_at, updated_at) VALUES (?, ?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'))",
+                (team_name_lower, user.id, server_id)
+            )
+            return existing_team
+
+        # Swap + insert run as one transaction; a failure rolls back both
+        existing_team = await db.run("teams", reassign)
+        standings.invalidate(server_id)
+        autocomplete_index.invalidate_guild(server_id)
+
+        # Prepare the response message
+        if existing_team:
+            old_team = existing_team[0]  # Retrieve the old team name from the result
+            return f"{user.mention} has been removed from '{old_team}' and assigned to '{team_name_lower}'.", False
+        # If the user was not previously assigned to a team, notify about the new assignment
+        return f"{user.mention} has been assigned to '{team_name_lower}' in this server.", False
+
     # ─────────────────────────────────────────────────────────────
     # Unified commands (default to server league_type, fallback CFB)
     # ─────────────────────────────────────────────────────────────
@@ -34,75 +95,73 @@ def setup_team_commands(bot: commands.Bot):
     @app_commands.describe(user="The user to assign.", team_name="The team to assign the user to.")
     @log_command("teams assign-user")
     async def assign_user_to_team_unified(interaction: discord.Interaction, user: discord.Member, team_name: str):
-        conn = None
         try:
             # Validate team_name via autocomplete
-            conn = get_db_connection("teams")
-            cursor = conn.cursor()
-            teams_table, valid_table = _tables_for_league(interaction)
+            _, valid_table = _tables_for_league(interaction)
 
             # Convert team_name to lowercase for uniformity
             team_name_lower = team_name.lower()
 
-            # Check if the team_name exists in the valid teams table
-            cursor.execute(f"SELECT 1 FROM {valid_table} WHERE team_name = ?", (team_name_lower,))
-            if not cursor.fetchone():
-                await interaction.response.send_message(f"'{team_name}' is not a valid team. Please choose a valid team.", ephemeral=True)
-                return
-
-            # Check if the team is already assigned to another user
-            cursor.execute(f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team_name_lower, str(interaction.guild.id)))
-            existing_assignment = cursor.fetchone()
-
-            if existing_assignment:
-                # If the team is already assigned to a user, notify the commissioner
-                assigned_user_id = existing_assignment[0]
-                try:
-                    assigned_user = await interaction.guild.fetch_member(assigned_user_id)
-                    await interaction.response.send_message(f"'{team_name}' is already assigned to {assigned_user.mention}. Please choose another team.", ephemeral=True)
-                except discord.NotFound:
-                    # User no longer exists, remove the assignment and continue
-                    cursor.execute(f"DELETE FROM {teams_table} WHERE user_id = ? AND server_id = ?", (assigned_user_id, str(interaction.guild.id)))
-                    conn.commit()
-                else:
+            # Check if the team_name exists in the valid teams table, falling back to aliases
+            if not await db.fetchone("teams", f"SELECT 1 FROM {valid_table} WHERE team_name = ?", (team_name_lower,)):
+                league = _resolve_league(interaction)
+                matched = await team_matcher.resolve(league, team_name)
+                if not matched:
+                    # A typo is only ever a suggestion: the commissioner confirms it before anything is assigned
+                    suggestion = await team_matcher.resolve(league, team_name, fuzzy=True)
+                    if not suggestion:
+                        await interaction.response.send_message(f"'{team_name}' is not a valid team. Please choose a valid team.", ephemeral=True)
+                        return
+
+                    class ConfirmSuggestedTeamView(ui.View):
+                        def __init__(self):
+                            super().__init__(timeout=30)
+
+                        @ui.button(label="Yes, Assign", style=ButtonStyle.success)
+                        async def confirm(self, i: discord.Interaction, button: ui.Button):
+                            if i.user != interaction.user:
+                                await i.response.send_message("You are not authorized to confirm this.", ephemeral=True)
+                                return
+
+                            self.stop()
+                            try:
+                                message, ephemeral = await _assign_team(i, user, suggestion, format_team_name(suggestion))
+                            except Exception as e:
+                                print(f"Error in assign_user_to_team: {e}")
+                                await i.response.edit_message(content="An error occurred while assigning the team. Please try again.", view=None)
+                                return
+                            if ephemeral:
+                                await i.response.edit_message(content=message, view=None)
+                            else:
+                                await i.response.edit_message(content=f"✅ Assigning **{format_team_name(suggestion)}**.", view=None)
+                                await i.followup.send(message)
+
+                        @ui.button(label="Cancel", style=ButtonStyle.secondary)
+                        async def cancel(self, i: discord.Interaction, button: ui.Button):
+                            if i.user != interaction.user:
+                                await i.response.send_message("You are not authorized to cancel this.", ephemeral=True)
+                                return
+
+                            await i.response.edit_message(content="Cancelled. No team was assigned.", view=None)
+                            self.stop()
+
+                    await interaction.response.send_message(
+                        f"'{team_name}' is not a valid team. Did you mean **{format_team_name(suggestion)}**?",
+                        view=ConfirmSuggestedTeamView(),
+                        ephemeral=True
+                    )
                     return
+                team_name_lower = matched
+                team_name = format_team_name(matched)
 
-            # Proceed with assigning the user to the team after validation
-            server_id = str(interaction.guild.id)  # Get the server ID
-
-            # Check if the user is already assigned to a team in this server
-            cursor.execute(f"SELECT team_name FROM {teams_table} WHERE user_id = ? AND server_id = ?", (user.id, server_id))
-            existing_team = cursor.fetchone()
+            message, ephemeral = await _assign_team(interaction, user, team_name_lower, team_name)
 
-            # Prepare the response message
-            if existing_team:
-                old_team = existing_team[0]  # Retrieve the old team name from the result
-                # Remove the previous team assignment if the user is already assigned to a team
-                cursor.execute(f"DELETE FROM {teams_table} WHERE user_id = ? AND server_id = ?", (user.id, server_id))
-                conn.commit()
-                response_message = f"{user.mention} has been removed from '{old_team}' and assigned to '{team_name_lower}'."
-            else:
-                # If the user was not previously assigned to a team, notify about the new assignment
-                response_message = f"{user.mention} has been assigned to '{team_name_lower}' in this server."
-            
-            # Now assign the user to the new team
-            cursor.execute(
-                f"INSERT INTO {teams_table} (team_name, user_id, server_id, created_at, updated_at) VALUES (?, ?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'))",
-                (team_name_lower, user.id, server_id)
-            )
-            conn.commit()
-            
             # Send response after all database operations are complete
-            await interaction.response.send_message(response_message)
+            await interaction.response.send_message(message, ephemeral=ephemeral)
             
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error in assign_user_to_team: {e}")
             await interaction.response.send_message("An error occurred while assigning the team. Please try again.", ephemeral=True)
-        finally:
-            if conn:
-                conn.close()
 
     @subscription_required(allowed_skus=ALL_PREMIUM_SKUS)
     @commissioner_only()
@@ -113,25 +172,21 @@ def setup_team_commands(bot: commands.Bot):
 
         server_id = str(interaction.guild.id)
 
-        conn = get_db_connection("teams")
-        cursor = conn.cursor()
         teams_table, _ = _tables_for_league(interaction)
 
         # Check if the user has a team
-        cursor.execute(f"SELECT team_name FROM {teams_table} WHERE user_id = ? AND server_id = ?", (user.id, server_id))
-        result = cursor.fetchone()
+        result = await db.fetchone("teams", f"SELECT team_name FROM {teams_table} WHERE user_id = ? AND server_id = ?", (user.id, server_id))
 
         if result:
             team_name = result[0]
-            cursor.execute(f"DELETE FROM {teams_table} WHERE user_id = ? AND server_id = ?", (user.id, server_id))
-            conn.commit()
+            await db.execute("teams", f"DELETE FROM {teams_table} WHERE user_id = ? AND server_id = ?", (user.id, server_id))
+            standings.invalidate(server_id)
+            autocomplete_index.invalidate_guild(server_id)
             
             await interaction.response.send_message(f"{user.mention} has been unassigned from **{format_team_name(team_name)}**.")
         else:
             await interaction.response.send_message(f"{user.mention} is not assigned to any team in this server.", ephemeral=True)
 
-        conn.close()
-
 
     # Command: remove-team-assignment
     @subscription_required(allowed_skus=ALL_PREMIUM_SKUS)
@@ -142,59 +197,41 @@ def setup_team_commands(bot: commands.Bot):
     async def clear_team_unified(interaction: discord.Interaction, team_name: str):
         
         """Remove a team's user assignment within the server."""
-        conn = get_db_connection("teams")
-        cursor = conn.cursor()
-
         server_id = str(interaction.guild.id)  # Get the server ID
         team_name = team_name.lower()
         teams_table, _ = _tables_for_league(interaction)
 
-        # Check if the team exists in this server
-        cursor.execute(f"SELECT 1 FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team_name, server_id))
-        if cursor.fetchone():
-            cursor.execute(f"DELETE FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team_name, server_id))
-            conn.commit()
-            
-            conn.close()
+        # Delete and check the affected row count in one round trip
+        cursor = await db.execute("teams", f"DELETE FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?", (team_name, server_id))
+        if cursor.rowcount:
+            standings.invalidate(server_id)
+            autocomplete_index.invalidate_guild(server_id)
             await interaction.response.send_message(f"Team '{team_name}' has been removed from this server.")
         else:
-            conn.close()
             await interaction.response.send_message(f"Team '{team_name}' is not assigned to anyone in this server.")
 
     # Adding autocomplete limit for ASSIGN team_name
     @assign_user_to_team_unified.autocomplete("team_name")
     async def team_name_autocomplete_unified(interaction: discord.Interaction, current: str):
-        conn = get_db_connection("teams")
-        cursor = conn.cursor()
-        _, valid_table = _tables_for_league(interaction)
-        # Fetch team names from valid table with a limit of 10
-        cursor.execute(f"SELECT team_name FROM {valid_table} WHERE team_name LIKE ? LIMIT 10", (f"{current.lower()}%",))
-        teams = cursor.fetchall()
-
-        # Send suggestions for autocomplete
-        suggestions = [team[0] for team in teams]
+        # Valid team names come from the in-memory index, not a query per keystroke
+        suggestions = await autocomplete_index.teams(resolve_league(str(interaction.guild.id)), current)
         await interaction.response.autocomplete(choices=[
             discord.app_commands.Choice(name=team, value=team) for team in suggestions
         ])
 
-        conn.close()
-
     # who-has (unified)
     @teams_group.command(name="who-has", description="Check which user is assigned to a specific team (CFB/NFL)")
     @app_commands.describe(team_name="The team to check.")
     @log_command("teams who-has")
     async def who_has_team_unified(interaction: discord.Interaction, team_name: str):
-        conn = get_db_connection("teams")
-        cursor = conn.cursor()
         server_id = str(interaction.guild.id)
         team_key = team_name.lower()
         teams_table, _ = _tables_for_league(interaction)
-        cursor.execute(
+        user = await db.fetchone(
+            "teams",
             f"SELECT user_id FROM {teams_table} WHERE LOWER(team_name) = ? AND server_id = ?",
             (team_key, server_id)
         )
-        user = cursor.fetchone()
-        conn.close()
         pretty_team = format_team_name(team_key)
         if user:
             await interaction.response.send_message(f"**{pretty_team}** is assigned to <@{user[0]}>.", ephemeral=False)
@@ -203,17 +240,8 @@ def setup_team_commands(bot: commands.Bot):
 
     @who_has_team_unified.autocomplete("team_name")
     async def who_has_team_autocomplete_unified(interaction: discord.Interaction, current: str):
-        conn = get_db_connection("teams")
-        cursor = conn.cursor()
         server_id = str(interaction.guild.id)
-        teams_table, _ = _tables_for_league(interaction)
-        cursor.execute(
-            f"SELECT DISTINCT team_name FROM {teams_table} WHERE server_id = ? AND team_name LIKE ? LIMIT 10",
-            (server_id, f"{current.lower()}%")
-        )
-        teams = cursor.fetchall()
-        conn.close()
-        suggestions = [team[0] for team in teams]
+        suggestions = await autocomplete_index.assigned_teams(server_id, resolve_league(server_id), current)
         await interaction.response.autocomplete(choices=[
             discord.app_commands.Choice(name=format_team_name(team), value=team) for team in suggestions
         ])
@@ -221,26 +249,13 @@ def setup_team_commands(bot: commands.Bot):
     # Adding autocomplete for limit REMOVE team_name
     @clear_team_unified.autocomplete("team_name")
     async def clear_team_autocomplete_unified(interaction: discord.Interaction, current: str):
-        conn = get_db_connection("teams")
-        cursor = conn.cursor()
-
         # Fetch team names assigned within the server, limiting to 10 results
         server_id = str(interaction.guild.id)
-        teams_table, _ = _tables_for_league(interaction)
-        cursor.execute(
-            f"SELECT team_name FROM {teams_table} WHERE server_id = ? AND team_name LIKE ? LIMIT 10", 
-            (server_id, f"{current.lower()}%")
-        )
-        teams = cursor.fetchall()
-
-        # Send suggestions for autocomplete
-        suggestions = [team[0] for team in teams]
+        suggestions = await autocomplete_index.assigned_teams(server_id, resolve_league(server_id), current)
         await interaction.response.autocomplete(choices=[
             discord.app_commands.Choice(name=team, value=team) for team in suggestions
         ])
 
-        conn.close()
-
     # (All separate NFL clear-team and related autocompletes removed in favor of unified commands)
 
     @subscription_required(allowed_skus=ALL_PREMIUM_SKUS)
@@ -251,11 +266,8 @@ def setup_team_commands(bot: commands.Bot):
 
         server_id = str(interaction.guild.id)
 
-        with get_db_connection("teams") as conn:
-            cursor = conn.cursor()
-            teams_table, _ = _tables_for_league(interaction)
-            cursor.execute(f"SELECT user_id, team_name FROM {teams_table} WHERE server_id = ?", (server_id,))
-            assignments = cursor.fetchall()
+        teams_table, _ = _tables_for_league(interaction)
+        assignments = await db.fetchall("teams", f"SELECT user_id, team_name FROM {teams_table} WHERE server_id = ?", (server_id,))
 
         if not assignments:
             await interaction.response.send_message("No users have been assigned to teams in this server.", ephemeral=False, silent=True)
@@ -304,15 +316,13 @@ def setup_team_commands(bot: commands.Bot):
         server_id = str(interaction.guild.id)  # Get the server ID
 
         try:
-            connection = get_db_connection("teams")
-            cursor = connection.cursor()
             teams_table, _ = _tables_for_league(interaction)
-            cursor.execute(f"DELETE FROM {teams_table} WHERE server_id = ?", (server_id,))
-            connection.commit()
+            await db.execute("teams", f"DELETE FROM {teams_table} WHERE server_id = ?", (server_id,))
+            standings.invalidate(server_id)
+            autocomplete_index.invalidate_guild(server_id)
 
             # Send a response to confirm the action
             await interaction.response.send_message(f"All team assignments have been removed in this server.")
-            connection.close()  # Close the connection
 
         except Exception as e:
             print(f"Error removing all CFB team assignments: {e}")
@@ -23,7 +23,8 @@ class DatabaseConfig:
         "matchups": DATA_DIR / "trilo_matchups.db",
         "attributes": DATA_DIR / "trilo_attributes.db",
 
-        "archetypes": DATA_DIR / "trilo_archetypes.db"
+        "archetypes": DATA_DIR / "trilo_archetypes.db",
+        "vision_cache": DATA_DIR / "trilo_vision_cache.db"
     }
     
     @classmethod
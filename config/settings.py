@@ -24,6 +24,11 @@ class BotSettings:
     
     # Bot configuration
     COMMAND_PREFIX = "!"
+
+    # 429s longer than this raise discord.RateLimited instead of being slept through
+    # inside discord.py, so bulk channel pipelines can pace the bucket themselves
+    # (discord.py's minimum is 30 seconds)
+    MAX_RATELIMIT_TIMEOUT = 30.0
     SUPPORT_SERVER_URL = "https://discord.gg/zRQzvJWnUt"
     
     # Valid reaction emojis
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Trilo Autocomplete Benchmark
+
+Replays keystroke-by-keystroke autocomplete queries (every prefix of random
+matchup strings and team names) against a throwaway copy of the CFB valid-team
+and matchup tables and compares:
+  - the old handlers: LIKE 'x%' on a fresh connection per keystroke
+  - utils.autocomplete_index.PrefixIndex (sorted list + bisect)
+
+Checks both return the same first 10 results. Never touches live data.
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow importing project modules
+project_root = Path(__file__).parent.parent.parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+from utils.autocomplete_index import PrefixIndex
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def build_fixture(path: Path, teams: int):
+    rng = random.Random(7)
+    names = sorted({"".join(rng.choice(LETTERS) for _ in range(rng.randint(4, 12))) for _ in range(teams)})
+    matchups = [f"{a} vs {b}" for a in names for b in names[:40] if a != b]
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE cfb_valid_teams (team_name TEXT PRIMARY KEY)")
+    conn.execute('CREATE TABLE "cfb-matchups" (matchup TEXT PRIMARY KEY)')
+    conn.executemany("INSERT INTO cfb_valid_teams VALUES (?)", [(n,) for n in names])
+    conn.executemany('INSERT INTO "cfb-matchups" VALUES (?)', [(m,) for m in matchups])
+    conn.commit()
+    conn.close()
+    return names, matchups
+
+
+def keystrokes(values, count: int):
+    rng = random.Random(11)
+    prefixes = []
+    while len(prefixes) < count:
+        value = rng.choice(values)
+        prefixes.extend(value[:i] for i in range(0, min(len(value), 12) + 1))
+    return prefixes[:count]
+
+
+def time_calls(fn, prefixes):
+    samples = []
+    results = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        results.append(fn(prefix))
+        samples.append(time.perf_counter() - start)
+    return samples, results
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"  {label:<28} mean {statistics.mean(samples) * 1e6:9.1f}µs   p99 {p99 * 1e6:9.1f}µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LIKE-per-keystroke vs in-memory prefix index autocomplete")
+    parser.add_argument("--teams", type=int, default=136, help="Valid team names in the fixture")
+    parser.add_argument("--keystrokes", type=int, default=5000, help="Autocomplete calls per table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "autocomplete.db"
+        names, matchups = build_fixture(path, args.teams)
+        print(f"⏱️  {len(names)} teams, {len(matchups)} matchups, {args.keystrokes} keystrokes per table")
+
+        for table, column, values in (("cfb_valid_teams", "team_name", names), ('"cfb-matchups"', "matchup", matchups)):
+            prefixes = keystrokes(values, args.keystrokes)
+
+            def like(prefix):
+                conn = sqlite3.connect(path)
+                try:
+                    rows = conn.execute(
+                        f"SELECT {column} FROM {table} WHERE {column} LIKE ? ORDER BY {column} LIMIT 10",
+                        (f"{prefix.lower()}%",)
+                    ).fetchall()
+                finally:
+                    conn.close()
+                return [row[0] for row in rows]
+
+            index = PrefixIndex(values)
+            old_samples, old_results = time_calls(like, prefixes)
+            new_samples, new_results = time_calls(index.search, prefixes)
+
+            print(f"\n{table}")
+            report("LIKE, connection per call", old_samples)
+            report("PrefixIndex", new_samples)
+            print(f"  results match: {'✅' if old_results == new_results else '❌'}  "
+                  f"speedup {statistics.mean(old_samples) / statistics.mean(new_samples):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Trilo Channel Provisioning Benchmark
+
+Drives utils.channel_provisioning against a fake Discord HTTP layer that
+enforces per-route buckets (channel creation per guild, messages and reactions
+per channel), returns rate-limit state like the X-RateLimit-* headers, resets
+buckets on their window, and injects random 429s with Retry-After. Compares:
+  - the old serial loop: create, post tracker, four reactions, sleep 0.1s
+  - the staged pipeline: ordered creation, concurrent trackers and reactions
+
+Then checks that channels were created in matchup order, every tracker has its
+four reactions in order, and every job finished. Never talks to Discord.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Allow importing project modules
+project_root = Path(__file__).parent.parent.parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+from utils.channel_provisioning import (
+    BucketPacer, ChannelJob, ProvisioningPipeline, RateLimited, TRACKER_REACTIONS, tracker_content
+)
+
+# (requests per window, window seconds) for each simulated route
+ROUTE_LIMITS = {
+    "create": (5, 1.0),
+    "message": (5, 1.0),
+    "reaction": (1, 0.25),
+}
+
+
+class FakeChannel:
+    def __init__(self, channel_id, name):
+        self.id = channel_id
+        self.name = name
+
+
+class FakeMessage:
+    def __init__(self, channel):
+        self.channel = channel
+        self.reactions = []
+
+
+class FakeDiscord:
+    """Fake HTTP layer: per-bucket limits, window resets, injected 429s"""
+
+    def __init__(self, latency_ms: float, error_rate: float, seed: int = 7):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.buckets = {}  # bucket -> [remaining, reset_at]
+        self.channels = []
+        self.requests = 0
+        self.bucket_429s = 0
+        self.injected_429s = 0
+
+    def bucket(self, stage: str, channel=None) -> str:
+        if stage == "create":
+            return "create:guild"
+        return f"{stage}:{channel.id}"
+
+    def _state(self, bucket: str):
+        limit, window = ROUTE_LIMITS[bucket.split(":")[0]]
+        now = time.monotonic()
+        state = self.buckets.get(bucket)
+        if state is None or state[1] <= now:
+            state = [limit, now + window]
+            self.buckets[bucket] = state
+        return state
+
+    def rate_limit_state(self, bucket: str):
+        """What the X-RateLimit-Remaining / X-RateLimit-Reset-After headers would say"""
+        remaining, reset_at = self._state(bucket)
+        return remaining, max(0.0, reset_at - time.monotonic())
+
+    async def _request(self, bucket: str):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        state = self._state(bucket)
+        if state[0] <= 0:
+            self.bucket_429s += 1
+            raise RateLimited(state[1] - time.monotonic())
+        if self.rng.random() < self.error_rate:
+            self.injected_429s += 1
+            raise RateLimited(0.2)
+        state[0] -= 1
+
+    async def create_channel(self, name: str):
+        await self._request(self.bucket("create"))
+        channel = FakeChannel(len(self.channels) + 1, name)
+        self.channels.append(channel)
+        return channel
+
+    async def send_tracker(self, channel, content: str):
+        await self._request(self.bucket("message", channel))
+        return FakeMessage(channel)
+
+    async def add_reaction(self, message, emoji: str):
+        await self._request(self.bucket("reaction", message.channel))
+        message.reactions.append(emoji)
+
+
+def build_jobs(count: int):
+    return [
+        ChannelJob(i, f"team-{i}-vs-team-{i + 100}",
+                   tracker_content(f"Team {i}", f"Team {i + 100}", False, i % 3 == 0))
+        for i in range(count)
+    ]
+
+
+async def serial_baseline(backend: FakeDiscord, jobs):
+    """The old create_matchups loop, paced per bucket the way discord.py's HTTP client is"""
+    pacer = BucketPacer()
+
+    async def call(bucket, fn, *args):
+        while True:
+            await pacer.wait(bucket)
+            try:
+                result = await fn(*args)
+            except RateLimited as e:
+                pacer.penalize(bucket, e.retry_after)
+                continue
+            pacer.update(bucket, *backend.rate_limit_state(bucket))
+            return result
+
+    for job in jobs:
+        job.channel = await call(backend.bucket("create"), backend.create_channel, job.channel_name)
+        job.message = await call(backend.bucket("message", job.channel), backend.send_tracker, job.channel, job.tracker_content)
+        for emoji in TRACKER_REACTIONS:
+            await call(backend.bucket("reaction", job.channel), backend.add_reaction, job.message, emoji)
+        await asyncio.sleep(0.1)
+
+
+def verify(label: str, backend: FakeDiscord, jobs):
+    names = [channel.name for channel in backend.channels]
+    assert names == [job.channel_name for job in jobs], f"{label}: channels created out of order"
+    for job in jobs:
+        assert job.error is None, f"{label}: {job.channel_name} failed: {job.error}"
+        assert job.message.reactions == list(TRACKER_REACTIONS), f"{label}: reactions out of order in {job.channel_name}"
+
+
+async def main_async(args):
+    print(f"🏁 Channel provisioning benchmark ({args.matchups} matchups, "
+          f"{args.latency_ms}ms latency, {args.error_rate:.0%} injected 429s)")
+    print("=" * 70)
+
+    backend = FakeDiscord(args.latency_ms, args.error_rate)
+    jobs = build_jobs(args.matchups)
+    start = time.perf_counter()
+    await serial_baseline(backend, jobs)
+    serial_elapsed = time.perf_counter() - start
+    verify("serial", backend, jobs)
+    print(f"  {'serial + sleep':<16} {serial_elapsed:6.2f}s  requests {backend.requests:4d}  "
+          f"bucket 429s {backend.bucket_429s:3d}  injected 429s {backend.injected_429s:3d}")
+
+    backend = FakeDiscord(args.latency_ms, args.error_rate)
+    jobs = build_jobs(args.matchups)
+    snapshots = []
+    pipeline = ProvisioningPipeline(backend, on_progress=snapshots.append)
+    start = time.perf_counter()
+    await pipeline.run(jobs)
+    pipeline_elapsed = time.perf_counter() - start
+    verify("pipeline", backend, jobs)
+    print(f"  {'staged pipeline':<16} {pipeline_elapsed:6.2f}s  requests {backend.requests:4d}  "
+          f"bucket 429s {backend.bucket_429s:3d}  injected 429s {backend.injected_429s:3d}  "
+          f"pacer waits {pipeline.pacer.waits}")
+
+    final = snapshots[-1]
+    assert final["channels"] == final["trackers"] == final["reactions"] == args.matchups
+    print("=" * 70)
+    print(f"⚡ Speedup: {serial_elapsed / pipeline_elapsed:.1f}x  "
+          f"({len(snapshots)} progress updates, final {final})")
+    print("✅ Channel order, reaction order and completion verified")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial vs staged matchup channel provisioning")
+    parser.add_argument("--matchups", type=int, default=30, help="Matchup channels to create")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Simulated request latency")
+    parser.add_argument("--error-rate", type=float, default=0.03, help="Chance of an injected 429 per request")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Trilo Connection Pool Benchmark
+
+Compares the old connection-per-call pattern (sqlite3.connect + PRAGMAs on
+every get_db_connection) against the pooled connections in utils/db_pool.py
+on a synthetic command workload. Each "command" performs the same mix of
+lookups a reaction or matchup command does (settings read, team owner reads,
+occasional record write).
+
+Runs against throwaway databases in a temp directory - never the live data.
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow importing project config
+project_root = Path(__file__).parent.parent.parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+from config.database import DatabaseConfig
+from utils.db_pool import ConnectionPool
+
+TEAMS = [f"team {i}" for i in range(130)]
+SERVERS = [str(1000 + i) for i in range(50)]
+
+
+def build_fixture(data_dir: Path):
+    """Create keys/teams databases with a realistic amount of data"""
+    DatabaseConfig.DATABASES = {
+        "keys": data_dir / "trilo_keys.db",
+        "teams": data_dir / "trilo_teams.db",
+    }
+
+    conn = sqlite3.connect(DatabaseConfig.get_db_path("keys"))
+    conn.execute("""
+        CREATE TABLE server_settings (
+            server_id TEXT NOT NULL,
+            setting TEXT NOT NULL,
+            new_value TEXT NOT NULL,
+            PRIMARY KEY (server_id, setting)
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO server_settings VALUES (?, 'record_tracking_enabled', 'on')",
+        [(s,) for s in SERVERS]
+    )
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(DatabaseConfig.get_db_path("teams"))
+    conn.execute("""
+        CREATE TABLE cfb_teams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            team_name TEXT NOT NULL,
+            server_id TEXT NOT NULL,
+            UNIQUE(user_id, server_id),
+            UNIQUE(team_name, server_id)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE cfb_team_records (
+            server_id TEXT NOT NULL,
+            team_name TEXT NOT NULL,
+            wins INTEGER DEFAULT 0,
+            losses INTEGER DEFAULT 0,
+            PRIMARY KEY (server_id, team_name)
+        )
+    """)
+    rows = [(str(i), team, server) for server in SERVERS for i, team in enumerate(TEAMS[:20])]
+    conn.executemany("INSERT INTO cfb_teams (user_id, team_name, server_id) VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def churn_connection(db_name: str) -> sqlite3.Connection:
+    """The pre-pool get_db_connection: new connection + pragmas per call"""
+    conn = sqlite3.connect(DatabaseConfig.get_db_path(db_name))
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA busy_timeout = 30000")
+    return conn
+
+
+def run_command(get_conn, rng: random.Random, churn: bool):
+    """One synthetic command: 1 settings read, 2 owner reads, 20% chance of a record write"""
+    server_id = rng.choice(SERVERS)
+    team1, team2 = rng.sample(TEAMS, 2)
+
+    conn = get_conn("keys")
+    conn.execute(
+        "SELECT new_value FROM server_settings WHERE server_id = ? AND setting = 'record_tracking_enabled'",
+        (server_id,)
+    ).fetchone()
+    if churn:
+        conn.close()
+
+    conn = get_conn("teams")
+    for team in (team1, team2):
+        conn.execute(
+            "SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?",
+            (team, server_id)
+        ).fetchone()
+    if rng.random() < 0.2:
+        with conn:
+            conn.execute("""
+                INSERT INTO cfb_team_records (server_id, team_name, wins, losses)
+                VALUES (?, ?, 1, 0)
+                ON CONFLICT(server_id, team_name) DO UPDATE SET wins = wins + 1
+            """, (server_id, team1))
+    if churn:
+        conn.close()
+
+
+def bench(label: str, get_conn, commands: int, churn: bool) -> float:
+    rng = random.Random(42)
+    start = time.perf_counter()
+    for _ in range(commands):
+        run_command(get_conn, rng, churn)
+    elapsed = time.perf_counter() - start
+    per_cmd_us = elapsed / commands * 1_000_000
+    print(f"  {label:<22} {elapsed:8.3f}s total  {per_cmd_us:8.1f} µs/command")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-call SQLite connections")
+    parser.add_argument("--commands", type=int, default=10_000, help="Number of synthetic commands to run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_fixture(Path(tmp))
+        pool = ConnectionPool()
+
+        print(f"🏁 Connection benchmark ({args.commands:,} synthetic commands)")
+        print("=" * 50)
+        churn_time = bench("connection churn", churn_connection, args.commands, churn=True)
+        pooled_time = bench("pooled reuse", pool.get, args.commands, churn=False)
+        print("=" * 50)
+        print(f"⚡ Speedup: {churn_time / pooled_time:.1f}x  (pool stats: {pool.stats()})")
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Trilo Entitlement Cache Benchmark
+
+Starts a local aiohttp stub of the Discord entitlements endpoint (with
+configurable latency) and replays a burst of premium-command checks against
+it, comparing:
+  - the old lookup: new ClientSession + HTTP round trip per check
+  - utils.entitlements.EntitlementCache: shared session, TTL/negative cache,
+    single-flight coalescing
+
+Reports upstream request counts and per-check latency. Also sanity-checks
+negative caching (guild with no entitlements) and error handling (guild that
+returns 500). Never talks to the real Discord API.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from aiohttp import web
+import aiohttp
+
+# Allow importing project modules
+project_root = Path(__file__).parent.parent.parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+from utils.entitlements import EntitlementCache
+
+PAID_SKU = "1386985101631422474"
+EMPTY_GUILD = "900000000000000001"
+BROKEN_GUILD = "900000000000000002"
+
+
+def build_stub(latency_ms: float, hits: Counter) -> web.Application:
+    async def entitlements(request: web.Request):
+        guild_id = request.match_info["guild_id"]
+        hits[guild_id] += 1
+        await asyncio.sleep(latency_ms / 1000)
+        if guild_id == BROKEN_GUILD:
+            return web.json_response({"message": "boom"}, status=500)
+        if guild_id == EMPTY_GUILD:
+            return web.json_response([])
+        return web.json_response([{"sku_id": PAID_SKU, "guild_id": guild_id, "ends_at": None}])
+
+    app = web.Application()
+    app.router.add_get("/applications/@me/guilds/{guild_id}/entitlements", entitlements)
+    return app
+
+
+async def uncached_lookup(api_base: str, guild_id: str) -> list:
+    """The pre-cache get_guild_entitlements: fresh session per call"""
+    url = f"{api_base}/applications/@me/guilds/{guild_id}/entitlements"
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, headers={"Authorization": "Bot stub"}) as resp:
+            if resp.status != 200:
+                return []
+            return await resp.json()
+
+
+async def replay(label: str, lookup, guilds: list, checks: int, concurrency: int):
+    rng = random.Random(7)
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        guild_id = rng.choice(guilds)
+        async with semaphore:
+            start = time.perf_counter()
+            await lookup(guild_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(checks)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(f"  {label:<18} {elapsed:6.2f}s  p50 {statistics.median(latencies):7.2f}ms  p95 {p95:7.2f}ms")
+
+
+async def main_async(args):
+    hits = Counter()
+    runner = web.AppRunner(build_stub(args.latency_ms, hits))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    api_base = f"http://127.0.0.1:{port}"
+
+    guilds = [str(100000000000000000 + i) for i in range(args.guilds)]
+    print(f"🏁 Entitlement benchmark ({args.checks} checks over {args.guilds} guilds, "
+          f"stub latency {args.latency_ms}ms)")
+    print("=" * 70)
+
+    await replay("uncached", lambda g: uncached_lookup(api_base, g), guilds, args.checks, args.concurrency)
+    uncached_requests = sum(hits.values())
+    hits.clear()
+
+    cache = EntitlementCache(api_base=api_base, token="stub")
+    await replay("cached", cache.get, guilds, args.checks, args.concurrency)
+    cached_requests = sum(hits.values())
+
+    print("=" * 70)
+    print(f"⚡ Upstream requests: {uncached_requests} -> {cached_requests}  (cache stats: {cache.stats()})")
+
+    # Negative caching and error handling
+    hits.clear()
+    assert await cache.get(EMPTY_GUILD) == []
+    assert await cache.get(EMPTY_GUILD) == []
+    assert hits[EMPTY_GUILD] == 1, "empty guild should be negatively cached"
+    assert await cache.get(BROKEN_GUILD) == []
+    assert await cache.get(BROKEN_GUILD) == []
+    assert hits[BROKEN_GUILD] == 1, "failed fetch should be negatively cached"
+    await cache.get(guilds[0], force_refresh=True)
+    assert hits[guilds[0]] == 1, "force_refresh should bypass the cache"
+    print("✅ Negative caching, error handling and force_refresh behave as expected")
+
+    await cache.close()
+    await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached vs uncached entitlement lookups")
+    parser.add_argument("--checks", type=int, default=1000, help="Number of subscription checks")
+    parser.add_argument("--guilds", type=int, default=25, help="Number of distinct guilds")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent checks in flight")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="Stub API latency")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
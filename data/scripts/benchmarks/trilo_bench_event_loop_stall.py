@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Trilo Event Loop Stall Benchmark
+
+Fires bursts of concurrent simulated reaction handlers (two owner lookups +
+one record upsert each) while a background thread holds short write locks on
+the teams database, the way a long command or maintenance script would.
+
+A heartbeat task ticks every few milliseconds and records how late each tick
+fires. Any time the loop spends blocked inside SQLite shows up as heartbeat
+lag. The same burst runs twice: once with blocking cursor calls inside the
+coroutines (the old pattern) and once through utils.async_db.
+
+Runs against throwaway databases in a temp directory - never the live data.
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Allow importing project config
+project_root = Path(__file__).parent.parent.parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+from config.database import DatabaseConfig
+from utils.async_db import AsyncDatabase
+from utils.db_pool import connection_pool
+
+TEAMS = [f"team {i}" for i in range(130)]
+SERVERS = [str(1000 + i) for i in range(50)]
+HEARTBEAT_INTERVAL = 0.005
+
+OWNER_SQL = "SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?"
+RECORD_SQL = """
+    INSERT INTO cfb_team_records (server_id, team_name, wins, losses)
+    VALUES (?, ?, 1, 0)
+    ON CONFLICT(server_id, team_name) DO UPDATE SET wins = wins + 1
+"""
+
+
+def build_fixture(data_dir: Path):
+    """Create a teams database with assignments for every fixture server"""
+    DatabaseConfig.DATABASES = {"teams": data_dir / "trilo_teams.db"}
+
+    conn = sqlite3.connect(DatabaseConfig.get_db_path("teams"))
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("""
+        CREATE TABLE cfb_teams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            team_name TEXT NOT NULL,
+            server_id TEXT NOT NULL,
+            UNIQUE(user_id, server_id),
+            UNIQUE(team_name, server_id)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE cfb_team_records (
+            server_id TEXT NOT NULL,
+            team_name TEXT NOT NULL,
+            wins INTEGER DEFAULT 0,
+            losses INTEGER DEFAULT 0,
+            PRIMARY KEY (server_id, team_name)
+        )
+    """)
+    rows = [(str(i), team, server) for server in SERVERS for i, team in enumerate(TEAMS[:20])]
+    conn.executemany("INSERT INTO cfb_teams (user_id, team_name, server_id) VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def lock_holder(stop: threading.Event, hold_ms: float, gap_ms: float):
+    """Repeatedly take the write lock and sit on it, like a slow writer elsewhere"""
+    conn = sqlite3.connect(DatabaseConfig.get_db_path("teams"), timeout=30)
+    while not stop.is_set():
+        conn.execute("BEGIN IMMEDIATE")
+        time.sleep(hold_ms / 1000)
+        conn.commit()
+        time.sleep(gap_ms / 1000)
+    conn.close()
+
+
+async def heartbeat(lags: list, stop: asyncio.Event):
+    """Record how late each tick fires relative to its schedule"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def blocking_reaction(rng: random.Random):
+    """Old pattern: cursor calls straight inside the coroutine"""
+    server_id = rng.choice(SERVERS)
+    winner, loser = rng.sample(TEAMS, 2)
+    conn = connection_pool.get("teams")
+    conn.execute(OWNER_SQL, (winner, server_id)).fetchone()
+    conn.execute(OWNER_SQL, (loser, server_id)).fetchone()
+    with conn:
+        conn.execute(RECORD_SQL, (server_id, winner))
+    await asyncio.sleep(0)
+
+
+async def async_reaction(db: AsyncDatabase, rng: random.Random):
+    """New pattern: the same work through the async facade"""
+    server_id = rng.choice(SERVERS)
+    winner, loser = rng.sample(TEAMS, 2)
+    await db.fetchone("teams", OWNER_SQL, (winner, server_id))
+    await db.fetchone("teams", OWNER_SQL, (loser, server_id))
+    await db.execute("teams", RECORD_SQL, (server_id, winner))
+
+
+async def run_bursts(label: str, make_handler, bursts: int, burst_size: int, hold_ms: float, gap_ms: float):
+    lags = []
+    stop_heartbeat = asyncio.Event()
+    stop_locker = threading.Event()
+    locker = threading.Thread(target=lock_holder, args=(stop_locker, hold_ms, gap_ms), daemon=True)
+    locker.start()
+    beat = asyncio.create_task(heartbeat(lags, stop_heartbeat))
+
+    rng = random.Random(42)
+    start = time.perf_counter()
+    for _ in range(bursts):
+        await asyncio.gather(*(make_handler(rng) for _ in range(burst_size)))
+    elapsed = time.perf_counter() - start
+
+    stop_heartbeat.set()
+    await beat
+    stop_locker.set()
+    locker.join()
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"  {label:<16} {elapsed:7.2f}s  "
+        f"lag mean {statistics.mean(lags_ms):7.2f}ms  p99 {p99:7.2f}ms  max {lags_ms[-1]:7.2f}ms  "
+        f"({len(lags_ms)} ticks)"
+    )
+    return lags_ms[-1]
+
+
+async def main_async(args):
+    print(f"🏁 Event loop stall benchmark ({args.bursts} bursts x {args.burst_size} reactions, "
+          f"writer holds lock {args.hold_ms}ms every {args.hold_ms + args.gap_ms}ms)")
+    print("=" * 90)
+    blocking_max = await run_bursts(
+        "blocking cursor", blocking_reaction, args.bursts, args.burst_size, args.hold_ms, args.gap_ms
+    )
+    db = AsyncDatabase()
+    async_max = await run_bursts(
+        "async facade", lambda rng: async_reaction(db, rng), args.bursts, args.burst_size, args.hold_ms, args.gap_ms
+    )
+    db.shutdown()
+    print("=" * 90)
+    print(f"⚡ Worst-case loop stall: {blocking_max:.1f}ms -> {async_max:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure event-loop stall under concurrent reaction bursts")
+    parser.add_argument("--bursts", type=int, default=20, help="Number of reaction bursts")
+    parser.add_argument("--burst-size", type=int, default=50, help="Concurrent reactions per burst")
+    parser.add_argument("--hold-ms", type=float, default=20.0, help="How long the competing writer holds the lock")
+    parser.add_argument("--gap-ms", type=float, default=30.0, help="Pause between competing writer transactions")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_fixture(Path(tmp))
+        asyncio.run(main_async(args))
+        connection_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Trilo Image Preprocessing Benchmark
+
+Builds a fixture set of schedule screenshots (a 1440p PNG game capture with UI
+margins, a 1080p PNG, and a 12MP phone photo of a screen) and compares the raw
+uploads with utils.image_preprocessing output:
+  - upload bytes (what gets base64'd into the request)
+  - estimated OpenAI vision tokens for high detail (85 + 170 per 512px tile
+    after OpenAI's own 2048/768 resize)
+  - wall time for a 5-image submission, serial vs the process pool
+
+Pass --fixtures DIR to run over real screenshots instead of generated ones.
+"""
+
+import argparse
+import asyncio
+import io
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+# Allow importing project modules
+project_root = Path(__file__).parent.parent.parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+from utils.image_preprocessing import ImagePreprocessor, preprocess_image_bytes
+
+TEAMS = ["Alabama", "Georgia", "Ohio State", "Michigan", "Texas", "Oregon", "Florida State", "LSU",
+         "Penn State", "Notre Dame", "Clemson", "Oklahoma", "USC", "Tennessee", "Utah", "Miami"]
+
+
+def vision_tokens(width: int, height: int) -> int:
+    """OpenAI high-detail token estimate: fit 2048x2048, short side 768, 170 per 512px tile"""
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def draw_schedule(size, panel_box, font_size, seed, background=(18, 22, 30)):
+    rng = random.Random(seed)
+    image = Image.new("RGB", size, background)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=font_size)
+    left, top, right, bottom = panel_box
+    draw.rectangle(panel_box, fill=(34, 40, 58))
+    draw.text((left + 30, top + 20), f"WEEK {rng.randint(1, 14)}", fill=(240, 200, 60), font=font)
+    row_height = (bottom - top - 120) // 8
+    teams = TEAMS[:]
+    rng.shuffle(teams)
+    for row in range(8):
+        y = top + 100 + row * row_height
+        draw.rectangle((left + 20, y, right - 20, y + row_height - 10), fill=(48, 56, 78))
+        draw.text((left + 40, y + 10), f"{rng.randint(1, 25)} {teams[row * 2]}", fill=(255, 255, 255), font=font)
+        draw.text(((left + right) // 2, y + 10), f"@ {teams[row * 2 + 1]}", fill=(255, 255, 255), font=font)
+    return image
+
+
+def build_fixtures():
+    fixtures = []
+
+    capture = draw_schedule((2560, 1440), (700, 160, 1860, 1300), 34, seed=1)
+    buffer = io.BytesIO()
+    capture.save(buffer, format="PNG")
+    fixtures.append(("1440p capture.png", buffer.getvalue()))
+
+    capture = draw_schedule((1920, 1080), (460, 90, 1460, 1000), 28, seed=2)
+    buffer = io.BytesIO()
+    capture.save(buffer, format="PNG")
+    fixtures.append(("1080p capture.png", buffer.getvalue()))
+
+    # Phone photo of a TV: noisy, slightly blurred, big dark surround
+    photo = draw_schedule((4032, 3024), (900, 700, 3100, 2400), 64, seed=3, background=(10, 10, 12))
+    noise = Image.effect_noise(photo.size, 12).convert("RGB")
+    photo = Image.blend(photo, noise, 0.08).filter(ImageFilter.GaussianBlur(1.2))
+    buffer = io.BytesIO()
+    photo.save(buffer, format="JPEG", quality=92)
+    fixtures.append(("12MP phone photo.jpg", buffer.getvalue()))
+    return fixtures
+
+
+def load_fixtures(directory: Path):
+    return [(path.name, path.read_bytes()) for path in sorted(directory.iterdir())
+            if path.suffix.lower() in {".png", ".jpg", ".jpeg", ".webp"}]
+
+
+async def main_async(args):
+    fixtures = load_fixtures(Path(args.fixtures)) if args.fixtures else build_fixtures()
+    print(f"🏁 Image preprocessing benchmark ({len(fixtures)} fixtures)")
+    print("=" * 86)
+    print(f"  {'fixture':<24} {'raw size':>10} {'raw px':>11} {'tokens':>6}   "
+          f"{'sent size':>10} {'sent px':>11} {'tokens':>6}")
+
+    raw_total = sent_total = raw_tokens_total = sent_tokens_total = 0
+    for name, data in fixtures:
+        with Image.open(io.BytesIO(data)) as image:
+            raw_px = image.size
+        processed, mime = preprocess_image_bytes(data)
+        with Image.open(io.BytesIO(processed)) as image:
+            sent_px = image.size
+        raw_tokens, sent_tokens = vision_tokens(*raw_px), vision_tokens(*sent_px)
+        raw_total += len(data)
+        sent_total += len(processed)
+        raw_tokens_total += raw_tokens
+        sent_tokens_total += sent_tokens
+        print(f"  {name[:24]:<24} {len(data) / 1024:8.0f}KB {raw_px[0]:>5}x{raw_px[1]:<5} {raw_tokens:>6}   "
+              f"{len(processed) / 1024:8.0f}KB {sent_px[0]:>5}x{sent_px[1]:<5} {sent_tokens:>6}  {mime}")
+
+    # A 5-image submission: serial on the event loop vs the process pool
+    batch = [fixtures[i % len(fixtures)][1] for i in range(5)]
+    start = time.perf_counter()
+    for data in batch:
+        preprocess_image_bytes(data)
+    serial = time.perf_counter() - start
+
+    preprocessor = ImagePreprocessor()
+    await preprocessor.process(batch[0], "image/png")  # warm the worker processes
+    start = time.perf_counter()
+    await asyncio.gather(*(preprocessor.process(data, "image/png") for data in batch))
+    pooled = time.perf_counter() - start
+    preprocessor.shutdown()
+
+    print("=" * 86)
+    print(f"⚡ Upload size: {raw_total / 1024:.0f}KB -> {sent_total / 1024:.0f}KB "
+          f"({sent_total / raw_total:.0%}); base64 adds another third to both")
+    print(f"⚡ Vision tokens: {raw_tokens_total} -> {sent_tokens_total}")
+    print(f"⏱️  5-image preprocessing: serial {serial * 1000:.0f}ms, "
+          f"process pool {pooled * 1000:.0f}ms ({preprocessor.max_workers} workers, event loop stays free)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark schedule image preprocessing")
+    parser.add_argument("--fixtures", help="Directory of real schedule screenshots to use instead of generated ones")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
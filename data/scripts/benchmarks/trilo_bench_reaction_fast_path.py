@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Trilo Reaction Fast Path Benchmark
+
+Replays a high-volume synthetic on_raw_reaction_add stream (random guilds,
+channels, messages and emojis, as the gateway delivers them for every guild
+the bot is in) and compares the per-event cost of:
+  - the old handler prelude: two settings lookups, the role-set INFO logging
+    and a fetch_message REST call before knowing the message is a tracker
+  - src.events.reactions.handle_reaction_add with the live tracker registry
+
+Counts database calls, REST calls and log records for each. The old prelude
+is measured in its best case (settings already cached, fetch_message free),
+so the real gap is larger. A second stream replays reactions in unrecorded
+"-vs-" channels (matchups created before the store), which take the legacy
+slow path: each message may be fetched once, and nothing else may do I/O.
+Never talks to Discord and never opens a database.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import discord
+
+# Allow importing project modules
+project_root = Path(__file__).parent.parent.parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+from config.settings import BotSettings
+from src.events.reactions import handle_reaction_add
+from utils.async_db import db
+from utils.matchup_store import matchup_store
+from utils.settings_cache import settings_cache
+
+BOT_USER_ID = 1
+COMMISSIONER_ROLES = {"Commish", "Commissioners", "Commissioner", "commish", "commissioners", "commissioner"}
+EMOJIS = sorted(BotSettings.VALID_REACTIONS) + ["👍", "😂", "🔥", "❤️", "🎉", "👀"]
+# Channel numbers (per guild) at or above this are pre-store matchup channels
+LEGACY_CHANNEL_OFFSET = 90
+
+
+class CountingHandler(logging.Handler):
+    def __init__(self, counts: Counter):
+        super().__init__()
+        self.counts = counts
+
+    def emit(self, record):
+        self.format(record)
+        self.counts["log"] += 1
+
+
+class FakeRole:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeMember:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.roles = [FakeRole("@everyone"), FakeRole("Member"), FakeRole(f"Team {user_id % 130}")]
+        if user_id % 25 == 0:
+            self.roles.append(FakeRole("Commissioner"))
+
+
+class FakeMessage:
+    def __init__(self):
+        self.author = FakeMember(BOT_USER_ID + 1)
+        self.content = "gg"
+
+
+class FakeChannel(discord.TextChannel):
+    """A TextChannel (so isinstance checks pass) whose REST calls are counted"""
+
+    def __init__(self, channel_id, name, counts: Counter):
+        self.id = channel_id
+        self.name = name
+        self._counts = counts
+
+    async def fetch_message(self, message_id):
+        self._counts["rest"] += 1
+        return FakeMessage()
+
+
+class FakeGuild:
+    def __init__(self, guild_id, counts: Counter):
+        self.id = guild_id
+        self.counts = counts
+        self.channels = {}
+
+    def get_member(self, user_id):
+        return FakeMember(user_id)
+
+    def get_channel(self, channel_id):
+        channel = self.channels.get(channel_id)
+        if channel is None:
+            name = "alabama-vs-georgia" if channel_id % 100 >= LEGACY_CHANNEL_OFFSET else "general"
+            channel = self.channels[channel_id] = FakeChannel(channel_id, name, self.counts)
+        return channel
+
+
+class FakeBot:
+    def __init__(self, guilds, counts: Counter):
+        self.user = FakeMember(BOT_USER_ID)
+        self.guilds = guilds
+        self.logger = logging.getLogger("trilo.bench.reactions")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.handlers = [CountingHandler(counts)]
+
+    def get_guild(self, guild_id):
+        return self.guilds.get(guild_id)
+
+    def get_channel(self, channel_id):
+        guild = self.guilds.get(channel_id // 100)
+        return guild.get_channel(channel_id) if guild else None
+
+
+class Payload:
+    """The RawReactionActionEvent fields the handler reads"""
+
+    __slots__ = ("user_id", "guild_id", "channel_id", "message_id", "emoji")
+
+    def __init__(self, user_id, guild_id, channel_id, message_id, emoji):
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.emoji = emoji
+
+
+def count_db_calls(counts: Counter):
+    """Count every async_db call (calls still go through; none are expected)"""
+    for name in ("run", "fetchone", "fetchall", "execute", "executemany"):
+        original = getattr(db, name)
+
+        def counted(*args, _original=original, **kwargs):
+            counts["db"] += 1
+            return _original(*args, **kwargs)
+        setattr(db, name, counted)
+
+
+async def old_prelude(bot, payload, counts: Counter):
+    """The pre-registry handle_reaction_add up to its fetch_message call"""
+    if payload.user_id == bot.user.id:
+        return
+    emoji = str(payload.emoji)
+    if emoji not in BotSettings.VALID_REACTIONS:
+        return
+    guild = bot.get_guild(payload.guild_id)
+    server_id = str(payload.guild_id)
+    counts["settings"] += 1  # is_record_tracking_enabled (cache hit)
+    if guild is None:
+        return
+    member = guild.get_member(payload.user_id)
+    if member is None:
+        return
+    counts["settings"] += 1  # get_commissioner_roles (cache hit)
+    commissioner_roles = COMMISSIONER_ROLES
+    user_roles = {role.name for role in member.roles}
+    bot.logger.info(f"User {member.name} has roles: {user_roles}")
+    bot.logger.info(f"Commissioner roles for server {server_id}: {commissioner_roles}")
+    if not any(role.name in commissioner_roles for role in member.roles):
+        bot.logger.info(f"User {member.name} does not have commissioner permissions")
+        return
+    channel = guild.get_channel(payload.channel_id)
+    await channel.fetch_message(payload.message_id)
+
+
+def build_stream(events: int, guilds: int, seed: int = 11, legacy: bool = False):
+    rng = random.Random(seed)
+    # Legacy channels hold a few messages that get reacted to again and again
+    messages = [rng.getrandbits(60) for _ in range(max(events // 20, 1))]
+    stream = []
+    for _ in range(events):
+        guild_id = 10_000 + rng.randrange(guilds)
+        stream.append(Payload(
+            user_id=100 + rng.randrange(5000),
+            guild_id=guild_id,
+            channel_id=guild_id * 100 + (LEGACY_CHANNEL_OFFSET + rng.randrange(5) if legacy else rng.randrange(40)),
+            message_id=rng.choice(messages) if legacy else rng.getrandbits(60),
+            emoji=discord.PartialEmoji(name=rng.choice(EMOJIS)),
+        ))
+    return stream
+
+
+async def replay(label, handler, bot, stream, counts: Counter):
+    counts.clear()
+    start = time.perf_counter()
+    for payload in stream:
+        await handler(bot, payload)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<18} {elapsed / len(stream) * 1e6:7.2f}µs/event  "
+          f"db {counts['db']:6d}  settings {counts['settings']:6d}  "
+          f"rest {counts['rest']:6d}  log records {counts['log']:6d}")
+    return elapsed
+
+
+async def main_async(args):
+    counts = Counter()
+    guilds = {10_000 + i: FakeGuild(10_000 + i, counts) for i in range(args.guilds)}
+    bot = FakeBot(guilds, counts)
+    stream = build_stream(args.events, args.guilds)
+    count_db_calls(counts)
+
+    # Live trackers elsewhere in the registry; none of the replayed messages are trackers
+    rng = random.Random(3)
+    matchup_store._remember(*(rng.getrandbits(60) for _ in range(args.live_trackers)))
+
+    print(f"🏁 Reaction fast path benchmark ({args.events} reactions, {args.guilds} guilds, "
+          f"{args.live_trackers} live trackers)")
+    print("=" * 96)
+    old = await replay("old prelude", lambda b, p: old_prelude(b, p, counts), bot, stream, counts)
+    new = await replay("registry fast path", handle_reaction_add, bot, stream, counts)
+    assert counts["db"] == counts["rest"] == counts["log"] == 0, "fast path touched I/O"
+
+    # Pre-store matchup channels: settings are cached (as after any command in the guild),
+    # the reacted messages are user chatter, so each is fetched at most once and then skipped
+    for guild_id in guilds:
+        settings_cache._entries[str(guild_id)] = (time.monotonic() + 3600, {})
+    legacy_stream = build_stream(args.legacy_events, args.guilds, seed=12, legacy=True)
+    await replay("legacy channels", handle_reaction_add, bot, legacy_stream, counts)
+    fetchable = len({p.message_id for p in legacy_stream if str(p.emoji) in BotSettings.VALID_REACTIONS})
+    assert counts["db"] == counts["log"] == 0, "legacy path touched the database or logged"
+    assert counts["rest"] <= fetchable, "legacy path fetched a message more than once"
+    print("=" * 96)
+    print(f"⚡ Per-event cost: {old / new:.1f}x lower, with zero DB, REST and logging on non-tracker reactions")
+    print(f"🕰️ Legacy channels: {counts['rest']} fetches for {len(legacy_stream)} reactions "
+          f"({fetchable} distinct messages with valid emoji)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the raw reaction early-reject fast path")
+    parser.add_argument("--events", type=int, default=200_000, help="Synthetic reactions to replay")
+    parser.add_argument("--guilds", type=int, default=500, help="Guilds the reactions come from")
+    parser.add_argument("--legacy-events", type=int, default=20_000, help="Reactions in pre-store matchup channels")
+    parser.add_argument("--live-trackers", type=int, default=5000, help="Live tracker IDs in the registry")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
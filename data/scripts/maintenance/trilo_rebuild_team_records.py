@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Rebuild Team Records from the Game Result Log
+
+cfb_team_records / nfl_team_records are a compacted snapshot of the
+game_results log (utils/game_results.py). This script recomputes them from the
+log with one set-based aggregation per league, for every guild or just one.
+
+    python3 data/scripts/maintenance/trilo_rebuild_team_records.py
+    python3 data/scripts/maintenance/trilo_rebuild_team_records.py --server-id 123456789 --league cfb
+    python3 data/scripts/maintenance/trilo_rebuild_team_records.py --check
+
+--check rebuilds inside a transaction that is rolled back and reports the
+rows whose snapshot differs from the log (exit status 1 if any do).
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Allow importing project modules
+project_root = Path(__file__).parent.parent.parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+from config.database import DatabaseConfig
+from utils.game_results import ensure_schema, rebuild_records
+from utils.standings import LEAGUE_RECORD_TABLES
+
+
+def snapshot(cursor, records_table, server_id):
+    if server_id:
+        cursor.execute(f"SELECT server_id, team_name, wins, losses FROM {records_table} WHERE server_id = ?", (server_id,))
+    else:
+        cursor.execute(f"SELECT server_id, team_name, wins, losses FROM {records_table}")
+    return {(row[0], row[1]): (row[2], row[3]) for row in cursor.fetchall()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild team record snapshots from the game result log")
+    parser.add_argument("--league", choices=sorted(LEAGUE_RECORD_TABLES), help="Only rebuild one league")
+    parser.add_argument("--server-id", help="Only rebuild one guild")
+    parser.add_argument("--check", action="store_true", help="Report drift without writing anything")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DatabaseConfig.get_db_path("teams"))
+    conn.isolation_level = None
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    ensure_schema(conn)
+
+    drifted = 0
+    leagues = [args.league] if args.league else list(LEAGUE_RECORD_TABLES)
+    print(f"🔄 Rebuilding team records from game_results{' (check only)' if args.check else ''}")
+    for league in leagues:
+        records_table = LEAGUE_RECORD_TABLES[league]
+        before = snapshot(cursor, records_table, args.server_id)
+
+        start = time.perf_counter()
+        teams = rebuild_records(conn, league, args.server_id)
+        elapsed = time.perf_counter() - start
+
+        after = snapshot(cursor, records_table, args.server_id)
+        changed = sorted(key for key in before.keys() | after.keys() if before.get(key) != after.get(key))
+        drifted += len(changed)
+        print(f"  {league}: {teams} team records in {elapsed * 1000:.1f}ms, {len(changed)} changed")
+        for server_id, team in changed[:20]:
+            print(f"    {server_id} {team}: {before.get((server_id, team))} -> {after.get((server_id, team))}")
+        if len(changed) > 20:
+            print(f"    ... and {len(changed) - 20} more")
+
+    if args.check:
+        cursor.execute("ROLLBACK")
+        print("↩️  Rolled back (check only)")
+    else:
+        cursor.execute("COMMIT")
+        print("✅ Records rebuilt")
+    conn.close()
+
+    if args.check and drifted:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
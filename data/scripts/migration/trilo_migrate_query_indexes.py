@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Migrate Hot Lookup Indexes (versioned)
+
+Team lookups filter on LOWER(team_name) = ? AND server_id = ?, which the
+original UNIQUE(team_name, server_id) constraint cannot serve, so every owner
+check scanned cfb_teams/nfl_teams. This migration adds expression indexes for
+those lookups plus the attribute point/request indexes.
+
+Applied steps are recorded per database in a schema_migrations table, so the
+script is safe to re-run; only missing versions are applied.
+
+    python3 data/scripts/migration/trilo_migrate_query_indexes.py
+    python3 data/scripts/migration/trilo_migrate_query_indexes.py --check-plans
+    python3 data/scripts/migration/trilo_migrate_query_indexes.py --check-plans --scratch
+
+--check-plans runs EXPLAIN QUERY PLAN over the bot's hot queries and exits
+with status 1 if any of them falls back to a full table scan. --scratch does
+the same against throwaway databases (current schema, freshly migrated)
+instead of the live ones.
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Allow importing project config
+project_root = Path(__file__).parent.parent.parent.parent.resolve()
+sys.path.insert(0, str(project_root))
+from config.database import DatabaseConfig
+
+LEAGUES = ("cfb", "nfl")
+
+
+# --------------------
+# Helpers
+# --------------------
+
+def table_columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def has_leading_index(cursor, table, columns):
+    """True if an existing index on table starts with exactly these plain columns"""
+    cursor.execute(f"PRAGMA index_list({table})")
+    for index in cursor.fetchall():
+        cursor.execute(f"PRAGMA index_info({index[1]})")
+        indexed = [row[2] for row in sorted(cursor.fetchall())]
+        if indexed[:len(columns)] == list(columns):
+            return True
+    return False
+
+
+def create_index(cursor, table, name, expression, required_columns):
+    """Create an index if the table and its columns exist (live schemas vary)"""
+    columns = table_columns(cursor, table)
+    if not columns:
+        print(f"  ⏭️  {table} not found, skipping {name}")
+        return
+    missing = set(required_columns) - columns
+    if missing:
+        print(f"  ⏭️  {table} has no {', '.join(sorted(missing))}, skipping {name}")
+        return
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({expression})")
+    print(f"  ✅ {name} on {table}({expression})")
+
+
+# --------------------
+# Migrations
+# --------------------
+
+def teams_v1(cursor):
+    """Case-insensitive team lookups and per-server record reads"""
+    for league in LEAGUES:
+        create_index(
+            cursor, f"{league}_teams", f"idx_{league}_teams_server_team_lower",
+            "server_id, LOWER(team_name)", ("server_id", "team_name")
+        )
+        records_table = f"{league}_team_records"
+        if has_leading_index(cursor, records_table, ("server_id", "team_name")):
+            print(f"  ✅ {records_table} already indexed by (server_id, team_name)")
+        else:
+            create_index(
+                cursor, records_table, f"idx_{league}_team_records_server_team",
+                "server_id, team_name", ("server_id", "team_name")
+            )
+
+
+def attributes_v1(cursor):
+    """Point balance and pending-request lookups"""
+    create_index(
+        cursor, "attribute_points", "idx_attribute_points_user_server",
+        "user_id, server_id", ("user_id", "server_id")
+    )
+    create_index(
+        cursor, "attribute_points", "idx_attribute_points_server_available",
+        "server_id, available", ("server_id", "available")
+    )
+    create_index(
+        cursor, "attribute_requests", "idx_attribute_requests_server_status",
+        "server_id, status", ("server_id", "status")
+    )
+
+
+MIGRATIONS = {
+    "teams": [
+        (1, "team_lookup_indexes", teams_v1),
+    ],
+    "attributes": [
+        (1, "attribute_lookup_indexes", attributes_v1),
+    ],
+}
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at DATETIME DEFAULT (datetime('now', 'localtime'))
+        )
+    """)
+
+
+def migrate_database(db_name, db_path, dry_run=False):
+    """Apply every pending migration for one database; returns versions applied"""
+    print(f"\n🔄 {db_name} ({db_path})")
+    conn = sqlite3.connect(str(db_path))
+    try:
+        cursor = conn.cursor()
+        ensure_migrations_table(cursor)
+        cursor.execute("SELECT version FROM schema_migrations")
+        applied = {row[0] for row in cursor.fetchall()}
+
+        pending = [m for m in MIGRATIONS[db_name] if m[0] not in applied]
+        if not pending:
+            print("  ✅ Up to date")
+            return []
+
+        for version, name, step in pending:
+            if dry_run:
+                print(f"  📝 Would apply v{version} {name}")
+                continue
+            print(f"  📝 Applying v{version} {name}...")
+            # Each version commits on its own so a failure leaves earlier steps applied
+            with conn:
+                step(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                    (version, name)
+                )
+            conn.execute("ANALYZE")
+        return [version for version, _, _ in pending]
+    finally:
+        conn.close()
+
+
+# --------------------
+# Query Plan Check
+# --------------------
+
+def hot_queries():
+    """(db_name, label, sql, params) for the lookups the bot runs per command/reaction"""
+    queries = []
+    for league in LEAGUES:
+        teams, records = f"{league}_teams", f"{league}_team_records"
+        queries += [
+            ("teams", f"{league} owner by team",
+             f"SELECT user_id FROM {teams} WHERE LOWER(team_name) = ? AND server_id = ?", ("alabama", "1")),
+            ("teams", f"{league} unassign by team",
+             f"SELECT rowid FROM {teams} WHERE LOWER(team_name) = ? AND server_id = ?", ("alabama", "1")),
+            ("teams", f"{league} team by user",
+             f"SELECT team_name FROM {teams} WHERE user_id = ? AND server_id = ?", ("2", "1")),
+            ("teams", f"{league} owner map",
+             f"SELECT team_name, user_id FROM {teams} WHERE server_id = ? ORDER BY id", ("1",)),
+            ("teams", f"{league} record by team",
+             f"SELECT wins, losses FROM {records} WHERE server_id = ? AND team_name = ?", ("1", "alabama")),
+            ("teams", f"{league} records for server",
+             f"SELECT team_name, wins, losses FROM {records} WHERE server_id = ?", ("1",)),
+        ]
+    queries += [
+        ("attributes", "points balance",
+         "SELECT available FROM attribute_points WHERE user_id = ? AND server_id = ?", ("2", "1")),
+        ("attributes", "points leaderboard",
+         "SELECT user_id, available FROM attribute_points WHERE server_id = ? ORDER BY available DESC", ("1",)),
+        ("attributes", "pending requests",
+         "SELECT request_number FROM attribute_requests WHERE status = 'pending' AND server_id = ?", ("1",)),
+        ("attributes", "request history",
+         "SELECT request_number FROM attribute_requests WHERE user_id = ? AND server_id = ?", ("2", "1")),
+    ]
+    return queries
+
+
+def full_scans(conn, sql, params):
+    """Return the SCAN lines from a query plan (an empty list means every table is searched)"""
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [row[-1] for row in plan if row[-1].startswith("SCAN")]
+
+
+def check_plans(db_paths):
+    failures = 0
+    print("\n🔍 Checking query plans")
+    for db_name, label, sql, params in hot_queries():
+        if not db_paths[db_name].exists():
+            continue
+        conn = sqlite3.connect(str(db_paths[db_name]))
+        try:
+            scans = full_scans(conn, sql, params)
+        except sqlite3.OperationalError as e:
+            print(f"  ⏭️  {label}: {e}")
+            continue
+        finally:
+            conn.close()
+        if scans:
+            failures += 1
+            print(f"  ❌ {label}: {'; '.join(scans)}")
+        else:
+            print(f"  ✅ {label}")
+    return failures
+
+
+def build_scratch_databases(data_dir):
+    """Create empty teams/attributes databases with the current live schema"""
+    paths = {"teams": data_dir / "trilo_teams.db", "attributes": data_dir / "trilo_attributes.db"}
+
+    conn = sqlite3.connect(str(paths["teams"]))
+    for league in LEAGUES:
+        conn.execute(f"""
+            CREATE TABLE {league}_teams (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                team_name TEXT NOT NULL,
+                server_id TEXT NOT NULL,
+                UNIQUE(user_id, server_id),
+                UNIQUE(team_name, server_id)
+            )
+        """)
+        conn.execute(f"""
+            CREATE TABLE {league}_team_records (
+                server_id TEXT NOT NULL,
+                team_name TEXT NOT NULL,
+                wins INTEGER DEFAULT 0,
+                losses INTEGER DEFAULT 0,
+                last_updated DATETIME,
+                PRIMARY KEY (server_id, team_name)
+            )
+        """)
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(str(paths["attributes"]))
+    conn.execute("""
+        CREATE TABLE attribute_points (
+            user_id TEXT NOT NULL,
+            server_id TEXT NOT NULL,
+            available INTEGER DEFAULT 0,
+            total_earned INTEGER DEFAULT 0,
+            created_at DATETIME,
+            last_updated DATETIME
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE attribute_requests (
+            request_number INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            server_id TEXT NOT NULL,
+            player TEXT,
+            attribute TEXT,
+            amount INTEGER,
+            status TEXT DEFAULT 'pending',
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            created_at DATETIME,
+            updated_at DATETIME
+        )
+    """)
+    conn.commit()
+    conn.close()
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned lookup-index migrations")
+    parser.add_argument("--dry-run", action="store_true", help="List pending migrations without applying them")
+    parser.add_argument("--check-plans", action="store_true", help="Fail if a hot query still does a full table scan")
+    parser.add_argument("--scratch", action="store_true", help="Run against throwaway databases instead of the live ones")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.scratch:
+            db_paths = build_scratch_databases(Path(tmp))
+        else:
+            db_paths = {name: Path(DatabaseConfig.get_db_path(name)) for name in MIGRATIONS}
+
+        for db_name in MIGRATIONS:
+            if not db_paths[db_name].exists():
+                print(f"\n⚠️ {db_name} database not found at {db_paths[db_name]}, skipping")
+                continue
+            migrate_database(db_name, db_paths[db_name], dry_run=args.dry_run)
+
+        if args.check_plans:
+            failures = check_plans(db_paths)
+            if failures:
+                print(f"\n❌ {failures} hot quer{'y' if failures == 1 else 'ies'} fell back to a table scan")
+                sys.exit(1)
+            print("\n✅ Every hot query is served by an index")
+            return
+
+    print("\n✅ Migration complete!")
+
+
+if __name__ == "__main__":
+    main()
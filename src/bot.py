@@ -1,117 +1,199 @@
-"""
-Main Trilo Discord Bot class
-"""
-import logging
-import discord
-from discord.ext import commands
-
-from config.settings import BotSettings
-from config.database import DatabaseConfig
-
-class TriloBot(commands.Bot):
-    """Main Trilo Discord Bot class"""
-    
-    def __init__(self):
-        intents = BotSettings.get_discord_intents()
-        super().__init__(
-            command_prefix=BotSettings.COMMAND_PREFIX,
-            intents=intents
-        )
-        
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
-        
-        # Ensure data directory exists
-        DatabaseConfig.ensure_data_dir()
-    
-    async def setup_hook(self):
-        """Setup hook called when bot is starting up"""
-        # Register all command groups
-        await self._register_commands()
-    
-    async def _register_commands(self):
-        """Register all command groups"""
-        try:
-            from commands.admin import setup_admin_commands
-            from commands.teams import setup_team_commands
-            from commands.matchups import setup_matchup_commands
-            from commands.message import setup_message_commands
-            from commands.points import setup_points_commands
-            
-            from commands.records import setup_records_commands
-            from commands.settings import setup_settings_commands
-            from commands.help import setup_help_commands
-            
-            setup_admin_commands(self)
-            setup_team_commands(self)
-            setup_matchup_commands(self)
-            setup_message_commands(self)
-            setup_points_commands(self)
-    
-            setup_settings_commands(self)
-            setup_records_commands(self)
-            setup_help_commands(self)
-            
-            self.logger.info("✅ All command groups registered successfully")
-        except Exception as e:
-            self.logger.error(f"❌ Error registering commands: {e}")
-            raise
-    
-    async def on_ready(self):
-        """Called when bot is ready"""
-        self.logger.info(f"Bot is ready. Logged in as {self.user}")
-        
-        try:
-            synced = await self.tree.sync()
-            total_commands = sum(1 for command in self.tree.walk_commands())
-            self.logger.info(f"Synced {total_commands} command(s).")
-        except Exception as e:
-            self.logger.error(f"Error syncing commands: {e}")
-    
-    async def on_guild_join(self, guild: discord.Guild):
-        """Called when bot joins a new guild"""
-        try:
-            if guild.owner:
-                embed = discord.Embed(
-                    title="🎉 Welcome to Trilo!",
-                    description=(
-                        "Thanks for adding Trilo to your server!\n\n"
-                        "💡 To use a command, type `/` and begin typing its name.\n"
-                        "🎮 Or tap the Discord Controller icon (next to your keyboard) to browse available options and use the built-in forms.\n\n"
-                        "**Get started with these commands:**\n"
-                        "• `/admin guide` — Step-by-step setup walkthrough\n"
-                        "• `/trilo help` — View all features and commands\n\n"
-                        f"**💬 Need help?**\n- Use `/trilo help` for detailed guidance\n- Or [join our Support Server]({BotSettings.SUPPORT_SERVER_URL})"
-                    ),
-                    color=discord.Color.green()
-                )
-                embed.set_footer(text="Trilo • The Dynasty League Assistant")
-
-                await guild.owner.send(embed=embed)
-                self.logger.info(f"✅ Sent welcome message to {guild.owner.name}")
-        except Exception as e:
-            self.logger.error(f"❌ Could not DM server owner in {guild.name}: {e}")
-    
-    async def on_member_remove(self, member: discord.Member):
-        """Called when a member leaves the guild"""
-        try:
-            from utils import get_db_connection
-            
-            # Remove team assignment for this specific server only
-            with get_db_connection("teams") as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM cfb_teams WHERE user_id = ? AND server_id = ?", (member.id, str(member.guild.id)))
-                conn.commit()
-                self.logger.info(f"Removed team assignment for user {member.id} ({member.name}) from server {member.guild.id}")
-
-            # Remove attribute points
-            with get_db_connection("attributes") as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM attribute_points WHERE user_id = ?", (member.id,))
-                cursor.execute("DELETE FROM attribute_requests WHERE user_id = ?", (member.id,))
-                conn.commit()
-                self.logger.info(f"Removed attribute points and requests for user {member.id} ({member.name})")
-        except Exception as e:
-            self.logger.error(f"Error cleaning up data for user {member.id}: {e}") 
-    
+"""
+Main Trilo Discord Bot class
+"""
+import logging
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from config.settings import BotSettings
+from config.database import DatabaseConfig
+
+class TriloCommandTree(app_commands.CommandTree):
+    """Command tree that loads the guild's settings before any check, command or autocomplete runs"""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.guild_id is not None:
+            from utils.settings_cache import settings_cache
+            try:
+                # Checks and commands read settings synchronously; this keeps those reads cache hits
+                await settings_cache.fetch(interaction.guild_id)
+            except Exception as e:
+                print(f"[Settings Cache] Failed to load settings for {interaction.guild_id}: {e}")
+        return True
+
+class TriloBot(commands.Bot):
+    """Main Trilo Discord Bot class"""
+    
+    def __init__(self):
+        intents = BotSettings.get_discord_intents()
+        super().__init__(
+            command_prefix=BotSettings.COMMAND_PREFIX,
+            intents=intents,
+            tree_cls=TriloCommandTree,
+            max_ratelimit_timeout=BotSettings.MAX_RATELIMIT_TIMEOUT
+        )
+        
+        # Setup logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger(__name__)
+        
+        # Ensure data directory exists
+        DatabaseConfig.ensure_data_dir()
+    
+    async def setup_hook(self):
+        """Setup hook called when bot is starting up"""
+        from utils.async_db import db
+        from utils.autocomplete_index import autocomplete_index
+        from utils.team_matcher import team_matcher
+        from utils.team_registry import team_registry
+        from utils.channel_renames import rename_scheduler
+        from utils.entitlements import entitlement_cache
+        from utils.game_results import ensure_schema
+        from utils.matchup_store import matchup_store
+
+        # Register all command groups
+        await self._register_commands()
+
+        # Game result log (seeds existing records as baselines on first run)
+        await db.run("teams", ensure_schema)
+
+        # Live tracker message IDs for the reaction fast path
+        await matchup_store.load_live_messages()
+
+        # Team and matchup names for autocomplete
+        await autocomplete_index.load()
+
+        # Trigram index + aliases for typo-tolerant team names
+        await team_matcher.load()
+
+        # Interned team IDs and display names for every known spelling
+        await team_registry.load()
+
+        # Apply queued channel renames (including ones saved before a restart)
+        await rename_scheduler.start(self)
+
+        # Keep entitlements for active guilds warm
+        entitlement_cache.start()
+    
+    async def _register_commands(self):
+        """Register all command groups"""
+        try:
+            from commands.admin import setup_admin_commands
+            from commands.teams import setup_team_commands
+            from commands.matchups import setup_matchup_commands
+            from commands.message import setup_message_commands
+            from commands.points import setup_points_commands
+            
+            from commands.records import setup_records_commands
+            from commands.settings import setup_settings_commands
+            from commands.help import setup_help_commands
+            
+            setup_admin_commands(self)
+            setup_team_commands(self)
+            setup_matchup_commands(self)
+            setup_message_commands(self)
+            setup_points_commands(self)
+    
+            setup_settings_commands(self)
+            setup_records_commands(self)
+            setup_help_commands(self)
+            
+            self.logger.info("✅ All command groups registered successfully")
+        except Exception as e:
+            self.logger.error(f"❌ Error registering commands: {e}")
+            raise
+    
+    async def close(self):
+        """Release pooled resources before the gateway connection shuts down"""
+        from utils.async_db import db
+        from utils.autocomplete_index import autocomplete_index
+        from utils.team_matcher import team_matcher
+        from utils.team_registry import team_registry
+        from utils.channel_renames import rename_scheduler
+        from utils.command_logger import command_logger
+        from utils.db_pool import connection_pool
+        from utils.entitlements import entitlement_cache
+        from utils.image_preprocessing import image_preprocessor
+        from utils.settings_cache import settings_cache
+        from utils.standings import standings
+        from utils.vision_cache import vision_cache
+        from utils.vision_scheduler import vision_scheduler
+
+        await super().close()
+        self.logger.info(f"Settings cache stats: {settings_cache.stats()}")
+        self.logger.info(f"Entitlement cache stats: {entitlement_cache.stats()}")
+        self.logger.info(f"Vision cache stats: {vision_cache.stats()}")
+        self.logger.info(f"Vision scheduler stats: {vision_scheduler.stats()}")
+        self.logger.info(f"Standings cache stats: {standings.stats()}")
+        self.logger.info(f"Rename scheduler stats: {rename_scheduler.stats()}")
+        self.logger.info(f"Autocomplete index stats: {autocomplete_index.stats()}")
+        self.logger.info(f"Team matcher stats: {team_matcher.stats()}")
+        self.logger.info(f"Team registry stats: {team_registry.stats()}")
+        await rename_scheduler.close()
+        await vision_scheduler.close()
+        await entitlement_cache.close()
+        command_logger.flush_and_close()
+        image_preprocessor.shutdown()
+        db.shutdown()
+        connection_pool.close_all()
+
+    async def on_ready(self):
+        """Called when bot is ready"""
+        self.logger.info(f"Bot is ready. Logged in as {self.user}")
+        
+        try:
+            synced = await self.tree.sync()
+            total_commands = sum(1 for command in self.tree.walk_commands())
+            self.logger.info(f"Synced {total_commands} command(s).")
+        except Exception as e:
+            self.logger.error(f"Error syncing commands: {e}")
+    
+    async def on_guild_join(self, guild: discord.Guild):
+        """Called when bot joins a new guild"""
+        try:
+            if guild.owner:
+                embed = discord.Embed(
+                    title="🎉 Welcome to Trilo!",
+                    description=(
+                        "Thanks for adding Trilo to your server!\n\n"
+                        "💡 To use a command, type `/` and begin typing its name.\n"
+                        "🎮 Or tap the Discord Controller icon (next to your keyboard) to browse available options and use the built-in forms.\n\n"
+                        "**Get started with these commands:**\n"
+                        "• `/admin guide` — Step-by-step setup walkthrough\n"
+                        "• `/trilo help` — View all features and commands\n\n"
+                        f"**💬 Need help?**\n- Use `/trilo help` for detailed guidance\n- Or [join our Support Server]({BotSettings.SUPPORT_SERVER_URL})"
+                    ),
+                    color=discord.Color.green()
+                )
+                embed.set_footer(text="Trilo • The Dynasty League Assistant")
+
+                await guild.owner.send(embed=embed)
+                self.logger.info(f"✅ Sent welcome message to {guild.owner.name}")
+        except Exception as e:
+            self.logger.error(f"❌ Could not DM server owner in {guild.name}: {e}")
+    
+    async def on_member_remove(self, member: discord.Member):
+        """Called when a member leaves the guild"""
+        try:
+            from utils import get_db_connection
+            from utils.async_db import db
+            from utils.autocomplete_index import autocomplete_index
+            from utils.standings import standings
+
+            # Remove team assignment for this specific server only
+            await db.execute("teams", "DELETE FROM cfb_teams WHERE user_id = ? AND server_id = ?", (member.id, str(member.guild.id)))
+            standings.invalidate(member.guild.id)
+            autocomplete_index.invalidate_guild(member.guild.id)
+            self.logger.info(f"Removed team assignment for user {member.id} ({member.name}) from server {member.guild.id}")
+
+            # Remove attribute points
+            with get_db_connection("attributes") as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM attribute_points WHERE user_id = ?", (member.id,))
+                cursor.execute("DELETE FROM attribute_requests WHERE user_id = ?", (member.id,))
+                conn.commit()
+                self.logger.info(f"Removed attribute points and requests for user {member.id} ({member.name})")
+        except Exception as e:
+            self.logger.error(f"Error cleaning up data for user {member.id}: {e}") 
+    
@@ -8,7 +8,7 @@ import time
 import logging
 from typing import Optional
 from config.settings import BotSettings
-from utils import get_db_connection
+from utils.settings_cache import settings_cache
 
 # Rate limiting for error logs
 @functools.lru_cache(maxsize=100)
@@ -96,15 +96,7 @@ async def _handle_stream_detection(bot, message, content, raw_content):
     server_id = str(message.guild.id)
 
     try:
-        with get_db_connection("keys") as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT setting, new_value FROM server_settings
-                WHERE server_id = ? AND setting IN (
-                    'stream_notify_role', 'stream_watch_channel', 'stream_announcements_enabled'
-                )
-            """, (server_id,))
-            settings = dict(cursor.fetchall())
+        settings = await settings_cache.fetch(server_id)
     except Exception as e:
         # Secure exception logging with rate limiting
         error_context = "[Stream Settings Fetch]"
@@ -3,22 +3,47 @@ Reaction event handlers for Trilo Discord Bot
 """
 import discord
 from config.settings import BotSettings
-from utils import get_db_connection, strip_status_suffix, apply_status_suffix, clean_team_key, format_team_name
+from utils import db, strip_status_suffix, apply_status_suffix
 from commands.settings import is_record_tracking_enabled, get_commissioner_roles
+from utils.channel_renames import rename_scheduler
+from utils.game_results import channel_context, record_game
+from utils.standings import standing_rows, standings
+from utils.settings_cache import settings_cache
+from utils.team_registry import team_registry
+from utils.matchup_store import (
+    matchup_store, STATUS_COMPLETED, STATUS_FAIR_SIM, STATUS_FORCE_WIN, STATUS_RESULT_RECORDED
+)
+
+# Messages in unrecorded channels already fetched and found not to be a tracker / prompt
+MAX_CHECKED_MESSAGES = 10000
+_checked_messages = set()
 
 async def handle_reaction_add(bot, payload: discord.RawReactionActionEvent):
     """Handle reaction add events"""
+    # Fast path: every reaction in every guild lands here. Anything that isn't
+    # on a live tracker / result prompt is dropped without DB, REST or logging,
+    # unless it's a valid reaction in an unrecorded "-vs-" channel (a matchup
+    # created before the store, handled by the slow path below).
+    emoji = str(payload.emoji)
+    live = matchup_store.is_live_message(payload.message_id)
+    if not live:
+        if (
+            emoji not in BotSettings.VALID_REACTIONS
+            or matchup_store.is_recorded_channel(payload.channel_id)
+            or payload.message_id in _checked_messages
+        ):
+            return
+        legacy_channel = bot.get_channel(payload.channel_id)
+        if not isinstance(legacy_channel, discord.TextChannel) or "-vs-" not in strip_status_suffix(legacy_channel.name):
+            return
+
     if payload.user_id == bot.user.id:
         return
 
-    emoji = str(payload.emoji)
     if emoji not in BotSettings.VALID_REACTIONS:
         return
 
     guild = bot.get_guild(payload.guild_id)
-    server_id = str(payload.guild_id)
-    record_tracking = is_record_tracking_enabled(server_id)
-
     if guild is None:
         return
 
@@ -26,58 +51,88 @@ async def handle_reaction_add(bot, payload: discord.RawReactionActionEvent):
     if member is None:
         return
         
-    # Get commissioner roles from database
+    server_id = str(payload.guild_id)
+    await settings_cache.fetch(server_id)
     commissioner_roles = get_commissioner_roles(server_id)
-    user_roles = {role.name for role in member.roles}
-    bot.logger.info(f"User {member.name} has roles: {user_roles}")
-    bot.logger.info(f"Commissioner roles for server {server_id}: {commissioner_roles}")
-    
     if not any(role.name in commissioner_roles for role in member.roles):
-        bot.logger.info(f"User {member.name} does not have commissioner permissions")
+        bot.logger.debug(f"User {member.name} does not have commissioner permissions")
         return
 
     channel = guild.get_channel(payload.channel_id)
     if not isinstance(channel, discord.TextChannel):
         return
 
+    if live:
+        record = await matchup_store.get_by_message(payload.message_id)
+    else:
+        record = await _record_legacy_message(bot, channel, payload.message_id)
+    if record is None:
+        return
+    record_tracking = is_record_tracking_enabled(server_id)
+
     # Handle 🔴 and 🔵 reactions for game results
     if emoji in {"🔴", "🔵"} and record_tracking:
-        await _handle_game_result(bot, payload, channel, emoji, server_id, record_tracking)
+        await _handle_game_result(bot, payload, channel, emoji, server_id, record_tracking, record)
         return
 
     # Handle other reactions (✅, 🎲, 🟥, 🟦)
-    await _handle_status_reaction(bot, payload, channel, emoji, server_id, record_tracking)
+    await _handle_status_reaction(bot, payload, channel, emoji, server_id, record_tracking, record)
 
-async def _handle_game_result(bot, payload, channel, emoji, server_id, record_tracking):
-    """Handle game result reactions (🔴, 🔵)"""
-    try:
-        msg = await channel.fetch_message(payload.message_id)
-        if msg.author.id != bot.user.id:
-            return
-
-        content = msg.content.lower()
-        if "who won?" not in content:
-            return
+async def _record_legacy_message(bot, channel, message_id):
+    """Slow path for matchups created before the store: fetch the reacted message and,
+    if it's a bot tracker or "who won?" prompt, record the channel from its name"""
+    name = strip_status_suffix(rename_scheduler.pending_name(channel.id) or channel.name)
+    parts = name.split("-vs-")
+    if len(parts) != 2:
+        return None
 
-        parts = strip_status_suffix(channel.name).split("-vs-")
-        if len(parts) != 2:
-            return
+    try:
+        message = await channel.fetch_message(message_id)
+    except discord.NotFound:
+        message = None
+    except discord.HTTPException as e:
+        bot.logger.error(f"Error fetching legacy matchup message in {channel.name}: {e}")
+        return None
+
+    is_tracker = message is not None and message.author.id == bot.user.id and "Game Status Tracker" in message.content
+    is_prompt = message is not None and message.author.id == bot.user.id and "who won?" in message.content.lower()
+    if not (is_tracker or is_prompt):
+        if len(_checked_messages) >= MAX_CHECKED_MESSAGES:
+            _checked_messages.clear()
+        _checked_messages.add(message_id)
+        return None
+
+    team1_key, team2_key = team_registry.key(parts[0]), team_registry.key(parts[1])
+    await matchup_store.record_channels(channel.guild.id, channel.category, "cfb", [
+        (channel.id, team1_key, team2_key, message_id if is_tracker else None)
+    ])
+    if is_prompt:
+        await matchup_store.set_status(channel.id, STATUS_COMPLETED, result_message_id=message_id)
+    print(f"[Matchup Store] Recorded legacy matchup channel {channel.name}")
+    return await matchup_store.get_by_message(message_id)
+
+async def _handle_game_result(bot, payload, channel, emoji, server_id, record_tracking, record):
+    """Handle game result reactions (🔴, 🔵)"""
+    if record.result_message_id != str(payload.message_id):
+        return
 
-        team1_key = clean_team_key(parts[0])
-        team2_key = clean_team_key(parts[1])
-        winner_key, loser_key = (team1_key, team2_key) if emoji == "🔴" else (team2_key, team1_key)
+    try:
+        winner_id, loser_id = (
+            (record.team1_id, record.team2_id) if emoji == "🔴" else (record.team2_id, record.team1_id)
+        )
 
         if record_tracking:
-            await _record_game_result(server_id, winner_key, loser_key)
+            await _record_game_result(server_id, winner_id, loser_id, channel, payload.user_id)
 
-        await msg.delete()
+        await channel.get_partial_message(payload.message_id).delete()
+        await matchup_store.set_status(channel.id, STATUS_RESULT_RECORDED)
         
         # Get updated records
-        winner_record, loser_record = await _get_team_records(server_id, winner_key, loser_key, record_tracking)
+        winner_record, loser_record = await _get_team_records(server_id, winner_id, loser_id, record_tracking)
         
         # Format and send result message
-        pretty_winner = format_team_name(winner_key)
-        pretty_loser = format_team_name(loser_key)
+        pretty_winner = team_registry.display(winner_id)
+        pretty_loser = team_registry.display(loser_id)
         
         winner_str = f" ({winner_record[0]}-{winner_record[1]})" if record_tracking else ""
         loser_str = f" ({loser_record[0]}-{loser_record[1]})" if record_tracking else ""
@@ -90,17 +145,13 @@ async def _handle_game_result(bot, payload, channel, emoji, server_id, record_tr
     except Exception as e:
         bot.logger.error(f"[Reaction Record Error] {e}")
 
-async def _handle_status_reaction(bot, payload, channel, emoji, server_id, record_tracking):
+async def _handle_status_reaction(bot, payload, channel, emoji, server_id, record_tracking, record):
     """Handle status reactions (✅, 🎲, 🟥, 🟦)"""
-    try:
-        message = await channel.fetch_message(payload.message_id)
-    except discord.NotFound:
+    if record.tracker_message_id != str(payload.message_id):
         return
 
-    if message.author.id != bot.user.id:
-        return
-
-    original_name = strip_status_suffix(channel.name)
+    # A queued rename is the channel's real name as far as status goes
+    original_name = strip_status_suffix(rename_scheduler.pending_name(channel.id) or channel.name)
     if "-vs-" not in original_name:
         return
 
@@ -110,153 +161,106 @@ async def _handle_status_reaction(bot, payload, channel, emoji, server_id, recor
 
     # Handle different status reactions
     if emoji in {"✅", "🎲"}:
-        await _handle_completion_reaction(bot, payload, channel, emoji, parts, server_id, record_tracking)
+        await _handle_completion_reaction(bot, payload, channel, emoji, parts, server_id, record_tracking, record)
     elif emoji == "🟥":
-        await _handle_team1_win_reaction(bot, payload, channel, parts, server_id, record_tracking)
+        await _handle_team1_win_reaction(bot, payload, channel, parts, server_id, record_tracking, record)
     elif emoji == "🟦":
-        await _handle_team2_win_reaction(bot, payload, channel, parts, server_id, record_tracking)
+        await _handle_team2_win_reaction(bot, payload, channel, parts, server_id, record_tracking, record)
 
-async def _handle_completion_reaction(bot, payload, channel, emoji, parts, server_id, record_tracking):
+async def _delete_status_tracker(bot, payload, channel):
+    """Delete the Game Status Tracker that was reacted to (by ID, no fetch)"""
+    try:
+        await channel.get_partial_message(payload.message_id).delete()
+    except Exception as e:
+        bot.logger.error(f"Error deleting Game Status Tracker message: {e}")
+
+async def _handle_completion_reaction(bot, payload, channel, emoji, parts, server_id, record_tracking, record):
     """Handle completion reactions (✅, 🎲)"""
     new_name = apply_status_suffix(f"{parts[0]}-vs-{parts[1]}", emoji)
 
-    try:
-        await channel.edit(name=new_name)
-    except discord.Forbidden:
-        bot.logger.error(f"Missing permissions to rename channel {channel.name}")
-    except Exception as e:
-        bot.logger.error(f"Error renaming channel: {e}")
+    # Queued, not awaited: renames are limited to 2 per channel per 10 minutes
+    await rename_scheduler.request(channel, new_name)
 
-    try:
-        # Delete the Game Status Tracker message directly using the message ID from the reaction
-        message = await channel.fetch_message(payload.message_id)
-        if message.author.id == bot.user.id and "Game Status Tracker" in message.content:
-            await message.delete()
-        else:
-            # Fallback: search for the message if direct deletion fails
-            async for msg in channel.history(limit=20):
-                if (msg.author.id == bot.user.id and 
-                    "Game Status Tracker" in msg.content and
-                    any(e in str(msg.content) for e in ["✅", "🎲", "🟥", "🟦"])):
-                    await msg.delete()
-                    break
-    except Exception as e:
-        bot.logger.error(f"Error deleting Game Status Tracker message: {e}")
+    await _delete_status_tracker(bot, payload, channel)
 
+    result_prompt = None
     if record_tracking:
-        team1 = parts[0].replace("-", " ").title()
-        team2 = parts[1].replace("-", " ").title()
+        team1 = team_registry.display(record.team1_id)
+        team2 = team_registry.display(record.team2_id)
         result_prompt = await channel.send(
             f"{emoji} Game completed. Who won?\nReact:\n🔴 = {team1}\n🔵 = {team2}"
         )
         await result_prompt.add_reaction("🔴")
         await result_prompt.add_reaction("🔵")
 
-async def _handle_team1_win_reaction(bot, payload, channel, parts, server_id, record_tracking):
+    await matchup_store.set_status(
+        channel.id,
+        STATUS_COMPLETED if emoji == "✅" else STATUS_FAIR_SIM,
+        result_message_id=result_prompt.id if result_prompt else None
+    )
+
+async def _handle_team1_win_reaction(bot, payload, channel, parts, server_id, record_tracking, record):
     """Handle team 1 win reaction (🟥)"""
     new_name = apply_status_suffix(f"fw-{parts[0]}-vs-{parts[1]}", "☑️")
-    team1_key = clean_team_key(parts[0])
-    team2_key = clean_team_key(parts[1])
-    winner_key, loser_key = (team1_key, team2_key)
+    winner_id, loser_id = (record.team1_id, record.team2_id)
 
     if record_tracking:
-        await _record_game_result(server_id, winner_key, loser_key)
+        await _record_game_result(server_id, winner_id, loser_id, channel, payload.user_id)
 
-    await _update_channel_and_cleanup(bot, payload, channel, new_name, server_id, winner_key, loser_key, record_tracking)
+    await _update_channel_and_cleanup(bot, payload, channel, new_name, server_id, winner_id, loser_id, record_tracking)
 
-async def _handle_team2_win_reaction(bot, payload, channel, parts, server_id, record_tracking):
+async def _handle_team2_win_reaction(bot, payload, channel, parts, server_id, record_tracking, record):
     """Handle team 2 win reaction (🟦)"""
     new_name = apply_status_suffix(f"{parts[0]}-vs-fw-{parts[1]}", "☑️")
-    team1_key = clean_team_key(parts[0])
-    team2_key = clean_team_key(parts[1])
-    winner_key, loser_key = (team2_key, team1_key)  # 🟦 = Team 2 wins
+    winner_id, loser_id = (record.team2_id, record.team1_id)  # 🟦 = Team 2 wins
 
     if record_tracking:
-        await _record_game_result(server_id, winner_key, loser_key)
-
-    await _update_channel_and_cleanup(bot, payload, channel, new_name, server_id, winner_key, loser_key, record_tracking)
-
-async def _record_game_result(server_id, winner_key, loser_key):
-    """Record game result in database"""
-    with get_db_connection("teams") as conn:
-        cursor = conn.cursor()
-
-        # Check if teams are CPU
-        cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (winner_key.lower(), server_id))
-        winner_row = cursor.fetchone()
-        is_winner_cpu = not winner_row or winner_row[0] is None
-
-        cursor.execute("SELECT user_id FROM cfb_teams WHERE LOWER(team_name) = ? AND server_id = ?", (loser_key.lower(), server_id))
-        loser_row = cursor.fetchone()
-        is_loser_cpu = not loser_row or loser_row[0] is None
-
-        if not is_winner_cpu:
-            cursor.execute("""
-                INSERT INTO cfb_team_records (server_id, team_name, wins, losses)
-                VALUES (?, ?, 1, 0)
-                ON CONFLICT(server_id, team_name) DO UPDATE SET wins = wins + 1
-            """, (server_id, winner_key))
-
-        if not is_loser_cpu:
-            cursor.execute("""
-                INSERT INTO cfb_team_records (server_id, team_name, wins, losses)
-                VALUES (?, ?, 0, 1)
-                ON CONFLICT(server_id, team_name) DO UPDATE SET losses = losses + 1
-            """, (server_id, loser_key))
-
-        conn.commit()
-
-async def _get_team_records(server_id, winner_key, loser_key, record_tracking):
-    """Get team records from database"""
+        await _record_game_result(server_id, winner_id, loser_id, channel, payload.user_id)
+
+    await _update_channel_and_cleanup(bot, payload, channel, new_name, server_id, winner_id, loser_id, record_tracking)
+
+async def _record_game_result(server_id, winner, loser, channel, user_id):
+    """Append the result to the game log and update records/standings (teams as IDs or keys)"""
+    winner_key, loser_key = team_registry.key(winner), team_registry.key(loser)
+
+    def record(conn):
+        record_game(conn, "cfb", server_id, winner_key, loser_key, "reaction",
+                    recorded_by=user_id, **channel_context(channel))
+        return standing_rows(conn, "cfb", server_id, [winner_key, loser_key])
+
+    standings.apply(server_id, "cfb", await db.run("teams", record))
+
+async def _get_team_records(server_id, winner, loser, record_tracking):
+    """Get team records from database (teams as IDs or keys)"""
     if not record_tracking:
         return (0, 0), (0, 0)
+    winner_key, loser_key = team_registry.key(winner), team_registry.key(loser)
 
-    with get_db_connection("teams") as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT wins, losses FROM cfb_team_records
-            WHERE server_id = ? AND team_name = ?
-        """, (server_id, winner_key))
-        winner_record = cursor.fetchone() or (0, 0)
+    winner_record = await db.fetchone("teams", """
+        SELECT wins, losses FROM cfb_team_records
+        WHERE server_id = ? AND team_name = ?
+    """, (server_id, winner_key)) or (0, 0)
 
-        cursor.execute("""
-            SELECT wins, losses FROM cfb_team_records
-            WHERE server_id = ? AND team_name = ?
-        """, (server_id, loser_key))
-        loser_record = cursor.fetchone() or (0, 0)
+    loser_record = await db.fetchone("teams", """
+        SELECT wins, losses FROM cfb_team_records
+        WHERE server_id = ? AND team_name = ?
+    """, (server_id, loser_key)) or (0, 0)
 
     return winner_record, loser_record
 
-async def _update_channel_and_cleanup(bot, payload, channel, new_name, server_id, winner_key, loser_key, record_tracking):
+async def _update_channel_and_cleanup(bot, payload, channel, new_name, server_id, winner_id, loser_id, record_tracking):
     """Update channel name and cleanup messages"""
-    try:
-        await channel.edit(name=new_name)
-    except discord.Forbidden:
-        bot.logger.error(f"Missing permissions to rename channel {channel.name}")
-    except Exception as e:
-        bot.logger.error(f"Error renaming channel: {e}")
+    # Queued, not awaited: renames are limited to 2 per channel per 10 minutes
+    await rename_scheduler.request(channel, new_name)
 
-    try:
-        # Delete the Game Status Tracker message directly using the message ID from the reaction
-        message = await channel.fetch_message(payload.message_id)
-        if message.author.id == bot.user.id and "Game Status Tracker" in message.content:
-            await message.delete()
-        else:
-            # Fallback: search for the message if direct deletion fails
-            async for msg in channel.history(limit=20):
-                if (msg.author.id == bot.user.id and 
-                    "Game Status Tracker" in msg.content and
-                    any(e in str(msg.content) for e in ["✅", "🎲", "🟥", "🟦"])):
-                    await msg.delete()
-                    break
-    except Exception as e:
-        bot.logger.error(f"Error deleting Game Status Tracker message: {e}")
+    await _delete_status_tracker(bot, payload, channel)
+    await matchup_store.set_status(channel.id, STATUS_FORCE_WIN)
 
     # Get updated records and send result message
-    winner_record, loser_record = await _get_team_records(server_id, winner_key, loser_key, record_tracking)
+    winner_record, loser_record = await _get_team_records(server_id, winner_id, loser_id, record_tracking)
     
-    pretty_winner = format_team_name(winner_key)
-    pretty_loser = format_team_name(loser_key)
+    pretty_winner = team_registry.display(winner_id)
+    pretty_loser = team_registry.display(loser_id)
     
     winner_str = f" ({winner_record[0]}-{winner_record[1]})" if record_tracking else ""
     loser_str = f" ({loser_record[0]}-{loser_record[1]})" if record_tracking else ""
@@ -5,3 +5,4 @@ from .utils import (
     format_team_name,
     clean_team_key
 )
+from .async_db import db
@@ -0,0 +1,134 @@
+# File: utils/async_db.py
+"""
+Async database facade for Trilo
+
+Command and event handlers run on the discord.py event loop, so a plain
+cursor.execute() that waits on a locked database (busy_timeout = 30s) freezes
+the gateway for every guild. This module moves SQLite work onto dedicated
+threads instead:
+
+    row = await db.fetchone("teams", "SELECT ...", (server_id,))
+    await db.execute("teams", "UPDATE ...", (...))
+    count = await db.run("attributes", approve_requests, server_id)
+
+Each database file gets one writer thread (SQLite only allows a single writer,
+so queuing writes in-process avoids busy-timeout spins) and a small bounded
+pool of reader threads. Threads draw their connections from utils.db_pool, so
+every worker keeps its own warm connection.
+"""
+
+import asyncio
+import functools
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from config.database import DatabaseConfig
+from utils.db_pool import connection_pool
+
+# --------------------
+# Executor Settings
+# --------------------
+
+READERS_PER_DATABASE = 4
+
+
+def _fetchone(db_name: str, sql: str, params: Sequence) -> Optional[tuple]:
+    conn = connection_pool.get(db_name)
+    return conn.execute(sql, params).fetchone()
+
+
+def _fetchall(db_name: str, sql: str, params: Sequence) -> List[tuple]:
+    conn = connection_pool.get(db_name)
+    return conn.execute(sql, params).fetchall()
+
+
+def _execute(db_name: str, sql: str, params: Sequence) -> sqlite3.Cursor:
+    conn = connection_pool.get(db_name)
+    with conn:
+        return conn.execute(sql, params)
+
+
+def _executemany(db_name: str, sql: str, seq_of_params: Iterable[Sequence]) -> int:
+    conn = connection_pool.get(db_name)
+    with conn:
+        return conn.executemany(sql, seq_of_params).rowcount
+
+
+def _run(db_name: str, fn: Callable, args: tuple, kwargs: dict) -> Any:
+    conn = connection_pool.get(db_name)
+    with conn:
+        return fn(conn, *args, **kwargs)
+
+
+class AsyncDatabase:
+    """Per-database executors: one writer thread plus a bounded reader pool"""
+
+    def __init__(self, readers_per_database: int = READERS_PER_DATABASE):
+        self._readers_per_database = readers_per_database
+        self._writers: Dict[str, ThreadPoolExecutor] = {}
+        self._readers: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def _executor(self, db_name: str, write: bool) -> ThreadPoolExecutor:
+        executors = self._writers if write else self._readers
+        executor = executors.get(db_name)
+        if executor is not None:
+            return executor
+
+        # Validates the name and raises ValueError for unknown databases
+        DatabaseConfig.get_db_path(db_name)
+        with self._lock:
+            executor = executors.get(db_name)
+            if executor is None:
+                if write:
+                    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"db-{db_name}-writer")
+                else:
+                    executor = ThreadPoolExecutor(
+                        max_workers=self._readers_per_database,
+                        thread_name_prefix=f"db-{db_name}-reader"
+                    )
+                executors[db_name] = executor
+        return executor
+
+    async def _submit(self, db_name: str, write: bool, fn: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        executor = self._executor(db_name, write)
+        return await loop.run_in_executor(executor, functools.partial(fn, *args))
+
+    async def fetchone(self, db_name: str, sql: str, params: Sequence = ()) -> Optional[tuple]:
+        """Run a read query and return the first row (or None)"""
+        return await self._submit(db_name, False, _fetchone, db_name, sql, params)
+
+    async def fetchall(self, db_name: str, sql: str, params: Sequence = ()) -> List[tuple]:
+        """Run a read query and return every row"""
+        return await self._submit(db_name, False, _fetchall, db_name, sql, params)
+
+    async def execute(self, db_name: str, sql: str, params: Sequence = ()) -> sqlite3.Cursor:
+        """Run a single write statement on the writer thread and commit it"""
+        return await self._submit(db_name, True, _execute, db_name, sql, params)
+
+    async def executemany(self, db_name: str, sql: str, seq_of_params: Iterable[Sequence]) -> int:
+        """Run a write statement for every parameter set in one transaction"""
+        return await self._submit(db_name, True, _executemany, db_name, sql, list(seq_of_params))
+
+    async def run(self, db_name: str, fn: Callable, *args, write: bool = True, **kwargs) -> Any:
+        """
+        Call fn(conn, *args, **kwargs) on a database thread inside one transaction.
+        Commits if fn returns, rolls back if it raises. Use for multi-statement work.
+        """
+        return await self._submit(db_name, write, _run, db_name, fn, args, kwargs)
+
+    def shutdown(self):
+        """Stop all database threads (call on bot shutdown, before closing the pool)"""
+        with self._lock:
+            executors = list(self._writers.values()) + list(self._readers.values())
+            self._writers = {}
+            self._readers = {}
+        for executor in executors:
+            executor.shutdown(wait=True)
+
+
+# Global async database instance
+db = AsyncDatabase()
@@ -0,0 +1,190 @@
+# File: utils/autocomplete_index.py
+"""
+In-memory prefix index for Trilo autocompletes
+
+Autocomplete handlers fire on every keystroke. The matchup autocomplete alone
+is bound to 20 parameters of /matchups cfb-create-from-text, and each call ran
+a LIKE 'x%' query. Now:
+  - valid team names and matchup strings for every league are loaded once at
+    startup into sorted lists and answered with a bisect range scan
+  - per-guild lists (assigned teams, teams with records) are loaded on first
+    use and kept for a short TTL; /teams and /records writes invalidate
+    them right away
+
+Matching follows the old LIKE 'x%' behavior: case-insensitive prefix, results
+in name order.
+"""
+
+import bisect
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+from utils.async_db import db
+from utils.standings import LEAGUE_RECORD_TABLES
+from utils.team_owners import LEAGUE_TEAM_TABLES
+
+# --------------------
+# Index Settings
+# --------------------
+
+LEAGUE_VALID_TEAM_TABLES = {"cfb": "cfb_valid_teams", "nfl": "nfl_valid_teams"}
+LEAGUE_MATCHUP_TABLES = {"cfb": "cfb-matchups", "nfl": "nfl-matchups"}
+AUTOCOMPLETE_LIMIT = 10
+MAX_CACHED_GUILD_INDEXES = 2000
+GUILD_INDEX_TTL_SECONDS = 60
+
+GUILD_ASSIGNED = "assigned"
+GUILD_RECORDS = "records"
+
+
+class PrefixIndex:
+    """Sorted, case-insensitive prefix lookup over a fixed list of strings"""
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, values):
+        pairs = sorted({(value.lower(), value) for value in values if value})
+        self._keys = [key for key, _ in pairs]
+        self._values = [value for _, value in pairs]
+
+    def search(self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[str]:
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._keys, prefix)
+        results = []
+        for index in range(start, min(start + limit, len(self._keys))):
+            if not self._keys[index].startswith(prefix):
+                break
+            results.append(self._values[index])
+        return results
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def _column(conn, sql: str, params=()) -> List[str]:
+    try:
+        return [row[0] for row in conn.execute(sql, params).fetchall()]
+    except sqlite3.OperationalError as e:
+        # Table not set up on this install (e.g. no NFL data yet)
+        print(f"[Autocomplete] Skipping: {e}")
+        return []
+
+
+class AutocompleteIndex:
+    """League-wide indexes loaded at startup plus a TTL/LRU of per-guild indexes"""
+
+    def __init__(self, max_guilds: int = MAX_CACHED_GUILD_INDEXES, ttl_seconds: float = GUILD_INDEX_TTL_SECONDS):
+        self.max_guilds = max_guilds
+        self.ttl_seconds = ttl_seconds
+        self._teams: Dict[str, PrefixIndex] = {}
+        self._matchups: Dict[str, PrefixIndex] = {}
+        self._guilds: "OrderedDict[tuple, tuple[float, PrefixIndex]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.guild_loads = 0
+
+    async def load(self):
+        """Load every league's valid teams and matchups (call from the bot's setup_hook)"""
+        def load_teams(conn):
+            return {league: _column(conn, f"SELECT team_name FROM {table}")
+                    for league, table in LEAGUE_VALID_TEAM_TABLES.items()}
+
+        def load_matchups(conn):
+            return {league: _column(conn, f'SELECT matchup FROM "{table}"')
+                    for league, table in LEAGUE_MATCHUP_TABLES.items()}
+
+        teams = await db.run("teams", load_teams, write=False)
+        matchups = await db.run("matchups", load_matchups, write=False)
+        self._teams = {league: PrefixIndex(values) for league, values in teams.items()}
+        self._matchups = {league: PrefixIndex(values) for league, values in matchups.items()}
+        print(f"[Autocomplete] Indexed {sum(map(len, self._teams.values()))} teams, "
+              f"{sum(map(len, self._matchups.values()))} matchups")
+
+    # --------------------
+    # League-wide lookups
+    # --------------------
+
+    async def _ensure_loaded(self):
+        if not self._teams:
+            await self.load()
+
+    async def teams(self, league: str, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[str]:
+        """Valid team names for a league starting with prefix"""
+        await self._ensure_loaded()
+        self.queries += 1
+        index = self._teams.get(league.lower())
+        return index.search(prefix, limit) if index else []
+
+    async def matchups(self, league: str, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[str]:
+        """Matchup strings for a league starting with prefix"""
+        await self._ensure_loaded()
+        self.queries += 1
+        index = self._matchups.get(league.lower())
+        return index.search(prefix, limit) if index else []
+
+    # --------------------
+    # Per-guild lookups
+    # --------------------
+
+    async def _guild_index(self, server_id: str, league: str, kind: str) -> PrefixIndex:
+        key = (server_id, league, kind)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._guilds.get(key)
+            if entry and entry[0] > now:
+                self._guilds.move_to_end(key)
+                return entry[1]
+            generation = self._generations.get(server_id, 0)
+
+        table = LEAGUE_TEAM_TABLES[league] if kind == GUILD_ASSIGNED else LEAGUE_RECORD_TABLES[league]
+        values = await db.run("teams", _column, f"SELECT DISTINCT team_name FROM {table} WHERE server_id = ?",
+                              (server_id,), write=False)
+        index = PrefixIndex(values)
+        with self._lock:
+            self.guild_loads += 1
+            # Skip the store if a write invalidated this guild while we were loading
+            if self._generations.get(server_id, 0) == generation:
+                self._guilds[key] = (now + self.ttl_seconds, index)
+                self._guilds.move_to_end(key)
+                while len(self._guilds) > self.max_guilds:
+                    self._guilds.popitem(last=False)
+        return index
+
+    async def assigned_teams(self, server_id, league: str, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[str]:
+        """Teams assigned to a user in this guild starting with prefix"""
+        self.queries += 1
+        index = await self._guild_index(str(server_id), league.lower(), GUILD_ASSIGNED)
+        return index.search(prefix, limit)
+
+    async def record_teams(self, server_id, league: str, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[str]:
+        """Teams with a win/loss record in this guild starting with prefix"""
+        self.queries += 1
+        index = await self._guild_index(str(server_id), league.lower(), GUILD_RECORDS)
+        return index.search(prefix, limit)
+
+    def invalidate_guild(self, server_id):
+        """Drop a guild's indexes (call right after writing its teams or records)"""
+        server_id = str(server_id)
+        with self._lock:
+            self._generations[server_id] = self._generations.get(server_id, 0) + 1
+            for key in [key for key in self._guilds if key[0] == server_id]:
+                del self._guilds[key]
+
+    def stats(self) -> dict:
+        """Return index counters for diagnostics"""
+        with self._lock:
+            return {
+                "queries": self.queries,
+                "guild_loads": self.guild_loads,
+                "guild_indexes": len(self._guilds),
+                "teams": sum(map(len, self._teams.values())),
+                "matchups": sum(map(len, self._matchups.values())),
+            }
+
+
+# Global autocomplete index instance
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,364 @@
+# File: utils/channel_provisioning.py
+"""
+Bulk matchup channel provisioning for Trilo
+
+Creating a week of matchups used to be strictly serial: create a channel, post
+its Game Status Tracker, add four reactions, sleep 0.1s, repeat. Those calls hit
+different Discord rate-limit buckets (channel creation is per guild, messages
+and reactions are per channel), so this module runs them as three bounded
+stages connected by queues:
+
+    create channels (in order) -> post trackers -> seed reactions
+
+Channel creation stays sequential so channels keep their matchup order in the
+category; trackers and reactions for different channels run concurrently.
+Jobs can also arrive as an async stream (e.g. matchups parsed out of a
+streaming vision response): each one is created as soon as it is yielded.
+Pacing comes from 429 Retry-After values and, where a backend can report
+it, per-bucket rate-limit state, not fixed sleeps. With DiscordBackend,
+discord.py sleeps through short 429s itself; ones longer than the bot's
+max_ratelimit_timeout surface as discord.RateLimited, which the backend turns
+into RateLimited so the pacer pauses just that bucket while other stages
+keep going. discord.py doesn't expose bucket headers, so DiscordBackend
+reports no remaining/reset state (the benchmark's fake backend does).
+
+The Discord calls go through a small backend object, so the pipeline can be
+driven by DiscordBackend in production or by a fake HTTP layer in
+data/scripts/benchmarks/trilo_bench_channel_provisioning.py.
+"""
+
+import asyncio
+import time
+from typing import AsyncIterable, Callable, Dict, Iterable, List, Optional, Union
+
+import discord
+
+TRACKER_REACTIONS = ("✅", "🎲", "🟥", "🟦")
+
+# --------------------
+# Pipeline Settings
+# --------------------
+
+TRACKER_WORKERS = 5
+REACTION_WORKERS = 5
+MAX_RATE_LIMIT_RETRIES = 5
+PROGRESS_EDIT_INTERVAL_SECONDS = 1.5
+
+
+class RateLimited(Exception):
+    """Raised by a backend when Discord answers 429"""
+
+    def __init__(self, retry_after: float, is_global: bool = False):
+        super().__init__(f"rate limited for {retry_after:.2f}s")
+        self.retry_after = retry_after
+        self.is_global = is_global
+
+
+class BucketPacer:
+    """Tracks remaining/reset per rate-limit bucket and waits before a bucket is exhausted"""
+
+    def __init__(self):
+        self._buckets: Dict[str, tuple] = {}  # bucket -> (remaining, reset_at)
+        self._global_until = 0.0
+        self.waits = 0
+        self.rate_limited = 0
+
+    async def wait(self, bucket: str):
+        while True:
+            now = time.monotonic()
+            delay = max(0.0, self._global_until - now)
+            remaining, reset_at = self._buckets.get(bucket, (1, 0.0))
+            if remaining <= 0 and reset_at > now:
+                delay = max(delay, reset_at - now)
+            if delay <= 0:
+                if bucket in self._buckets and remaining > 0:
+                    # Reserve a slot so concurrent workers don't all spend the last one
+                    self._buckets[bucket] = (remaining - 1, reset_at)
+                return
+            self.waits += 1
+            await asyncio.sleep(delay)
+
+    def update(self, bucket: str, remaining: int, reset_after: float):
+        self._buckets[bucket] = (remaining, time.monotonic() + reset_after)
+
+    def penalize(self, bucket: str, retry_after: float, is_global: bool = False):
+        self.rate_limited += 1
+        until = time.monotonic() + retry_after
+        if is_global:
+            self._global_until = max(self._global_until, until)
+        else:
+            self._buckets[bucket] = (0, until)
+
+
+async def paced_call(pacer: BucketPacer, backend, bucket: str, fn, *args):
+    """Call a backend method, waiting on its bucket and retrying 429s"""
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        await pacer.wait(bucket)
+        try:
+            result = await fn(*args)
+        except RateLimited as e:
+            if attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            pacer.penalize(bucket, e.retry_after, e.is_global)
+            continue
+        state = backend.rate_limit_state(bucket)
+        if state is not None:
+            pacer.update(bucket, *state)
+        return result
+
+
+class DiscordBackend:
+    """Production backend: discord.py objects for one category"""
+
+    def __init__(self, guild: discord.Guild, category: discord.CategoryChannel):
+        self.guild = guild
+        self.category = category
+
+    def bucket(self, stage: str, channel=None) -> str:
+        if stage in ("create", "delete"):
+            # Channel creation and deletion are limited per guild
+            return f"{stage}:{self.guild.id}"
+        return f"{stage}:{channel.id}"
+
+    def rate_limit_state(self, bucket: str):
+        # discord.py paces from response headers internally and doesn't expose them
+        return None
+
+    async def _guard(self, coro):
+        try:
+            return await coro
+        except discord.RateLimited as e:
+            # A 429 longer than the client's max_ratelimit_timeout
+            raise RateLimited(e.retry_after)
+        except discord.HTTPException as e:
+            if e.status != 429:
+                raise
+            headers = getattr(e.response, "headers", {}) or {}
+            retry_after = float(headers.get("Retry-After") or headers.get("X-RateLimit-Reset-After") or 1.0)
+            raise RateLimited(retry_after, headers.get("X-RateLimit-Global") == "true")
+
+    async def create_channel(self, name: str):
+        return await self._guard(self.guild.create_text_channel(name, category=self.category))
+
+    async def send_tracker(self, channel, content: str):
+        return await self._guard(channel.send(content, silent=True))
+
+    async def add_reaction(self, message, emoji: str):
+        return await self._guard(message.add_reaction(emoji))
+
+    async def send_message(self, channel, content: str):
+        return await self._guard(channel.send(content))
+
+    async def edit_overwrites(self, channel, overwrites: dict):
+        return await self._guard(channel.edit(overwrites=overwrites))
+
+    async def delete_channel(self, channel):
+        return await self._guard(channel.delete())
+
+
+class ChannelJob:
+    """One matchup to provision; filled in as it moves through the stages"""
+
+    __slots__ = ("index", "channel_name", "tracker_content", "channel", "message", "error")
+
+    def __init__(self, index: int, channel_name: str, tracker_content: Optional[str]):
+        self.index = index
+        self.channel_name = channel_name
+        self.tracker_content = tracker_content
+        self.channel = None
+        self.message = None
+        self.error: Optional[Exception] = None
+
+
+class ProvisioningPipeline:
+    """Runs channel creation, tracker posting and reaction seeding as concurrent stages"""
+
+    def __init__(
+        self,
+        backend,
+        on_progress: Optional[Callable[[dict], None]] = None,
+        tracker_workers: int = TRACKER_WORKERS,
+        reaction_workers: int = REACTION_WORKERS,
+        reactions=TRACKER_REACTIONS,
+    ):
+        self.backend = backend
+        self.on_progress = on_progress
+        self.tracker_workers = tracker_workers
+        self.reaction_workers = reaction_workers
+        self.reactions = reactions
+        self.pacer = BucketPacer()
+        self.progress = {"total": 0, "channels": 0, "trackers": 0, "reactions": 0, "failed": 0}
+
+    async def _call(self, bucket: str, fn, *args):
+        return await paced_call(self.pacer, self.backend, bucket, fn, *args)
+
+    def _advance(self, key: str):
+        self.progress[key] += 1
+        if self.on_progress:
+            self.on_progress(dict(self.progress))
+
+    def _fail(self, job: ChannelJob, error: Exception):
+        job.error = error
+        self._advance("failed")
+        print(f"[Provisioning] {job.channel_name} failed: {type(error).__name__}: {error}")
+
+    async def _create(self, job: ChannelJob, tracker_queue: asyncio.Queue):
+        try:
+            job.channel = await self._call(self.backend.bucket("create"), self.backend.create_channel, job.channel_name)
+            self._advance("channels")
+            if job.tracker_content is not None:
+                await tracker_queue.put(job)
+        except Exception as e:
+            self._fail(job, e)
+
+    async def _create_stage(self, jobs, tracker_queue: asyncio.Queue) -> List[ChannelJob]:
+        if not hasattr(jobs, "__aiter__"):
+            for job in jobs:
+                await self._create(job, tracker_queue)
+            return list(jobs)
+
+        received = []
+        async for job in jobs:
+            received.append(job)
+            self.progress["total"] += 1
+            await self._create(job, tracker_queue)
+        return received
+
+    async def _tracker_worker(self, tracker_queue: asyncio.Queue, reaction_queue: asyncio.Queue):
+        while True:
+            job = await tracker_queue.get()
+            try:
+                bucket = self.backend.bucket("message", job.channel)
+                job.message = await self._call(bucket, self.backend.send_tracker, job.channel, job.tracker_content)
+                self._advance("trackers")
+                await reaction_queue.put(job)
+            except Exception as e:
+                self._fail(job, e)
+            finally:
+                tracker_queue.task_done()
+
+    async def _reaction_worker(self, reaction_queue: asyncio.Queue):
+        while True:
+            job = await reaction_queue.get()
+            try:
+                bucket = self.backend.bucket("reaction", job.channel)
+                # One worker per message keeps the reactions in tracker order
+                for emoji in self.reactions:
+                    await self._call(bucket, self.backend.add_reaction, job.message, emoji)
+                self._advance("reactions")
+            except Exception as e:
+                self._fail(job, e)
+            finally:
+                reaction_queue.task_done()
+
+    async def run(self, jobs: Union[Iterable[ChannelJob], AsyncIterable[ChannelJob]]) -> List[ChannelJob]:
+        """Provision every job; failures are recorded on job.error instead of raised"""
+        self.progress["total"] = 0 if hasattr(jobs, "__aiter__") else len(jobs)
+        tracker_queue: asyncio.Queue = asyncio.Queue()
+        reaction_queue: asyncio.Queue = asyncio.Queue()
+        workers = [asyncio.create_task(self._tracker_worker(tracker_queue, reaction_queue))
+                   for _ in range(self.tracker_workers)]
+        workers += [asyncio.create_task(self._reaction_worker(reaction_queue))
+                    for _ in range(self.reaction_workers)]
+        try:
+            jobs = await self._create_stage(jobs, tracker_queue)
+            await tracker_queue.join()
+            await reaction_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return jobs
+
+
+class ProgressReporter:
+    """Keeps one ephemeral followup message updated with pipeline progress"""
+
+    def __init__(self, interaction: discord.Interaction, label: str, interval: float = PROGRESS_EDIT_INTERVAL_SECONDS):
+        self.interaction = interaction
+        self.label = label
+        self.interval = interval
+        self._message = None
+        self._latest: Optional[dict] = None
+        self._last_edit = 0.0
+        self._pending: Optional[asyncio.Task] = None
+
+    def _initial(self, total: int) -> dict:
+        return {"total": total, "channels": 0, "trackers": 0, "reactions": 0, "failed": 0}
+
+    def _render(self, progress: dict) -> str:
+        total = progress["total"]
+        text = f"⏳ {self.label}: channels {progress['channels']}/{total}"
+        if progress["trackers"] or progress["reactions"]:
+            text += f" · trackers {progress['trackers']}/{total} · reactions {progress['reactions']}/{total}"
+        if progress["failed"]:
+            text += f" · ⚠️ {progress['failed']} failed"
+        return text
+
+    async def start(self, total: int):
+        try:
+            self._message = await self.interaction.followup.send(
+                self._render(self._initial(total)), ephemeral=True, wait=True
+            )
+        except discord.HTTPException as e:
+            print(f"[Provisioning] Could not send progress message: {e}")
+
+    def __call__(self, progress: dict):
+        self._latest = progress
+        if self._message is None or (self._pending and not self._pending.done()):
+            return
+        delay = max(0.0, self._last_edit + self.interval - time.monotonic())
+        self._pending = asyncio.create_task(self._edit_after(delay))
+
+    async def _edit_after(self, delay: float):
+        await asyncio.sleep(delay)
+        self._last_edit = time.monotonic()
+        try:
+            await self._message.edit(content=self._render(self._latest))
+        except discord.HTTPException:
+            pass
+
+    async def finish(self, text: Optional[str] = None):
+        if self._pending and not self._pending.done():
+            self._pending.cancel()
+        if self._message is None:
+            return
+        if text is None:
+            if self._latest is None:
+                return
+            text = self._render(self._latest).replace("⏳", "✅", 1)
+        try:
+            await self._message.edit(content=text)
+        except discord.HTTPException:
+            pass
+
+
+def tracker_content(pretty_team1: str, pretty_team2: str, team1_cpu: bool, team2_cpu: bool) -> str:
+    """Initial Game Status Tracker message for a matchup channel"""
+    return (
+        f"🏁 **Game Status Tracker**\nReact below to update this matchup's status:\n\n"
+        f"✅ Completed\n"
+        f"🎲 Fair Sim\n"
+        f"🟥 - ☑️ Force Win **{pretty_team1}{' (CPU)' if team1_cpu else ''}**\n"
+        f"🟦 - ☑️ Force Win **{pretty_team2}{' (CPU)' if team2_cpu else ''}**"
+    )
+
+
+async def provision_matchup_channels(
+    interaction: discord.Interaction,
+    category: discord.CategoryChannel,
+    jobs: Union[List[ChannelJob], AsyncIterable[ChannelJob]],
+    label: str = "Creating matchups",
+) -> List[ChannelJob]:
+    """Run the pipeline for a category, reporting progress to the invoking user
+
+    jobs may be an async iterable; the progress total then grows as jobs arrive.
+    """
+    reporter = ProgressReporter(interaction, label)
+    streaming = hasattr(jobs, "__aiter__")
+    if streaming or jobs:
+        await reporter.start(0 if streaming else len(jobs))
+    pipeline = ProvisioningPipeline(DiscordBackend(interaction.guild, category), on_progress=reporter)
+    jobs = await pipeline.run(jobs)
+    await reporter.finish()
+    return jobs
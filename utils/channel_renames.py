@@ -0,0 +1,254 @@
+# File: utils/channel_renames.py
+"""
+Coalescing channel rename scheduler for Trilo
+
+Discord allows two renames per channel per 10 minutes. Status reactions rename
+matchup channels, so a commissioner correcting a status (✅ -> 🎲 -> 🟥) used
+to leave the reaction handler sleeping behind the rename rate limit.
+
+Renames are requested instead of awaited:
+  - only the latest requested name per channel is kept (last write wins)
+  - a background worker applies it as soon as that channel's rename budget
+    allows, so intermediate names are never sent
+  - pending renames are stored in trilo_matchups.db and reloaded on startup
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set
+
+import discord
+
+from utils.async_db import db
+
+# --------------------
+# Scheduler Settings
+# --------------------
+
+RENAMES_PER_WINDOW = 2
+RENAME_WINDOW_SECONDS = 600
+RETRY_AFTER_ERROR_SECONDS = 30
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS pending_channel_renames (
+        channel_id TEXT PRIMARY KEY,
+        guild_id TEXT,
+        name TEXT NOT NULL,
+        requested_at REAL NOT NULL
+    )
+"""
+
+
+def purge_pending_renames(conn, channel_ids: Iterable[str]):
+    """Delete stored renames for deleted channels (runs inside the caller's transaction)"""
+    conn.execute(SCHEMA)
+    conn.executemany("DELETE FROM pending_channel_renames WHERE channel_id = ?",
+                     [(str(channel_id),) for channel_id in channel_ids])
+
+
+class RenameScheduler:
+    """Per-channel last-write-wins rename queue paced to Discord's rename limit"""
+
+    def __init__(self, db_name: str = "matchups", renames_per_window: int = RENAMES_PER_WINDOW,
+                 window_seconds: float = RENAME_WINDOW_SECONDS):
+        self.db_name = db_name
+        self.renames_per_window = renames_per_window
+        self.window_seconds = window_seconds
+        self.bot = None
+        self._pending: Dict[int, str] = {}
+        self._history: Dict[int, Deque[float]] = {}     # monotonic times of recent renames
+        self._blocked_until: Dict[int, float] = {}      # from 429 Retry-After / errors
+        self._inflight: Set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        # Running _apply tasks (referenced so they can't be garbage-collected mid-edit)
+        self._tasks: Set[asyncio.Task] = set()
+        self.requested = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.skipped = 0
+        self.rate_limited = 0
+        self.dropped = 0
+
+    # --------------------
+    # Persistence
+    # --------------------
+
+    async def _save(self, channel_id: int, guild_id, name: str):
+        def save(conn):
+            conn.execute(SCHEMA)
+            conn.execute(
+                "INSERT OR REPLACE INTO pending_channel_renames (channel_id, guild_id, name, requested_at) "
+                "VALUES (?, ?, ?, ?)",
+                (str(channel_id), str(guild_id) if guild_id else None, name, time.time())
+            )
+        await db.run(self.db_name, save)
+
+    async def _clear(self, channel_id: int, name: str):
+        # Only remove the row if no newer name was requested meanwhile
+        def clear(conn):
+            conn.execute(SCHEMA)
+            conn.execute("DELETE FROM pending_channel_renames WHERE channel_id = ? AND name = ?",
+                         (str(channel_id), name))
+        await db.run(self.db_name, clear)
+
+    async def _load(self):
+        def load(conn):
+            conn.execute(SCHEMA)
+            return conn.execute("SELECT channel_id, name FROM pending_channel_renames").fetchall()
+        rows = await db.run(self.db_name, load)
+        for channel_id, name in rows:
+            self._pending.setdefault(int(channel_id), name)
+        if rows:
+            print(f"[Renames] Restored {len(rows)} pending channel renames")
+
+    # --------------------
+    # Public API
+    # --------------------
+
+    async def request(self, channel: discord.abc.GuildChannel, name: str):
+        """Queue a rename; returns once it is recorded, not when it is applied"""
+        channel_id = channel.id
+        self.requested += 1
+        if channel_id in self._pending:
+            self.coalesced += 1
+        elif channel.name == name and channel_id not in self._inflight:
+            return
+        self._pending[channel_id] = name
+        await self._save(channel_id, getattr(channel.guild, "id", None), name)
+        self._wakeup.set()
+
+    def pending_name(self, channel_id: int) -> Optional[str]:
+        """The name a channel is waiting to be renamed to, if any"""
+        return self._pending.get(channel_id)
+
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def forget(self, channel_ids: Iterable):
+        """Drop pending renames and rate-limit state for deleted channels"""
+        for channel_id in channel_ids:
+            channel_id = int(channel_id)
+            if self._pending.pop(channel_id, None) is not None:
+                self.dropped += 1
+            self._history.pop(channel_id, None)
+            self._blocked_until.pop(channel_id, None)
+
+    async def start(self, bot):
+        """Reload persisted renames and start the worker (call from the bot's setup_hook)"""
+        self.bot = bot
+        await self._load()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Stop the worker and in-flight renames; unapplied renames stay in the database for next start"""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def stats(self) -> dict:
+        """Return scheduler counters for diagnostics"""
+        return {
+            "queue_depth": len(self._pending),
+            "inflight": len(self._inflight),
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "applied": self.applied,
+            "skipped": self.skipped,
+            "rate_limited": self.rate_limited,
+            "dropped": self.dropped,
+        }
+
+    # --------------------
+    # Worker
+    # --------------------
+
+    def _next_allowed(self, channel_id: int, now: float) -> float:
+        history = self._history.get(channel_id)
+        while history and now - history[0] >= self.window_seconds:
+            history.popleft()
+        due = self._blocked_until.get(channel_id, 0.0)
+        if history and len(history) >= self.renames_per_window:
+            due = max(due, history[0] + self.window_seconds)
+        return due
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            next_due = None
+            for channel_id in list(self._pending):
+                if channel_id in self._inflight:
+                    continue
+                due = self._next_allowed(channel_id, now)
+                if due <= now:
+                    self._inflight.add(channel_id)
+                    task = asyncio.create_task(self._apply(channel_id))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                elif next_due is None or due < next_due:
+                    next_due = due
+            try:
+                timeout = None if next_due is None else next_due - now
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _apply(self, channel_id: int):
+        name = self._pending.get(channel_id)
+        done = True
+        try:
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                self.dropped += 1
+            elif channel.name == name:
+                self.skipped += 1
+            else:
+                await channel.edit(name=name)
+                self._history.setdefault(channel_id, deque()).append(time.monotonic())
+                self.applied += 1
+                print(f"[Renames] #{name} ({len(self._pending) - 1} pending)")
+        except discord.RateLimited as e:
+            self.rate_limited += 1
+            self._blocked_until[channel_id] = time.monotonic() + e.retry_after
+            done = False
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self.rate_limited += 1
+                retry_after = getattr(e, "retry_after", None) or self.window_seconds / self.renames_per_window
+                self._blocked_until[channel_id] = time.monotonic() + retry_after
+                done = False
+            elif e.status in (403, 404):
+                print(f"[Renames] Dropping rename of {channel_id} to {name}: {e}")
+                self.dropped += 1
+            else:
+                print(f"[Renames] Rename of {channel_id} failed, retrying: {e}")
+                self._blocked_until[channel_id] = time.monotonic() + RETRY_AFTER_ERROR_SECONDS
+                done = False
+        except Exception as e:
+            print(f"[Renames] Rename of {channel_id} failed, retrying: {e}")
+            self._blocked_until[channel_id] = time.monotonic() + RETRY_AFTER_ERROR_SECONDS
+            done = False
+        finally:
+            self._inflight.discard(channel_id)
+
+        if done and self._pending.get(channel_id) == name:
+            del self._pending[channel_id]
+            self._blocked_until.pop(channel_id, None)
+            await self._clear(channel_id, name)
+        self._wakeup.set()
+
+
+# Global rename scheduler instance
+rename_scheduler = RenameScheduler()
@@ -0,0 +1,130 @@
+# File: utils/channel_teardown.py
+"""
+Matchup category teardown for /matchups delete
+
+Deleting up to five weekly categories used to delete one channel at a time and
+report only at the end, which could outlast the interaction on a full season.
+Now:
+  - every selected category is torn down at once, with channel deletes drawn
+    from a shared pool of workers so the whole guild stays under one cap
+  - deletes are paced by the provisioning BucketPacer on the guild's delete
+    bucket, so a 429 backs off every worker instead of each retrying blindly
+  - as soon as a category's channels are gone, its matchup rows and queued
+    renames are purged in one transaction (matchup_store.delete_channels),
+    then the category itself is deleted unless it is being kept
+  - progress is reported in an ephemeral message while deletes run
+
+A channel that fails to delete is reported and keeps its matchup row; its
+category is kept too, so no channels are left without a category.
+"""
+
+import asyncio
+from typing import Callable, List, Optional
+
+import discord
+
+from utils.channel_provisioning import BucketPacer, DiscordBackend, ProgressReporter, paced_call
+from utils.matchup_store import matchup_store
+
+# --------------------
+# Teardown Settings
+# --------------------
+
+DELETE_WORKERS = 5
+
+
+class CategoryTeardown:
+    """One category being cleared; filled in as its channels are deleted"""
+
+    __slots__ = ("category", "deleted", "failed", "category_deleted", "error")
+
+    def __init__(self, category: discord.CategoryChannel):
+        self.category = category
+        self.deleted: List[str] = []
+        self.failed: List[str] = []
+        self.category_deleted = False
+        self.error: Optional[Exception] = None
+
+
+class TeardownPipeline:
+    """Deletes the channels of several categories concurrently under one cap"""
+
+    def __init__(self, backend, on_progress: Optional[Callable[[dict], None]] = None, workers: int = DELETE_WORKERS):
+        self.backend = backend
+        self.on_progress = on_progress
+        self.pacer = BucketPacer()
+        self._slots = asyncio.Semaphore(workers)
+        self.progress = {"total": 0, "deleted": 0, "failed": 0, "categories": 0, "category_total": 0}
+
+    def _advance(self, key: str):
+        self.progress[key] += 1
+        if self.on_progress:
+            self.on_progress(dict(self.progress))
+
+    async def _delete(self, teardown: CategoryTeardown, channel, deleted_ids: list):
+        async with self._slots:
+            try:
+                bucket = self.backend.bucket("delete", channel)
+                await paced_call(self.pacer, self.backend, bucket, self.backend.delete_channel, channel)
+            except discord.NotFound:
+                pass  # Already gone
+            except Exception as e:
+                teardown.failed.append(channel.name)
+                self._advance("failed")
+                print(f"[Teardown] {channel.name} in {teardown.category.name} failed: {type(e).__name__}: {e}")
+                return
+        deleted_ids.append(channel.id)
+        teardown.deleted.append(channel.name)
+        self._advance("deleted")
+
+    async def _teardown(self, teardown: CategoryTeardown, keep_category: bool):
+        channels = list(teardown.category.channels)
+        deleted_ids = []
+        await asyncio.gather(*(self._delete(teardown, channel, deleted_ids) for channel in channels))
+        try:
+            await matchup_store.delete_channels(deleted_ids)
+            if not keep_category and not teardown.failed:
+                async with self._slots:
+                    bucket = self.backend.bucket("delete", teardown.category)
+                    await paced_call(self.pacer, self.backend, bucket, self.backend.delete_channel, teardown.category)
+                teardown.category_deleted = True
+        except Exception as e:
+            teardown.error = e
+            print(f"[Teardown] {teardown.category.name} failed: {type(e).__name__}: {e}")
+        self._advance("categories")
+
+    async def run(self, categories, keep_category: bool) -> List[CategoryTeardown]:
+        """Tear down every category; failures are recorded instead of raised"""
+        teardowns = [CategoryTeardown(category) for category in categories]
+        self.progress["total"] = sum(len(category.channels) for category in categories)
+        self.progress["category_total"] = len(teardowns)
+        await asyncio.gather(*(self._teardown(teardown, keep_category) for teardown in teardowns))
+        return teardowns
+
+
+class TeardownProgressReporter(ProgressReporter):
+    def _initial(self, total: int) -> dict:
+        return {"total": total, "deleted": 0, "failed": 0, "categories": 0, "category_total": 0}
+
+    def _render(self, progress: dict) -> str:
+        text = f"⏳ {self.label}: channels {progress['deleted']}/{progress['total']}"
+        if progress["category_total"]:
+            text += f" · categories {progress['categories']}/{progress['category_total']}"
+        if progress["failed"]:
+            text += f" · ⚠️ {progress['failed']} failed"
+        return text
+
+
+async def teardown_categories(
+    interaction: discord.Interaction,
+    categories: List[discord.CategoryChannel],
+    keep_category: bool,
+    label: str = "Deleting matchups",
+) -> List[CategoryTeardown]:
+    """Run the teardown for the selected categories, reporting progress to the invoking user"""
+    reporter = TeardownProgressReporter(interaction, label)
+    pipeline = TeardownPipeline(DiscordBackend(interaction.guild, None), on_progress=reporter)
+    await reporter.start(sum(len(category.channels) for category in categories))
+    teardowns = await pipeline.run(categories, keep_category)
+    await reporter.finish()
+    return teardowns
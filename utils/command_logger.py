@@ -16,6 +16,8 @@ import time
 import json
 import hashlib
 import os
+import queue
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Any, List
@@ -23,12 +25,160 @@ from functools import wraps
 import traceback
 import discord
 
+# --------------------
+# Log Sink Settings
+# --------------------
+
+LOG_QUEUE_MAX_EVENTS = 10000     # events buffered before new ones are dropped
+LOG_BATCH_SIZE = 200             # flush as soon as this many events are waiting
+LOG_FLUSH_INTERVAL_SECONDS = 2.0 # ...or after this long, whichever comes first
+
+USAGE_INSERT_SQL = """
+    INSERT INTO command_usage 
+    (command_name, server_id, user_id, success, execution_time_ms, 
+     error_message, command_args, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ERROR_INSERT_SQL = """
+    INSERT INTO error_log 
+    (error_type, command_name, server_id, user_id, error_message, 
+     stack_trace, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class LogSink:
+    """
+    Background writer for command/error log rows.
+
+    enqueue() never touches the database: rows go onto a bounded queue and a
+    daemon thread writes them in batched executemany transactions. When the
+    queue is full new rows are dropped and counted rather than blocking the
+    event loop.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_path: Path, max_events: int = LOG_QUEUE_MAX_EVENTS,
+                 batch_size: int = LOG_BATCH_SIZE, flush_interval: float = LOG_FLUSH_INTERVAL_SECONDS):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_events)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="command-log-sink", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, kind: str, row: tuple) -> bool:
+        """Queue a row for the "usage" or "error" table; returns False if it was dropped"""
+        if self._closed:
+            self.dropped += 1
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((kind, row))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[tuple]):
+        usage_rows = [row for kind, row in batch if kind == "usage"]
+        error_rows = [row for kind, row in batch if kind == "error"]
+        try:
+            with conn:
+                if usage_rows:
+                    conn.executemany(USAGE_INSERT_SQL, usage_rows)
+                if error_rows:
+                    conn.executemany(ERROR_INSERT_SQL, error_rows)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Warning: Failed to write {len(batch)} log rows: {e}")
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        batch: List[tuple] = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+
+        while not stopping:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+                if item is self._STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                pass
+
+            # Drain whatever else is already waiting without blocking
+            while len(batch) < self.batch_size and not stopping:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write_batch(conn, batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+        conn.close()
+
+    def close(self, timeout: float = 10.0):
+        """Flush everything queued so far and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is None:
+            return
+        # Blocking put: the writer is draining, so room frees up quickly
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        """Return sink counters for diagnostics"""
+        return {
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "queue_depth": self._queue.qsize(),
+        }
+
+
 class CommandLogger:
     """Handles all command logging operations with privacy protection"""
     
     def __init__(self):
         self.logs_db_path = Path(__file__).parent.parent / "data" / "databases" / "trilo_command_logs.db"
         self.logs_db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sink = LogSink(self.logs_db_path)
     
     def _hash_id(self, id_string: str) -> str:
         """Hash an ID for additional privacy protection"""
@@ -63,11 +213,8 @@ class CommandLogger:
         error_message: Optional[str] = None,
         command_args: Optional[Dict[str, Any]] = None
     ):
-        """Log a command usage event"""
+        """Queue a command usage event (written in the background by the log sink)"""
         try:
-            conn = sqlite3.connect(self.logs_db_path)
-            cursor = conn.cursor()
-            
             # Hash IDs for privacy
             hashed_server_id = self._hash_id(server_id)
             hashed_user_id = self._hash_id(user_id)
@@ -75,23 +222,14 @@ class CommandLogger:
             # Sanitize arguments
             sanitized_args = self._sanitize_args(command_args or {})
             
-            # Get current timestamp for deduplication
-            cursor.execute("SELECT datetime('now', 'localtime')")
-            current_timestamp = cursor.fetchone()[0]
+            # Same format as SQLite's datetime('now', 'localtime')
+            current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            cursor.execute("""
-                INSERT INTO command_usage 
-                (command_name, server_id, user_id, success, execution_time_ms, 
-                 error_message, command_args, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            self.sink.enqueue("usage", (
                 command_name, hashed_server_id, hashed_user_id, success,
                 execution_time_ms, error_message, sanitized_args, current_timestamp
             ))
             
-            conn.commit()
-            conn.close()
-            
             # Note: Automatic deduplication disabled - use manual scripts for cleanup
             # Run: python3 data/scripts/trilo_deduplicate_logs.py --clean
             
@@ -107,32 +245,26 @@ class CommandLogger:
         user_id: Optional[str] = None,
         stack_trace: Optional[str] = None
     ):
-        """Log an error event"""
+        """Queue an error event (written in the background by the log sink)"""
         try:
-            conn = sqlite3.connect(self.logs_db_path)
-            cursor = conn.cursor()
-            
             # Hash IDs for privacy
             hashed_server_id = self._hash_id(server_id) if server_id else None
             hashed_user_id = self._hash_id(user_id) if user_id else None
             
-            cursor.execute("""
-                INSERT INTO error_log 
-                (error_type, command_name, server_id, user_id, error_message, 
-                 stack_trace, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, datetime('now', 'localtime'))
-            """, (
+            self.sink.enqueue("error", (
                 error_type, command_name, hashed_server_id, hashed_user_id,
-                error_message, stack_trace
+                error_message, stack_trace, datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             ))
             
-            conn.commit()
-            conn.close()
-            
         except Exception as e:
             print(f"Warning: Failed to log error: {e}")
     
     
+    def flush_and_close(self):
+        """Write out any queued log rows and stop the sink (call on bot shutdown)"""
+        self.sink.close()
+        print(f"📝 Command log sink closed: {self.sink.stats()}")
+    
     def update_daily_stats(self):
         """Update daily aggregated statistics"""
         try:
@@ -0,0 +1,106 @@
+# File: utils/db_pool.py
+"""
+Pooled SQLite connections for Trilo
+
+Every thread keeps one warm connection per database name ("keys", "teams",
+"matchups", "attributes", "archetypes"). Connections are opened once with the
+WAL/cache pragmas and handed back out on every get_db_connection() call, so
+hot paths like reaction handling stop paying for connect + pragma setup.
+"""
+
+import sqlite3
+import threading
+from typing import Dict, List
+
+from config.database import DatabaseConfig
+
+# --------------------
+# Connection Settings
+# --------------------
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 30000",       # 30 second timeout
+    "PRAGMA mmap_size = 268435456",      # 256 MB memory-mapped I/O
+    "PRAGMA cache_size = -16000",        # ~16 MB page cache per connection
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection that survives close() so it can be reused by the pool"""
+
+    def close(self):
+        # Callers written against throwaway connections call close() when done.
+        # Match the old semantics (uncommitted work is discarded) but keep the
+        # connection warm for the next caller on this thread.
+        if self.in_transaction:
+            self.rollback()
+
+    def _close(self):
+        """Really close the underlying connection (pool shutdown only)"""
+        super().close()
+
+
+class ConnectionPool:
+    """Per-thread, per-database pool of long-lived SQLite connections"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: List[PooledConnection] = []
+        self.opened = 0
+        self.reused = 0
+
+    def _thread_connections(self) -> Dict[str, PooledConnection]:
+        conns = getattr(self._local, "connections", None)
+        if conns is None:
+            conns = self._local.connections = {}
+        return conns
+
+    def _open(self, db_name: str) -> PooledConnection:
+        db_path = DatabaseConfig.get_db_path(db_name)
+        # Each connection is only used by the thread that opened it; the flag
+        # just lets close_all() shut down worker-thread connections at exit.
+        conn = sqlite3.connect(db_path, factory=PooledConnection, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self._all.append(conn)
+            self.opened += 1
+        return conn
+
+    def get(self, db_name: str) -> PooledConnection:
+        """Return this thread's warm connection for db_name, opening it on first use"""
+        conns = self._thread_connections()
+        conn = conns.get(db_name)
+        if conn is None:
+            conn = conns[db_name] = self._open(db_name)
+        else:
+            self.reused += 1
+        return conn
+
+    def close_all(self):
+        """Close every pooled connection (call on bot shutdown)"""
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            try:
+                conn._close()
+            except Exception as e:
+                print(f"[db_pool] Error closing connection: {e}")
+        # Thread-local maps on other threads still reference closed connections;
+        # swap the local store so every thread reopens lazily.
+        self._local = threading.local()
+
+    def stats(self) -> dict:
+        """Return open/reuse counters for diagnostics"""
+        with self._lock:
+            live = len(self._all)
+        return {"opened": self.opened, "reused": self.reused, "live": live}
+
+
+# Global pool instance
+connection_pool = ConnectionPool()
@@ -1,19 +1,221 @@
 # utils/entitlements.py
-import aiohttp
+"""
+Discord entitlement lookups with a shared session and per-guild cache
+
+subscription_required runs before every premium command, so lookups are
+served from memory when possible:
+  - one aiohttp.ClientSession for the whole process
+  - per-guild TTL cache, with a shorter TTL for guilds with no entitlements
+  - concurrent checks for the same guild share one in-flight request
+  - a background refresher re-fetches recently used premium guilds before
+    they expire; negative entries (no entitlements or a failed fetch) just
+    expire and are fetched again on next use
+"""
+import asyncio
 import os
+import time
+from typing import Dict, Optional
+
+import aiohttp
 
 ENV = (os.getenv("ENV") or "dev").lower()
 TOKEN = os.getenv("DISCORD_TOKEN") if ENV == "prod" else os.getenv("DEV_DISCORD_TOKEN")
+API_BASE = os.getenv("DISCORD_API_BASE", "https://discord.com/api/v10")
+
+# --------------------
+# Cache Settings
+# --------------------
+
+ENTITLEMENT_TTL_SECONDS = 120        # guilds with entitlements
+NEGATIVE_TTL_SECONDS = 30            # guilds with none (or a failed fetch)
+REFRESH_AHEAD_SECONDS = 20           # refresh hot entries this long before expiry
+REFRESH_INTERVAL_SECONDS = 5
+REFRESH_CONCURRENCY = 4              # max entitlement requests per refresh pass
+HOT_GUILD_WINDOW_SECONDS = 900       # only keep refreshing guilds used this recently
+REQUEST_TIMEOUT_SECONDS = 10
+
+
+class _Entry:
+    __slots__ = ("entitlements", "expires_at", "last_used", "refresh_ahead")
+
+    def __init__(self, entitlements: list, expires_at: float, last_used: float, refresh_ahead: bool):
+        self.entitlements = entitlements
+        self.expires_at = expires_at
+        self.last_used = last_used
+        # Only fresh positive answers are refreshed ahead of expiry
+        self.refresh_ahead = refresh_ahead
+
+
+class EntitlementCache:
+    """Per-guild entitlement cache with single-flight fetches and refresh-ahead"""
+
+    def __init__(
+        self,
+        api_base: Optional[str] = None,
+        token: Optional[str] = None,
+        ttl_seconds: float = ENTITLEMENT_TTL_SECONDS,
+        negative_ttl_seconds: float = NEGATIVE_TTL_SECONDS,
+        refresh_ahead_seconds: float = REFRESH_AHEAD_SECONDS,
+    ):
+        self.api_base = (api_base or API_BASE).rstrip("/")
+        self.token = token if token is not None else TOKEN
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._refresher: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fetches = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    # --------------------
+    # HTTP
+    # --------------------
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={"Authorization": f"Bot {self.token}"},
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+            )
+        return self._session
+
+    async def _fetch(self, guild_id: str) -> Optional[list]:
+        """Fetch entitlements from Discord; None means the request failed"""
+        url = f"{self.api_base}/applications/@me/guilds/{guild_id}/entitlements"
+        self.fetches += 1
+        try:
+            async with self._get_session().get(url) as resp:
+                if resp.status != 200:
+                    print(f"[Entitlements] Failed to fetch: {resp.status}")
+                    self.errors += 1
+                    return None
+                return await resp.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"[Entitlements] Request error for guild {guild_id}: {type(e).__name__}")
+            self.errors += 1
+            return None
+
+    async def _load(self, guild_id: str) -> list:
+        """Fetch and store one guild's entitlements (always run via _single_flight)"""
+        result = await self._fetch(guild_id)
+        now = time.monotonic()
+        previous = self._entries.get(guild_id)
+        last_used = previous.last_used if previous else now
+
+        if result is None:
+            # Keep serving the last good answer through a failed refresh
+            if previous and previous.entitlements:
+                previous.expires_at = now + self.negative_ttl_seconds
+                # Don't keep hammering a failing endpoint; the next use refetches
+                previous.refresh_ahead = False
+                return previous.entitlements
+            result = []
+
+        ttl = self.ttl_seconds if result else self.negative_ttl_seconds
+        self._entries[guild_id] = _Entry(result, now + ttl, last_used, bool(result))
+        return result
+
+    async def _single_flight(self, guild_id: str) -> list:
+        task = self._inflight.get(guild_id)
+        if task is None:
+            task = asyncio.create_task(self._load(guild_id))
+            self._inflight[guild_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(guild_id, None))
+        else:
+            self.coalesced += 1
+        # Shield so a cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(task)
+
+    # --------------------
+    # Public API
+    # --------------------
+
+    async def get(self, guild_id: str, force_refresh: bool = False) -> list:
+        """Return a guild's entitlements, fetching only when the cache can't answer"""
+        guild_id = str(guild_id)
+        now = time.monotonic()
+        entry = self._entries.get(guild_id)
+        if entry:
+            entry.last_used = now
+            if not force_refresh and entry.expires_at > now:
+                self.hits += 1
+                return entry.entitlements
+        self.misses += 1
+        return await self._single_flight(guild_id)
+
+    def invalidate(self, guild_id: str):
+        """Forget a guild's cached entitlements"""
+        self._entries.pop(str(guild_id), None)
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+            try:
+                now = time.monotonic()
+                due = []
+                for guild_id, entry in list(self._entries.items()):
+                    if now - entry.last_used > HOT_GUILD_WINDOW_SECONDS:
+                        # Cold guild: let it fall out instead of refreshing forever
+                        if entry.expires_at <= now:
+                            del self._entries[guild_id]
+                        continue
+                    if (entry.refresh_ahead and entry.expires_at - now <= self.refresh_ahead_seconds
+                            and guild_id not in self._inflight):
+                        due.append(guild_id)
+                if due:
+                    self.refreshes += len(due)
+                    limit = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+                    async def refresh(guild_id: str):
+                        async with limit:
+                            await self._single_flight(guild_id)
+
+                    await asyncio.gather(*(refresh(g) for g in due), return_exceptions=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[Entitlements] Refresher error: {e}")
+
+    def start(self):
+        """Start the background refresher (call from the bot's setup_hook)"""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_loop())
+
+    async def close(self):
+        """Stop the refresher and close the shared session"""
+        if self._refresher:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> dict:
+        """Return cache counters for diagnostics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "fetches": self.fetches,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "cached_guilds": len(self._entries),
+        }
+
+
+# Global entitlement cache instance
+entitlement_cache = EntitlementCache()
+
 
-async def get_guild_entitlements(guild_id: str):
-    url = f"https://discord.com/api/v10/applications/@me/guilds/{guild_id}/entitlements"
-    headers = {
-        "Authorization": f"Bot {TOKEN}"
-    }
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as resp:
-            if resp.status != 200:
-                print(f"[Entitlements] Failed to fetch: {resp.status}")
-                return []
-            return await resp.json()
+async def get_guild_entitlements(guild_id: str, force_refresh: bool = False):
+    return await entitlement_cache.get(guild_id, force_refresh=force_refresh)
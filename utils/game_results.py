@@ -0,0 +1,321 @@
+# File: utils/game_results.py
+"""
+Game result event log for Trilo
+
+Every change to a team record is appended to game_results (trilo_teams.db):
+  - game        a recorded winner/loser, with week, category, channel and
+                source (reaction, button); CPU sides are flagged as not counted
+  - set_record  an absolute record from /records set-record (NULL wins and
+                losses = record cleared)
+  - reset       /records clear-all for a league
+  - void        undoes an earlier game event (/records undo-result)
+
+cfb_team_records / nfl_team_records stay as the compacted snapshot: writers
+update them in the same transaction as the append, and rebuild_records()
+recomputes them from the log with one set-based aggregation.
+
+All functions take a connection and run inside the caller's db.run()
+transaction, so the append and the snapshot update commit together.
+"""
+
+import time
+from typing import Optional
+
+from utils.standings import LEAGUE_RECORD_TABLES
+from utils.team_owners import LEAGUE_TEAM_TABLES
+
+KIND_GAME = "game"
+KIND_SET_RECORD = "set_record"
+KIND_RESET = "reset"
+KIND_VOID = "void"
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS game_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        server_id TEXT NOT NULL,
+        league TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        week TEXT,
+        category_id TEXT,
+        channel_id TEXT,
+        winner TEXT,
+        loser TEXT,
+        winner_counted INTEGER NOT NULL DEFAULT 0,
+        loser_counted INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER,
+        losses INTEGER,
+        voids_id INTEGER,
+        source TEXT NOT NULL,
+        recorded_by TEXT,
+        created_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_game_results_server_league ON game_results(server_id, league, id)",
+    "CREATE INDEX IF NOT EXISTS idx_game_results_channel ON game_results(channel_id, id) WHERE channel_id IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS idx_game_results_voids ON game_results(voids_id) WHERE voids_id IS NOT NULL",
+)
+
+# One pass over the log: events after each guild's last reset, minus voided
+# games, folded onto each team's latest set_record baseline
+REBUILD_SQL = """
+    WITH scoped AS (
+        SELECT g.* FROM game_results g
+        WHERE g.league = :league AND (:server_id IS NULL OR g.server_id = :server_id)
+    ),
+    resets AS (
+        SELECT server_id, MAX(id) AS id FROM scoped WHERE kind = 'reset' GROUP BY server_id
+    ),
+    live AS (
+        SELECT s.* FROM scoped s
+        LEFT JOIN resets r ON r.server_id = s.server_id
+        WHERE s.kind IN ('game', 'set_record')
+          AND s.id > COALESCE(r.id, 0)
+          AND s.id NOT IN (SELECT voids_id FROM scoped WHERE kind = 'void')
+    ),
+    baselines AS (
+        SELECT server_id, winner AS team_name, MAX(id) AS id FROM live
+        WHERE kind = 'set_record' GROUP BY server_id, winner
+    ),
+    deltas AS (
+        SELECT server_id, winner AS team_name, 1 AS wins, 0 AS losses, id, 1 AS present
+        FROM live WHERE kind = 'game' AND winner_counted
+        UNION ALL
+        SELECT server_id, loser, 0, 1, id, 1
+        FROM live WHERE kind = 'game' AND loser_counted
+        UNION ALL
+        SELECT server_id, winner, COALESCE(wins, 0), COALESCE(losses, 0), id, wins IS NOT NULL
+        FROM live WHERE kind = 'set_record'
+    )
+    SELECT d.server_id, d.team_name, SUM(d.wins), SUM(d.losses)
+    FROM deltas d
+    LEFT JOIN baselines b ON b.server_id = d.server_id AND b.team_name = d.team_name
+    WHERE b.id IS NULL OR d.id >= b.id
+    GROUP BY d.server_id, d.team_name
+    HAVING MAX(d.present) = 1
+"""
+
+_schema_ready = False
+
+
+def _table_exists(conn, table: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+
+
+def ensure_schema(conn):
+    """Create the log and seed it with existing records as set_record baselines"""
+    global _schema_ready
+    if _schema_ready:
+        return
+    for statement in SCHEMA:
+        conn.execute(statement)
+    # Guilds with records but no events yet (records written before the log)
+    # get their current counters as the starting point
+    now = time.time()
+    for league, records_table in LEAGUE_RECORD_TABLES.items():
+        if not _table_exists(conn, records_table):
+            continue
+        conn.execute(f"""
+            INSERT INTO game_results (server_id, league, kind, winner, wins, losses, source, created_at)
+            SELECT r.server_id, ?, 'set_record', r.team_name, r.wins, r.losses, 'snapshot', ?
+            FROM {records_table} r
+            WHERE NOT EXISTS (
+                SELECT 1 FROM game_results g WHERE g.server_id = r.server_id AND g.league = ?
+            )
+        """, (league, now, league))
+    _schema_ready = True
+
+
+def channel_context(channel) -> dict:
+    """week / category_id / channel_id for an event recorded from a matchup channel"""
+    if channel is None:
+        return {}
+    category = getattr(channel, "category", None)
+    return {
+        "week": category.name if category else None,
+        "category_id": str(category.id) if category else None,
+        "channel_id": str(channel.id),
+    }
+
+
+def _append(conn, server_id: str, league: str, kind: str, source: str, recorded_by=None, **fields) -> int:
+    columns = ["server_id", "league", "kind", "source", "recorded_by", "created_at", *fields]
+    values = [str(server_id), league, kind, source, str(recorded_by) if recorded_by else None, time.time(),
+              *fields.values()]
+    cursor = conn.execute(
+        f"INSERT INTO game_results ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+        values
+    )
+    return cursor.lastrowid
+
+
+def _is_user_team(conn, league: str, server_id: str, team: str) -> bool:
+    row = conn.execute(
+        f"SELECT user_id FROM {LEAGUE_TEAM_TABLES[league]} WHERE LOWER(team_name) = ? AND server_id = ?",
+        (team.lower(), server_id)
+    ).fetchone()
+    return bool(row) and row[0] is not None
+
+
+def _bump(conn, records_table: str, server_id: str, team: str, wins: int, losses: int):
+    conn.execute(f"""
+        INSERT INTO {records_table} (server_id, team_name, wins, losses)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(server_id, team_name) DO UPDATE SET wins = wins + ?, losses = losses + ?
+    """, (server_id, team, wins, losses, wins, losses))
+
+
+def _unbump(conn, league: str, server_id: str, team: str, wins: int, losses: int):
+    records_table = LEAGUE_RECORD_TABLES[league]
+    conn.execute(f"""
+        UPDATE {records_table} SET wins = MAX(wins - ?, 0), losses = MAX(losses - ?, 0)
+        WHERE server_id = ? AND team_name = ?
+    """, (wins, losses, server_id, team))
+    # Back to 0-0 with no set-record baseline keeping it: rebuild_records wouldn't have this row either
+    conn.execute(f"""
+        DELETE FROM {records_table}
+        WHERE server_id = :server_id AND team_name = :team AND wins = 0 AND losses = 0
+          AND COALESCE((
+              SELECT wins IS NOT NULL FROM game_results
+              WHERE server_id = :server_id AND league = :league AND kind = 'set_record' AND winner = :team
+                AND id > COALESCE((SELECT MAX(id) FROM game_results
+                                   WHERE server_id = :server_id AND league = :league AND kind = 'reset'), 0)
+              ORDER BY id DESC LIMIT 1
+          ), 0) = 0
+    """, {"server_id": server_id, "team": team, "league": league})
+
+
+def _has_baseline_after(conn, league: str, server_id: str, team: str, event_id: int) -> bool:
+    # A later set-record replaced whatever this game contributed
+    return conn.execute(
+        "SELECT 1 FROM game_results WHERE server_id = ? AND league = ? AND kind = 'set_record' "
+        "AND winner = ? AND id > ? LIMIT 1",
+        (server_id, league, team, event_id)
+    ).fetchone() is not None
+
+
+# --------------------
+# Writers
+# --------------------
+
+def record_game(conn, league: str, server_id: str, winner: str, loser: str, source: str,
+                recorded_by=None, week=None, category_id=None, channel_id=None) -> int:
+    """Append a game result and count it for whichever sides are user-controlled"""
+    ensure_schema(conn)
+    server_id = str(server_id)
+    records_table = LEAGUE_RECORD_TABLES[league]
+    winner_counted = _is_user_team(conn, league, server_id, winner)
+    loser_counted = _is_user_team(conn, league, server_id, loser)
+
+    event_id = _append(
+        conn, server_id, league, KIND_GAME, source, recorded_by,
+        week=week, category_id=category_id, channel_id=channel_id,
+        winner=winner, loser=loser, winner_counted=int(winner_counted), loser_counted=int(loser_counted)
+    )
+    if winner_counted:
+        _bump(conn, records_table, server_id, winner, 1, 0)
+    if loser_counted:
+        _bump(conn, records_table, server_id, loser, 0, 1)
+    return event_id
+
+
+def set_record(conn, league: str, server_id: str, team: str, wins: int, losses: int,
+               source: str = "set-record", recorded_by=None) -> int:
+    """Append an absolute record for a team and write it to the snapshot"""
+    ensure_schema(conn)
+    server_id = str(server_id)
+    event_id = _append(conn, server_id, league, KIND_SET_RECORD, source, recorded_by,
+                       winner=team, wins=wins, losses=losses)
+    conn.execute(f"""
+        INSERT INTO {LEAGUE_RECORD_TABLES[league]} (server_id, team_name, wins, losses, last_updated)
+        VALUES (?, ?, ?, ?, datetime('now', 'localtime'))
+        ON CONFLICT(server_id, team_name)
+        DO UPDATE SET wins = excluded.wins, losses = excluded.losses, last_updated = datetime('now', 'localtime')
+    """, (server_id, team, wins, losses))
+    return event_id
+
+
+def clear_record(conn, league: str, server_id: str, team: str, source: str = "clear-team-record",
+                 recorded_by=None) -> int:
+    """Append a cleared baseline for one team and drop it from the snapshot"""
+    ensure_schema(conn)
+    server_id = str(server_id)
+    event_id = _append(conn, server_id, league, KIND_SET_RECORD, source, recorded_by, winner=team)
+    conn.execute(f"DELETE FROM {LEAGUE_RECORD_TABLES[league]} WHERE server_id = ? AND team_name = ?",
+                 (server_id, team))
+    return event_id
+
+
+def reset_records(conn, league: str, server_id: str, source: str = "clear-all", recorded_by=None) -> int:
+    """Append a league reset for a guild and clear its snapshot"""
+    ensure_schema(conn)
+    server_id = str(server_id)
+    event_id = _append(conn, server_id, league, KIND_RESET, source, recorded_by)
+    conn.execute(f"DELETE FROM {LEAGUE_RECORD_TABLES[league]} WHERE server_id = ?", (server_id,))
+    return event_id
+
+
+def undo_last_game(conn, league: str, server_id: str, channel_id=None, recorded_by=None) -> Optional[tuple]:
+    """Void the most recent live game (optionally in one channel); returns (event_id, winner, loser, week)"""
+    ensure_schema(conn)
+    server_id = str(server_id)
+    channel_filter = "AND g.channel_id = ?" if channel_id else ""
+    params = [server_id, league, server_id, league]
+    if channel_id:
+        params.append(str(channel_id))
+    row = conn.execute(f"""
+        SELECT g.id, g.winner, g.loser, g.week, g.winner_counted, g.loser_counted
+        FROM game_results g
+        WHERE g.server_id = ? AND g.league = ? AND g.kind = 'game'
+          AND g.id > COALESCE((SELECT MAX(id) FROM game_results
+                               WHERE server_id = ? AND league = ? AND kind = 'reset'), 0)
+          {channel_filter}
+          AND NOT EXISTS (SELECT 1 FROM game_results v WHERE v.voids_id = g.id)
+        ORDER BY g.id DESC
+        LIMIT 1
+    """, params).fetchone()
+    if not row:
+        return None
+
+    event_id, winner, loser, week, winner_counted, loser_counted = row
+    _append(conn, server_id, league, KIND_VOID, "undo-result", recorded_by, voids_id=event_id)
+    if winner_counted and not _has_baseline_after(conn, league, server_id, winner, event_id):
+        _unbump(conn, league, server_id, winner, 1, 0)
+    if loser_counted and not _has_baseline_after(conn, league, server_id, loser, event_id):
+        _unbump(conn, league, server_id, loser, 0, 1)
+    return event_id, winner, loser, week
+
+
+# --------------------
+# Compaction
+# --------------------
+
+def rebuild_records(conn, league: str, server_id: Optional[str] = None) -> int:
+    """Recompute the records snapshot from the log (one guild, or every guild in the league)"""
+    ensure_schema(conn)
+    records_table = LEAGUE_RECORD_TABLES[league]
+    params = {"league": league, "server_id": str(server_id) if server_id else None}
+
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS rebuilt_records (
+            server_id TEXT, team_name TEXT, wins INTEGER, losses INTEGER,
+            PRIMARY KEY (server_id, team_name)
+        )
+    """)
+    conn.execute("DELETE FROM rebuilt_records")
+    conn.execute(f"INSERT INTO rebuilt_records {REBUILD_SQL}", params)
+
+    conn.execute(f"""
+        DELETE FROM {records_table}
+        WHERE (:server_id IS NULL OR server_id = :server_id)
+          AND NOT EXISTS (
+              SELECT 1 FROM rebuilt_records x
+              WHERE x.server_id = {records_table}.server_id AND x.team_name = {records_table}.team_name
+          )
+    """, {"server_id": params["server_id"]})
+    conn.execute(f"""
+        INSERT INTO {records_table} (server_id, team_name, wins, losses)
+        SELECT server_id, team_name, wins, losses FROM rebuilt_records WHERE true
+        ON CONFLICT(server_id, team_name) DO UPDATE SET wins = excluded.wins, losses = excluded.losses
+    """)
+    return conn.execute("SELECT COUNT(*) FROM rebuilt_records").fetchone()[0]
@@ -0,0 +1,130 @@
+# File: utils/image_preprocessing.py
+"""
+Schedule screenshot preprocessing before vision extraction
+
+Commissioners upload full-resolution screenshots and phone photos (up to 10MB)
+where the schedule is a small part of the frame. Before the image goes to
+OpenAI it is:
+  - cropped to the area that differs from the background (UI margins, borders)
+  - converted to grayscale (team names don't need color)
+  - downscaled so it fits the size OpenAI would resize to anyway in high
+    detail mode (short side <= 768px, long side <= 2048px), never upscaled
+  - re-encoded as whichever of PNG/JPEG is smaller
+
+The work is CPU-bound PIL code, so it runs in a small process pool instead of
+on the event loop. Any failure falls back to the original bytes.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from PIL import Image, ImageChops, ImageFilter, ImageOps
+
+# --------------------
+# Preprocessing Settings
+# --------------------
+
+# Bump when the steps below change (part of the vision cache key)
+PREPROCESS_VERSION = "1"
+
+MAX_SHORT_SIDE = 768           # OpenAI high-detail resize target
+MAX_LONG_SIDE = 2048
+BACKGROUND_THRESHOLD = 24      # grayscale distance from the background colour
+CROP_PADDING = 12
+CROP_ANALYSIS_SIZE = 512       # long side of the copy used to find the content box
+JPEG_QUALITY = 85
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _crop_to_content(image: Image.Image) -> Image.Image:
+    # Find the content box on a small, median-filtered copy so sensor noise in
+    # phone photos doesn't count as content (and it's much cheaper)
+    width, height = image.size
+    factor = max(1, max(width, height) // CROP_ANALYSIS_SIZE)
+    small = image.reduce(factor).filter(ImageFilter.MedianFilter(5))
+
+    # Use the most common corner colour as the background
+    small_width, small_height = small.size
+    corners = [small.getpixel((0, 0)), small.getpixel((small_width - 1, 0)),
+               small.getpixel((0, small_height - 1)), small.getpixel((small_width - 1, small_height - 1))]
+    background = max(set(corners), key=corners.count)
+
+    diff = ImageChops.difference(small, Image.new("L", small.size, background))
+    mask = diff.point(lambda value: 255 if value > BACKGROUND_THRESHOLD else 0)
+    bbox = mask.getbbox()
+    if not bbox:
+        return image
+    left, top, right, bottom = (edge * factor for edge in bbox)
+    return image.crop((
+        max(0, left - CROP_PADDING), max(0, top - CROP_PADDING),
+        min(width, right + CROP_PADDING), min(height, bottom + CROP_PADDING),
+    ))
+
+
+def _downscale(image: Image.Image) -> Image.Image:
+    width, height = image.size
+    scale = min(1.0, MAX_SHORT_SIDE / min(width, height), MAX_LONG_SIDE / max(width, height))
+    if scale >= 1.0:
+        return image
+    return image.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.LANCZOS)
+
+
+def preprocess_image_bytes(image_bytes: bytes) -> Tuple[bytes, str]:
+    """Crop, grayscale, downscale and re-encode an image; returns (bytes, mime type)"""
+    with Image.open(io.BytesIO(image_bytes)) as source:
+        image = ImageOps.exif_transpose(source).convert("L")
+
+    image = _downscale(_crop_to_content(image))
+
+    png = io.BytesIO()
+    image.save(png, format="PNG")
+    jpeg = io.BytesIO()
+    image.save(jpeg, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+
+    if jpeg.tell() < png.tell():
+        return jpeg.getvalue(), "image/jpeg"
+    return png.getvalue(), "image/png"
+
+
+class ImagePreprocessor:
+    """Runs preprocess_image_bytes in a lazily created process pool"""
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the bot process has database and logging threads running
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def process(self, image_bytes: bytes, content_type: str) -> Tuple[bytes, str]:
+        """Preprocess an image, or return it unchanged if PIL can't handle it"""
+        loop = asyncio.get_running_loop()
+        try:
+            processed, mime = await loop.run_in_executor(self._get_executor(), preprocess_image_bytes, image_bytes)
+        except Exception as e:
+            print(f"[Image Preprocess] Falling back to original image: {type(e).__name__}: {e}")
+            return image_bytes, content_type
+        return processed, mime
+
+    def shutdown(self):
+        """Stop the worker processes (bot shutdown)"""
+        if self._executor is not None:
+            if sys.version_info >= (3, 9):
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Global preprocessor instance
+image_preprocessor = ImagePreprocessor()
@@ -0,0 +1,482 @@
+# File: utils/league_templates.py
+"""
+League layout templates for /admin setup-league
+
+setup-league used to build one hard-coded structure a channel at a time and,
+with remove_existing_channels, delete every channel in the guild first (then
+recreate the ones it had just deleted). Layouts are now templates:
+  - built-in CFB and NFL dynasty templates, plus custom templates saved per
+    guild from an existing layout (/admin save-league-template), all stored
+    in trilo_matchups.db
+  - setup diffs the template against the guild's current categories and
+    channels and only creates what is missing (and, with remove_existing,
+    deletes only what the template doesn't have)
+  - the changes are applied in waves (deletes, then categories, then
+    channels), each wave running concurrently on a few workers paced by the
+    provisioning BucketPacer; positions come from the template, so
+    concurrent creates still land in template order
+  - each run is recorded in league_setup_runs; an interrupted run resumes by
+    running setup again, since the diff only contains what is still missing
+
+Template format:
+
+    {"categories": [{"name": "Commish", "channels": [{"name": "commish-chat", "access": "commish_only"}]}],
+     "system_channel": "main-chat"}
+"""
+
+import asyncio
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+import discord
+
+from utils.async_db import db
+from utils.channel_provisioning import BucketPacer, DiscordBackend, ProgressReporter, paced_call
+
+# --------------------
+# Template Settings
+# --------------------
+
+ACCESS_LEVELS = ("public", "public_read_commish_write", "commish_only")
+BUILTIN_GUILD = "*"
+LAYOUT_WORKERS = 4
+MAX_TEMPLATE_CHANNELS = 100
+
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+
+
+def _category(name: str, *channels: tuple) -> dict:
+    return {"name": name, "channels": [{"name": ch, "access": access} for ch, access in channels]}
+
+
+BUILTIN_TEMPLATES = {
+    "cfb-dynasty": {
+        "categories": [
+            _category("Commish", ("commish-chat", "commish_only"), ("trilo-commands", "commish_only")),
+            _category("Main Channels", ("main-chat", "public"), ("live-streams", "public"),
+                      ("announcements", "public_read_commish_write")),
+            _category("League Info", ("league-info", "public_read_commish_write"),
+                      ("league-rules", "public_read_commish_write"), ("team-assignments", "public_read_commish_write"),
+                      ("team-conferences", "public_read_commish_write")),
+            _category("Matchups", ("team-1-vs-team-2", "public"), ("team-3-vs-team-4", "public")),
+        ],
+        "system_channel": "main-chat",
+    },
+    "nfl-dynasty": {
+        "categories": [
+            _category("Commish", ("commish-chat", "commish_only"), ("trilo-commands", "commish_only")),
+            _category("Main Channels", ("main-chat", "public"), ("live-streams", "public"),
+                      ("announcements", "public_read_commish_write")),
+            _category("League Info", ("league-info", "public_read_commish_write"),
+                      ("league-rules", "public_read_commish_write"), ("team-assignments", "public_read_commish_write"),
+                      ("team-divisions", "public_read_commish_write"), ("trade-block", "public")),
+            _category("Matchups", ("team-1-vs-team-2", "public"), ("team-3-vs-team-4", "public")),
+        ],
+        "system_channel": "main-chat",
+    },
+}
+
+DEFAULT_TEMPLATES = {"cfb": "cfb-dynasty", "nfl": "nfl-dynasty"}
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS league_templates (
+        guild_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        body TEXT NOT NULL,
+        created_by TEXT,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (guild_id, name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS league_setup_runs (
+        guild_id TEXT PRIMARY KEY,
+        template_name TEXT NOT NULL,
+        remove_existing INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL,
+        created INTEGER NOT NULL DEFAULT 0,
+        deleted INTEGER NOT NULL DEFAULT 0,
+        started_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+)
+
+_schema_ready = False
+
+
+def _ensure_schema(conn):
+    global _schema_ready
+    if _schema_ready:
+        return
+    for statement in SCHEMA:
+        conn.execute(statement)
+    # Built-ins are refreshed from code so edits here reach every guild
+    now = time.time()
+    conn.executemany(
+        "INSERT OR REPLACE INTO league_templates (guild_id, name, body, created_by, updated_at) VALUES (?, ?, ?, NULL, ?)",
+        [(BUILTIN_GUILD, name, json.dumps(body), now) for name, body in BUILTIN_TEMPLATES.items()]
+    )
+    _schema_ready = True
+
+
+async def _run(fn, *args, write: bool = True):
+    def run(conn):
+        _ensure_schema(conn)
+        return fn(conn, *args)
+    # The first call seeds the built-ins, so it has to go to the writer
+    return await db.run("matchups", run, write=write or not _schema_ready)
+
+
+def validate_template(template: dict) -> dict:
+    """Raise ValueError unless template is a well-formed layout"""
+    categories = template.get("categories") if isinstance(template, dict) else None
+    if not isinstance(categories, list) or not categories:
+        raise ValueError("Template needs at least one category.")
+    seen, total = set(), 0
+    for category in categories:
+        name = category.get("name") if isinstance(category, dict) else None
+        if not name or name in seen:
+            raise ValueError(f"Category names must be present and unique (got {name!r}).")
+        seen.add(name)
+        channel_names = set()
+        for channel in category.get("channels", []):
+            if channel.get("access") not in ACCESS_LEVELS:
+                raise ValueError(f"Unknown access level {channel.get('access')!r} in {name}.")
+            if not channel.get("name") or channel["name"] in channel_names:
+                raise ValueError(f"Channel names in {name} must be present and unique.")
+            channel_names.add(channel["name"])
+            total += 1
+    if total > MAX_TEMPLATE_CHANNELS:
+        raise ValueError(f"Templates are limited to {MAX_TEMPLATE_CHANNELS} channels.")
+    return template
+
+
+# --------------------
+# Template Storage
+# --------------------
+
+async def get_template(guild_id, name: str) -> Optional[dict]:
+    """A guild's custom template by name, else the built-in one"""
+    def load(conn):
+        return conn.execute(
+            "SELECT body FROM league_templates WHERE name = ? AND guild_id IN (?, ?) "
+            "ORDER BY guild_id = ? LIMIT 1",
+            (name, str(guild_id), BUILTIN_GUILD, BUILTIN_GUILD)
+        ).fetchone()
+    row = await _run(load, write=False)
+    return json.loads(row[0]) if row else None
+
+
+async def list_templates(guild_id) -> List[str]:
+    def load(conn):
+        return conn.execute(
+            "SELECT DISTINCT name FROM league_templates WHERE guild_id IN (?, ?) ORDER BY name",
+            (str(guild_id), BUILTIN_GUILD)
+        ).fetchall()
+    return [row[0] for row in await _run(load, write=False)]
+
+
+async def save_template(guild_id, name: str, template: dict, user_id=None):
+    validate_template(template)
+    if name in BUILTIN_TEMPLATES:
+        raise ValueError(f"`{name}` is a built-in template name.")
+
+    def save(conn):
+        conn.execute(
+            "INSERT OR REPLACE INTO league_templates (guild_id, name, body, created_by, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (str(guild_id), name, json.dumps(template), str(user_id) if user_id else None, time.time())
+        )
+    await _run(save)
+
+
+def _access_level(channel, default_role) -> str:
+    overwrite = channel.overwrites_for(default_role)
+    if overwrite.read_messages is False:
+        return "commish_only"
+    if overwrite.send_messages is False:
+        return "public_read_commish_write"
+    return "public"
+
+
+def snapshot_layout(guild: discord.Guild) -> dict:
+    """A template of the guild's current categories and text channels"""
+    categories = []
+    for category in guild.categories:
+        channels = [
+            {"name": channel.name, "access": _access_level(channel, guild.default_role)}
+            for channel in category.text_channels
+        ]
+        categories.append({"name": category.name, "channels": channels})
+    template = {"categories": categories}
+    if guild.system_channel:
+        template["system_channel"] = guild.system_channel.name
+    return template
+
+
+# --------------------
+# Setup Runs
+# --------------------
+
+async def get_unfinished_run(guild_id) -> Optional[tuple]:
+    """(template_name, remove_existing) of a setup that didn't finish, if any"""
+    def load(conn):
+        return conn.execute(
+            "SELECT template_name, remove_existing FROM league_setup_runs WHERE guild_id = ? AND status = ?",
+            (str(guild_id), RUN_RUNNING)
+        ).fetchone()
+    row = await _run(load, write=False)
+    return (row[0], bool(row[1])) if row else None
+
+
+async def _record_run(guild_id, template_name: str, remove_existing: bool, status: str,
+                      created: int = 0, deleted: int = 0):
+    def save(conn):
+        now = time.time()
+        conn.execute(
+            """
+            INSERT INTO league_setup_runs
+                (guild_id, template_name, remove_existing, status, created, deleted, started_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(guild_id) DO UPDATE SET
+                template_name = excluded.template_name,
+                remove_existing = excluded.remove_existing,
+                status = excluded.status,
+                created = CASE WHEN league_setup_runs.status = 'running'
+                               THEN league_setup_runs.created + excluded.created ELSE excluded.created END,
+                deleted = CASE WHEN league_setup_runs.status = 'running'
+                               THEN league_setup_runs.deleted + excluded.deleted ELSE excluded.deleted END,
+                started_at = CASE WHEN league_setup_runs.status = 'running'
+                                  THEN league_setup_runs.started_at ELSE excluded.started_at END,
+                updated_at = excluded.updated_at
+            """,
+            (str(guild_id), template_name, int(remove_existing), status, created, deleted, now, now)
+        )
+    await _run(save)
+
+
+# --------------------
+# Layout Diff
+# --------------------
+
+class LayoutPlan:
+    """What it takes to turn the guild's layout into a template's"""
+
+    __slots__ = ("delete_channels", "delete_categories", "create_categories", "create_channels",
+                 "existing_categories", "kept")
+
+    def __init__(self):
+        self.delete_channels: list = []
+        self.delete_categories: list = []
+        self.create_categories: List[tuple] = []    # (name, position)
+        self.create_channels: List[tuple] = []      # (category name, channel name, access, position)
+        self.existing_categories: Dict[str, discord.CategoryChannel] = {}
+        self.kept = 0
+
+    def __len__(self) -> int:
+        return (len(self.delete_channels) + len(self.delete_categories)
+                + len(self.create_categories) + len(self.create_channels))
+
+
+def plan_layout(guild: discord.Guild, template: dict, remove_existing: bool) -> LayoutPlan:
+    plan = LayoutPlan()
+    categories_by_name: Dict[str, discord.CategoryChannel] = {}
+    for category in guild.categories:
+        categories_by_name.setdefault(category.name, category)
+
+    wanted_channels = set()
+    for position, category_spec in enumerate(template["categories"]):
+        category = categories_by_name.get(category_spec["name"])
+        existing = {channel.name for channel in category.text_channels} if category else set()
+        if category:
+            plan.existing_categories[category.name] = category
+        else:
+            plan.create_categories.append((category_spec["name"], position))
+        for channel_position, channel_spec in enumerate(category_spec.get("channels", [])):
+            if category:
+                wanted_channels.add((category.id, channel_spec["name"]))
+            if channel_spec["name"] in existing:
+                plan.kept += 1
+            else:
+                plan.create_channels.append(
+                    (category_spec["name"], channel_spec["name"], channel_spec["access"], channel_position)
+                )
+
+    if remove_existing:
+        kept_categories = {category.id for category in plan.existing_categories.values()}
+        for channel in guild.channels:
+            if isinstance(channel, discord.CategoryChannel):
+                if channel.id not in kept_categories:
+                    plan.delete_categories.append(channel)
+            elif (channel.category_id, channel.name) not in wanted_channels:
+                plan.delete_channels.append(channel)
+    return plan
+
+
+def access_overwrites(guild: discord.Guild, access: str, commish_roles: list) -> dict:
+    overwrites = {guild.default_role: discord.PermissionOverwrite()}
+    if access == "commish_only":
+        overwrites[guild.default_role].read_messages = False
+        for role in commish_roles:
+            overwrites[role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
+    elif access == "public_read_commish_write":
+        overwrites[guild.default_role].read_messages = True
+        overwrites[guild.default_role].send_messages = False
+        for role in commish_roles:
+            overwrites[role] = discord.PermissionOverwrite(send_messages=True)
+    else:
+        overwrites[guild.default_role].read_messages = True
+        overwrites[guild.default_role].send_messages = True
+    return overwrites
+
+
+# --------------------
+# Apply
+# --------------------
+
+class LayoutBackend(DiscordBackend):
+    """DiscordBackend plus the guild-level creates a league layout needs"""
+
+    async def create_category(self, name: str, position: int):
+        return await self._guard(self.guild.create_category(name, position=position))
+
+    async def create_layout_channel(self, name: str, category, overwrites: dict, position: int):
+        return await self._guard(
+            self.guild.create_text_channel(name, category=category, overwrites=overwrites, position=position)
+        )
+
+
+class LayoutApplier:
+    """Applies a LayoutPlan in waves: deletes, categories, channels"""
+
+    def __init__(self, backend, commish_roles: list, on_progress: Optional[Callable[[dict], None]] = None,
+                 workers: int = LAYOUT_WORKERS):
+        self.backend = backend
+        self.commish_roles = commish_roles
+        self.on_progress = on_progress
+        self.workers = workers
+        self.pacer = BucketPacer()
+        self.created: List[discord.abc.GuildChannel] = []
+        self.deleted = 0
+        self.errors: List[str] = []
+        self.progress = {"total": 0, "done": 0, "failed": 0}
+
+    def _advance(self, key: str):
+        self.progress[key] += 1
+        if self.on_progress:
+            self.on_progress(dict(self.progress))
+
+    async def _wave(self, items: list, fn):
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                try:
+                    await fn(item)
+                    self._advance("done")
+                except Exception as e:
+                    self.errors.append(f"{type(e).__name__}: {e}")
+                    self._advance("failed")
+                    print(f"[League Setup] {item!r} failed: {type(e).__name__}: {e}")
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.workers, len(items)))]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _delete(self, channel):
+        try:
+            await paced_call(self.pacer, self.backend, self.backend.bucket("delete"), self.backend.delete_channel, channel)
+        except discord.NotFound:
+            pass
+        self.deleted += 1
+
+    async def run(self, plan: LayoutPlan) -> "LayoutApplier":
+        guild = self.backend.guild
+        self.progress["total"] = len(plan)
+        create_bucket = self.backend.bucket("create")
+
+        await self._wave(plan.delete_channels, self._delete)
+        await self._wave(plan.delete_categories, self._delete)
+
+        categories = dict(plan.existing_categories)
+
+        async def create_category(item):
+            name, position = item
+            category = await paced_call(self.pacer, self.backend, create_bucket,
+                                        self.backend.create_category, name, position)
+            categories[name] = category
+            self.created.append(category)
+        await self._wave(plan.create_categories, create_category)
+
+        async def create_channel(item):
+            category_name, name, access, position = item
+            category = categories.get(category_name)
+            if category is None:
+                raise RuntimeError(f"category {category_name} was not created")
+            channel = await paced_call(
+                self.pacer, self.backend, create_bucket, self.backend.create_layout_channel,
+                name, category, access_overwrites(guild, access, self.commish_roles), position
+            )
+            self.created.append(channel)
+        await self._wave(plan.create_channels, create_channel)
+        return self
+
+
+class LayoutProgressReporter(ProgressReporter):
+    def _initial(self, total: int) -> dict:
+        return {"total": total, "done": 0, "failed": 0}
+
+    def _render(self, progress: dict) -> str:
+        text = f"⏳ {self.label}: {progress['done']}/{progress['total']} changes"
+        if progress["failed"]:
+            text += f" · ⚠️ {progress['failed']} failed"
+        return text
+
+
+async def apply_league_template(
+    interaction: discord.Interaction,
+    template_name: str,
+    template: dict,
+    commish_roles: list,
+    remove_existing: bool,
+) -> tuple:
+    """Diff and apply a template to the interaction's guild; returns (plan, applier)"""
+    guild = interaction.guild
+    plan = plan_layout(guild, template, remove_existing)
+    await _record_run(guild.id, template_name, remove_existing, RUN_RUNNING)
+
+    reporter = LayoutProgressReporter(interaction, f"Setting up {template_name}")
+    applier = LayoutApplier(LayoutBackend(guild, None), commish_roles, on_progress=reporter)
+    if len(plan):
+        await reporter.start(len(plan))
+    await applier.run(plan)
+    await reporter.finish()
+
+    system_channel_name = template.get("system_channel")
+    if system_channel_name and (guild.system_channel is None or guild.system_channel.name != system_channel_name):
+        channel = next((c for c in applier.created if c.name == system_channel_name), None) \
+            or discord.utils.get(guild.text_channels, name=system_channel_name)
+        if channel:
+            try:
+                await guild.edit(system_channel=channel)
+                print(f"[Trilo] System channel set to #{system_channel_name}")
+            except Exception as e:
+                print(f"[Trilo] Failed to set system channel: {e}")
+
+    # Failed steps leave the run open; running setup again resumes from the diff
+    status = RUN_RUNNING if applier.errors else RUN_COMPLETED
+    await _record_run(guild.id, template_name, remove_existing, status,
+                      created=len(applier.created), deleted=applier.deleted)
+    return plan, applier
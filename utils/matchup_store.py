@@ -0,0 +1,281 @@
+# File: utils/matchup_store.py
+"""
+Matchup channel state store for Trilo
+
+The matchup commands record every channel they create in trilo_matchups.db:
+guild, category, channel ID, both team keys, league, the Game Status Tracker
+message ID and the current status. Reaction handlers and sync-records resolve
+a matchup with one indexed lookup by message or channel ID instead of
+fetch_message + parsing channel.name + scanning channel.history().
+
+The IDs of every live tracker and "who won?" prompt are also kept in memory
+(loaded at startup, updated by every write below) so the raw reaction handler
+can drop reactions on any other message without touching the database.
+
+Channels created before the store existed have no row. The IDs of every
+recorded channel are kept in memory too, so a valid reaction in any other
+channel can take the slow path (fetch the message, parse channel.name) once
+and record the channel; running /matchups add-game-status or sync-records on
+them records them as well.
+"""
+
+import time
+from typing import Iterable, List, Optional, Set
+
+from utils.async_db import db
+from utils.channel_renames import purge_pending_renames, rename_scheduler
+from utils.team_registry import team_registry
+
+# Matchup status values
+STATUS_SCHEDULED = "scheduled"
+STATUS_COMPLETED = "completed"      # ✅
+STATUS_FAIR_SIM = "fair_sim"        # 🎲
+STATUS_FORCE_WIN = "force_win"      # 🟥 / 🟦
+STATUS_RESULT_RECORDED = "result_recorded"
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS matchup_channels (
+        channel_id TEXT PRIMARY KEY,
+        guild_id TEXT NOT NULL,
+        category_id TEXT,
+        category_name TEXT,
+        team1_key TEXT NOT NULL,
+        team2_key TEXT NOT NULL,
+        league TEXT NOT NULL DEFAULT 'cfb',
+        status TEXT NOT NULL DEFAULT 'scheduled',
+        tracker_message_id TEXT,
+        result_message_id TEXT,
+        tracker_digest TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_matchup_channels_guild_category ON matchup_channels(guild_id, category_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_matchup_channels_tracker ON matchup_channels(tracker_message_id) "
+    "WHERE tracker_message_id IS NOT NULL",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_matchup_channels_result ON matchup_channels(result_message_id) "
+    "WHERE result_message_id IS NOT NULL",
+)
+
+# Channel IDs per IN (...) clause, well under SQLite's variable limit
+DELETE_BATCH_SIZE = 500
+
+COLUMNS = ("channel_id, guild_id, category_id, category_name, team1_key, team2_key, "
+           "league, status, tracker_message_id, result_message_id, tracker_digest")
+
+
+class MatchupRecord:
+    """One row of matchup_channels (plus the interned team IDs for both sides)"""
+
+    __slots__ = ("channel_id", "guild_id", "category_id", "category_name", "team1_key", "team2_key",
+                 "league", "status", "tracker_message_id", "result_message_id", "tracker_digest",
+                 "team1_id", "team2_id")
+
+    def __init__(self, row: tuple):
+        for name, value in zip(self.__slots__, row):
+            setattr(self, name, value)
+        self.team1_id = team_registry.team_id(self.team1_key)
+        self.team2_id = team_registry.team_id(self.team2_key)
+
+
+def _id(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class MatchupStore:
+    """Async access to matchup_channels (runs on the matchups database threads)"""
+
+    def __init__(self, db_name: str = "matchups"):
+        self.db_name = db_name
+        self._schema_ready = False
+        # Live tracker / result prompt message IDs (reaction fast path)
+        self._live_messages: Set[int] = set()
+        # Every recorded channel (anything else may be a matchup from before the store)
+        self._channels: Set[int] = set()
+
+    def _ensure_schema(self, conn):
+        if not self._schema_ready:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(matchup_channels)")}
+            if "tracker_digest" not in columns:
+                conn.execute("ALTER TABLE matchup_channels ADD COLUMN tracker_digest TEXT")
+            self._schema_ready = True
+
+    async def _write(self, fn, *args):
+        def run(conn):
+            self._ensure_schema(conn)
+            return fn(conn, *args)
+        return await db.run(self.db_name, run)
+
+    async def _read(self, sql: str, params=()) -> List[MatchupRecord]:
+        def run(conn):
+            self._ensure_schema(conn)
+            return conn.execute(sql, params).fetchall()
+        # Schema creation is a write, so the first read may take the writer thread
+        rows = await db.run(self.db_name, run, write=not self._schema_ready)
+        return [MatchupRecord(row) for row in rows]
+
+    def _forget(self, *message_ids):
+        for message_id in message_ids:
+            if message_id:
+                self._live_messages.discard(int(message_id))
+
+    def _remember(self, *message_ids):
+        for message_id in message_ids:
+            if message_id:
+                self._live_messages.add(int(message_id))
+
+    # --------------------
+    # Live message registry
+    # --------------------
+
+    async def load_live_messages(self):
+        """Load every live tracker and result prompt ID and every recorded channel (bot startup)"""
+        def load(conn):
+            self._ensure_schema(conn)
+            messages = conn.execute("""
+                SELECT tracker_message_id FROM matchup_channels WHERE tracker_message_id IS NOT NULL
+                UNION ALL
+                SELECT result_message_id FROM matchup_channels WHERE result_message_id IS NOT NULL
+            """).fetchall()
+            channels = conn.execute("SELECT channel_id FROM matchup_channels").fetchall()
+            return messages, channels
+        messages, channels = await db.run(self.db_name, load)
+        self._live_messages = {int(row[0]) for row in messages}
+        self._channels = {int(row[0]) for row in channels}
+        print(f"[Matchup Store] Tracking {len(self._live_messages)} live matchup messages "
+              f"in {len(self._channels)} channels")
+
+    def is_live_message(self, message_id: int) -> bool:
+        """True if message_id is a tracker or result prompt the bot still reacts to"""
+        return message_id in self._live_messages
+
+    def is_recorded_channel(self, channel_id: int) -> bool:
+        """False for channels the store has never seen (possibly created before it existed)"""
+        return channel_id in self._channels
+
+    # --------------------
+    # Writes
+    # --------------------
+
+    async def record_channels(self, guild_id, category, league: str, channels: Iterable[tuple]):
+        """Record newly created matchups: channels is (channel_id, team1_key, team2_key, tracker_message_id)"""
+        now = time.time()
+        rows = [
+            (_id(channel_id), _id(guild_id), _id(category.id) if category else None,
+             category.name if category else None, team1_key, team2_key,
+             league, STATUS_SCHEDULED, _id(tracker_message_id), now, now)
+            for channel_id, team1_key, team2_key, tracker_message_id in channels
+        ]
+        if not rows:
+            return
+
+        def insert(conn, rows):
+            conn.executemany(f"""
+                INSERT OR REPLACE INTO matchup_channels ({COLUMNS}, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL, ?, ?)
+            """, rows)
+        await self._write(insert, rows)
+        self._remember(*(row[8] for row in rows))
+        self._channels.update(int(row[0]) for row in rows)
+
+    async def set_tracker(self, channel_id, tracker_message_id):
+        """Point a matchup at a newly posted Game Status Tracker"""
+        def update(conn):
+            old = conn.execute(
+                "SELECT tracker_message_id FROM matchup_channels WHERE channel_id = ?", (_id(channel_id),)
+            ).fetchone()
+            conn.execute(
+                "UPDATE matchup_channels SET tracker_message_id = ?, tracker_digest = NULL, status = ?, updated_at = ? "
+                "WHERE channel_id = ?",
+                (_id(tracker_message_id), STATUS_SCHEDULED, time.time(), _id(channel_id))
+            )
+            return old
+        old = await self._write(update)
+        if old:
+            self._forget(old[0])
+        self._remember(tracker_message_id)
+
+    async def set_tracker_digests(self, digests: Iterable[tuple]):
+        """Remember what each tracker currently says: digests is (channel_id, digest)"""
+        rows = [(digest, time.time(), _id(channel_id)) for channel_id, digest in digests]
+        if not rows:
+            return
+
+        def update(conn, rows):
+            conn.executemany(
+                "UPDATE matchup_channels SET tracker_digest = ?, updated_at = ? WHERE channel_id = ?", rows
+            )
+        await self._write(update, rows)
+
+    async def set_status(self, channel_id, status: str, result_message_id=None):
+        """Record a status change; the tracker is consumed, a result prompt may replace it"""
+        def update(conn):
+            old = conn.execute(
+                "SELECT tracker_message_id, result_message_id FROM matchup_channels WHERE channel_id = ?",
+                (_id(channel_id),)
+            ).fetchone()
+            conn.execute(
+                "UPDATE matchup_channels SET status = ?, tracker_message_id = NULL, tracker_digest = NULL, "
+                "result_message_id = ?, updated_at = ? WHERE channel_id = ?",
+                (status, _id(result_message_id), time.time(), _id(channel_id))
+            )
+            return old
+        old = await self._write(update)
+        if old:
+            self._forget(*old)
+        self._remember(result_message_id)
+
+    async def delete_channels(self, channel_ids: Iterable):
+        """Forget matchups whose channels were deleted, with any renames still queued for them"""
+        ids = [_id(channel_id) for channel_id in channel_ids]
+        if not ids:
+            return
+
+        def delete(conn, ids):
+            old = []
+            for start in range(0, len(ids), DELETE_BATCH_SIZE):
+                batch = ids[start:start + DELETE_BATCH_SIZE]
+                placeholders = ", ".join("?" for _ in batch)
+                old.extend(conn.execute(
+                    f"SELECT tracker_message_id, result_message_id FROM matchup_channels "
+                    f"WHERE channel_id IN ({placeholders})",
+                    batch
+                ).fetchall())
+                conn.execute(f"DELETE FROM matchup_channels WHERE channel_id IN ({placeholders})", batch)
+            purge_pending_renames(conn, ids)
+            return old
+        for message_ids in await self._write(delete, ids):
+            self._forget(*message_ids)
+        self._channels.difference_update(int(channel_id) for channel_id in ids)
+        rename_scheduler.forget(ids)
+
+    # --------------------
+    # Lookups
+    # --------------------
+
+    async def get_by_message(self, message_id) -> Optional[MatchupRecord]:
+        """Find the matchup whose tracker or result prompt is this message"""
+        message_id = _id(message_id)
+        rows = await self._read(f"""
+            SELECT {COLUMNS} FROM matchup_channels WHERE tracker_message_id = ?
+            UNION ALL
+            SELECT {COLUMNS} FROM matchup_channels WHERE result_message_id = ?
+        """, (message_id, message_id))
+        return rows[0] if rows else None
+
+    async def get_by_channel(self, channel_id) -> Optional[MatchupRecord]:
+        rows = await self._read(f"SELECT {COLUMNS} FROM matchup_channels WHERE channel_id = ?", (_id(channel_id),))
+        return rows[0] if rows else None
+
+    async def for_category(self, guild_id, category_id) -> List[MatchupRecord]:
+        return await self._read(
+            f"SELECT {COLUMNS} FROM matchup_channels WHERE guild_id = ? AND category_id = ?",
+            (_id(guild_id), _id(category_id))
+        )
+
+
+# Global matchup store instance
+matchup_store = MatchupStore()
@@ -0,0 +1,141 @@
+# File: utils/matchup_tags.py
+"""
+/matchups tag-users fan-out
+
+Tagging a week used to send one message per channel in order, waiting on each
+send before looking at the next channel. Now the command:
+  - loads every owner of the guild once per league (one database call)
+  - renders every channel's message up front, resolving each matchup in its
+    own league (from the matchup store, else the guild's league) and falling
+    back to the other league like the old CFB-then-NFL lookups
+  - sends them through a few concurrent workers paced per channel and
+    globally by the same BucketPacer the channel provisioning pipeline uses
+  - records failures on each job, so one bad channel doesn't stop the rest
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+import discord
+
+from utils.async_db import db
+from utils.channel_provisioning import BucketPacer, DiscordBackend, paced_call
+from utils.matchup_store import matchup_store
+from utils.team_owners import LEAGUE_TEAM_TABLES, TeamOwners, _load_owners, resolve_league
+from utils.team_registry import team_registry
+from utils.utils import strip_status_suffix
+
+# --------------------
+# Fan-out Settings
+# --------------------
+
+TAG_WORKERS = 5
+
+
+def tag_message(pretty_team1: str, pretty_team2: str, user1_id: Optional[str], user2_id: Optional[str]) -> str:
+    if user1_id and user2_id:
+        return f"**{pretty_team1} vs {pretty_team2}**\n\n<@{user1_id}>\n<@{user2_id}>"
+    if user1_id:
+        return f"**{pretty_team1} vs CPU ({pretty_team2})**\n\n<@{user1_id}>"
+    if user2_id:
+        return f"**{pretty_team2} vs CPU ({pretty_team1})**\n\n<@{user2_id}>"
+    return f"No representatives found for {pretty_team1} or {pretty_team2}."
+
+
+class TagJob:
+    """One matchup channel to tag"""
+
+    __slots__ = ("channel", "content", "error")
+
+    def __init__(self, channel, content: str):
+        self.channel = channel
+        self.content = content
+        self.error: Optional[Exception] = None
+
+
+def _load_league_owners(conn, server_id: str) -> Dict[str, Dict[int, str]]:
+    return {league: _load_owners(conn, (table,), server_id) for league, table in LEAGUE_TEAM_TABLES.items()}
+
+
+def _owner(owners: Dict[str, TeamOwners], leagues: tuple, team_id: int) -> Optional[str]:
+    for league in leagues:
+        user_id = owners[league].get(team_id) if league in owners else None
+        if user_id:
+            return user_id
+    return None
+
+
+async def build_tag_jobs(guild: discord.Guild, category: discord.CategoryChannel) -> List[TagJob]:
+    """Render the tag message for every matchup channel in a category"""
+    server_id = str(guild.id)
+    stored = {record.channel_id: record for record in await matchup_store.for_category(guild.id, category.id)}
+    owner_maps = await db.run("teams", _load_league_owners, server_id, write=False)
+    owners = {league: TeamOwners(owner_map) for league, owner_map in owner_maps.items()}
+    guild_league = resolve_league(server_id)
+
+    jobs = []
+    for channel in category.channels:
+        record = stored.get(str(channel.id))
+        if record:
+            team1_id, team2_id, league = record.team1_id, record.team2_id, record.league
+        else:
+            name = strip_status_suffix(channel.name)
+            if "-vs-" not in name:
+                continue
+            team1_raw, team2_raw = name.split("-vs-", 1)
+            team1_id, team2_id, league = team_registry.team_id(team1_raw), team_registry.team_id(team2_raw), guild_league
+
+        # The matchup's own league first, then the others
+        leagues = (league, *(other for other in LEAGUE_TEAM_TABLES if other != league))
+        jobs.append(TagJob(channel, tag_message(
+            team_registry.display(team1_id), team_registry.display(team2_id),
+            _owner(owners, leagues, team1_id), _owner(owners, leagues, team2_id)
+        )))
+    return jobs
+
+
+class TagSender:
+    """Sends rendered tag messages with bounded concurrency and per-channel/global pacing"""
+
+    def __init__(self, backend, workers: int = TAG_WORKERS):
+        self.backend = backend
+        self.workers = workers
+        self.pacer = BucketPacer()
+        self.sent = 0
+
+    async def _send(self, job: TagJob):
+        bucket = self.backend.bucket("message", job.channel)
+        await paced_call(self.pacer, self.backend, bucket, self.backend.send_message, job.channel, job.content)
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            job = await queue.get()
+            try:
+                await self._send(job)
+                self.sent += 1
+            except Exception as e:
+                job.error = e
+                print(f"[Tag Users] {job.channel.name} failed: {type(e).__name__}: {e}")
+            finally:
+                queue.task_done()
+
+    async def run(self, jobs: List[TagJob]) -> List[TagJob]:
+        """Send every job; failures are recorded on job.error instead of raised"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(min(self.workers, len(jobs)))]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return jobs
+
+
+async def tag_category_users(guild: discord.Guild, category: discord.CategoryChannel) -> List[TagJob]:
+    """Tag the owners in every matchup channel of a category"""
+    jobs = await build_tag_jobs(guild, category)
+    await TagSender(DiscordBackend(guild, category)).run(jobs)
+    return jobs
@@ -0,0 +1,139 @@
+# File: utils/permission_sync.py
+"""
+Category permission sync for /matchups make-public and make-private
+
+Both commands used to set the category's overwrites, then edit every child
+with sync_permissions=True one at a time with a fixed 0.1s sleep. Now:
+  - the target overwrites are the ones just written to the category, and each
+    child is diffed against them from the cached channel state
+  - channels already in sync (and the category itself, if unchanged) are
+    skipped without an API call
+  - the remaining edits run on a few concurrent workers paced by the
+    provisioning BucketPacer, with 429 Retry-After backoff
+  - progress is shown in an ephemeral message while edits run
+
+Children are edited with the explicit target overwrites rather than
+sync_permissions=True: the latter copies the category from discord.py's
+cache, which may not have seen the category update yet.
+"""
+
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+import discord
+
+from utils.channel_provisioning import BucketPacer, DiscordBackend, ProgressReporter, paced_call
+
+# --------------------
+# Sync Settings
+# --------------------
+
+EDIT_WORKERS = 4
+
+
+def _normalized(overwrites: dict) -> Dict[int, tuple]:
+    # Compare by target id and permission bits; empty overwrites don't count
+    normalized = {}
+    for target, overwrite in overwrites.items():
+        if overwrite.is_empty():
+            continue
+        allow, deny = overwrite.pair()
+        normalized[target.id] = (allow.value, deny.value)
+    return normalized
+
+
+def overwrites_match(current: dict, target: dict) -> bool:
+    return _normalized(current) == _normalized(target)
+
+
+class PermissionJob:
+    """One child channel that needs the category's overwrites"""
+
+    __slots__ = ("channel", "error")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.error: Optional[Exception] = None
+
+
+class PermissionSync:
+    """Applies a category's overwrites to the children that differ"""
+
+    def __init__(self, backend, on_progress: Optional[Callable[[dict], None]] = None, workers: int = EDIT_WORKERS):
+        self.backend = backend
+        self.on_progress = on_progress
+        self.workers = workers
+        self.pacer = BucketPacer()
+        self.jobs: List[PermissionJob] = []
+        self.progress = {"total": 0, "synced": 0, "skipped": 0, "failed": 0}
+
+    def _advance(self, key: str):
+        self.progress[key] += 1
+        if self.on_progress:
+            self.on_progress(dict(self.progress))
+
+    def plan(self, channels, overwrites: dict) -> List[PermissionJob]:
+        """Jobs for the channels whose overwrites differ from the target"""
+        self.jobs = [PermissionJob(channel) for channel in channels if not overwrites_match(channel.overwrites, overwrites)]
+        self.progress["total"] = len(self.jobs)
+        self.progress["skipped"] = len(channels) - len(self.jobs)
+        return self.jobs
+
+    async def _worker(self, queue: asyncio.Queue, overwrites: dict):
+        while True:
+            job = await queue.get()
+            try:
+                bucket = self.backend.bucket("edit", job.channel)
+                await paced_call(self.pacer, self.backend, bucket, self.backend.edit_overwrites, job.channel, overwrites)
+                self._advance("synced")
+            except Exception as e:
+                job.error = e
+                self._advance("failed")
+                print(f"[Permission Sync] {job.channel.name} failed: {type(e).__name__}: {e}")
+            finally:
+                queue.task_done()
+
+    async def run(self, jobs: List[PermissionJob], overwrites: dict) -> List[PermissionJob]:
+        """Apply overwrites to every job; failures are recorded on job.error instead of raised"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        workers = [asyncio.create_task(self._worker(queue, overwrites)) for _ in range(min(self.workers, len(jobs)))]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return jobs
+
+
+class PermissionProgressReporter(ProgressReporter):
+    def _initial(self, total: int) -> dict:
+        return {"total": total, "synced": 0, "skipped": 0, "failed": 0}
+
+    def _render(self, progress: dict) -> str:
+        text = f"⏳ {self.label}: {progress['synced']}/{progress['total']} channels"
+        if progress["failed"]:
+            text += f" · ⚠️ {progress['failed']} failed"
+        return text
+
+
+async def sync_category_permissions(
+    interaction: discord.Interaction,
+    category: discord.CategoryChannel,
+    overwrites: dict,
+    label: str = "Syncing permissions",
+) -> PermissionSync:
+    """Set a category's overwrites and bring its out-of-sync children in line"""
+    if not overwrites_match(category.overwrites, overwrites):
+        await category.edit(overwrites=overwrites)
+
+    reporter = PermissionProgressReporter(interaction, label)
+    sync = PermissionSync(DiscordBackend(interaction.guild, category), on_progress=reporter)
+    jobs = sync.plan(category.channels, overwrites)
+    if jobs:
+        await reporter.start(len(jobs))
+    await sync.run(jobs, overwrites)
+    await reporter.finish()
+    return sync
@@ -0,0 +1,144 @@
+# File: utils/settings_cache.py
+"""
+Per-guild server_settings cache for Trilo
+
+Settings are read on every reaction, every commissioner_only() check and every
+league-table lookup. The cache loads all of a guild's server_settings rows in
+one query and answers lookups from memory until the entry expires (TTL) or is
+pushed out by newer guilds (LRU). /settings set/reset/clear-all invalidate the
+guild's entry as soon as they write.
+
+Loads run on the keys database threads via fetch(), which the command tree's
+interaction_check and the reaction/message handlers await before any sync
+lookup. The sync getters then only serve what's cached: an expired entry is
+still returned (the next fetch() refreshes it), and only a guild nothing has
+loaded yet is read on the calling thread.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from utils.async_db import db
+from utils.db_pool import connection_pool
+
+# --------------------
+# Cache Settings
+# --------------------
+
+MAX_CACHED_GUILDS = 5000
+SETTINGS_TTL_SECONDS = 300
+
+
+class SettingsCache:
+    """LRU + TTL cache of {setting: value} dicts keyed by server_id"""
+
+    def __init__(self, max_guilds: int = MAX_CACHED_GUILDS, ttl_seconds: float = SETTINGS_TTL_SECONDS):
+        self.max_guilds = max_guilds
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, str]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.sync_loads = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _load(conn, server_id: str) -> Dict[str, str]:
+        rows = conn.execute(
+            "SELECT setting, new_value FROM server_settings WHERE server_id = ?",
+            (server_id,)
+        ).fetchall()
+        return {setting: value for setting, value in rows}
+
+    def _lookup(self, server_id: str, now: float, allow_stale: bool):
+        # Returns (settings or None, generation to store a fresh load under)
+        with self._lock:
+            entry = self._entries.get(server_id)
+            if entry and (entry[0] > now or allow_stale):
+                self._entries.move_to_end(server_id)
+                if entry[0] > now:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+                return entry[1], None
+            self.misses += 1
+            return None, self._generations.get(server_id, 0)
+
+    async def fetch(self, server_id) -> Dict[str, str]:
+        """Return every setting for a guild, loading a miss on the keys database threads"""
+        server_id = str(server_id)
+        now = time.monotonic()
+        settings, generation = self._lookup(server_id, now, allow_stale=False)
+        if settings is not None:
+            return settings
+        settings = await db.run("keys", self._load, server_id, write=False)
+        self._store(server_id, now, generation, settings)
+        return settings
+
+    def get_all(self, server_id: str) -> Dict[str, str]:
+        """Return every setting for a guild (treat the dict as read-only)"""
+        server_id = str(server_id)
+        now = time.monotonic()
+        settings, generation = self._lookup(server_id, now, allow_stale=True)
+        if settings is not None:
+            return settings
+
+        # Nothing has fetch()ed this guild yet: last-resort read on this thread
+        self.sync_loads += 1
+        settings = self._load(connection_pool.get("keys"), server_id)
+        self._store(server_id, now, generation, settings)
+        return settings
+
+    def _store(self, server_id: str, now: float, generation: int, settings: Dict[str, str]):
+        with self._lock:
+            # Skip the store if a write invalidated this guild while we were loading
+            if self._generations.get(server_id, 0) == generation:
+                self._entries[server_id] = (now + self.ttl_seconds, settings)
+                self._entries.move_to_end(server_id)
+                while len(self._entries) > self.max_guilds:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._generations.pop(evicted, None)
+                    self.evictions += 1
+
+    def get(self, server_id: str, setting: str) -> Optional[str]:
+        """Return a single setting value, or None if the guild has not set it"""
+        return self.get_all(server_id).get(setting)
+
+    def invalidate(self, server_id: str):
+        """Drop a guild's cached settings (call right after writing server_settings)"""
+        server_id = str(server_id)
+        with self._lock:
+            self._entries.pop(server_id, None)
+            self._generations[server_id] = self._generations.get(server_id, 0) + 1
+            self.invalidations += 1
+
+    def clear(self):
+        """Drop every cached guild"""
+        with self._lock:
+            for server_id in self._entries:
+                self._generations[server_id] = self._generations.get(server_id, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for diagnostics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "sync_loads": self.sync_loads,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "cached_guilds": len(self._entries),
+            }
+
+
+# Global settings cache instance
+settings_cache = SettingsCache()
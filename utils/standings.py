@@ -0,0 +1,196 @@
+# File: utils/standings.py
+"""
+Materialized team standings for Trilo
+
+/records view-all-records used to load every record row, compute win % and
+sort on every call. Standings are now kept per (guild, league):
+  - loaded once with a single records/teams join
+  - updated in place whenever a record changes (reaction results,
+    WinnerButtonsView, /records set-record), re-positioning only the teams
+    that changed
+  - the rendered embed is cached until the next change, so repeated views
+    cost no queries
+
+Writers call standing_rows() inside their write transaction and pass the
+result to standings.apply(). Changes that can't be applied incrementally
+(clears, team assignment changes) call invalidate().
+"""
+
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import discord
+
+from utils.async_db import db
+from utils.team_owners import LEAGUE_TEAM_TABLES
+from utils.utils import format_team_name
+
+# --------------------
+# Standings Settings
+# --------------------
+
+LEAGUE_RECORD_TABLES = {"cfb": "cfb_team_records", "nfl": "nfl_team_records"}
+MAX_CACHED_STANDINGS = 1000
+STANDINGS_SHOWN = 32
+MEDALS = ["🥇", "🥈", "🥉"]
+
+
+def _rank_key(team: str, wins: int, losses: int) -> tuple:
+    # Win %, then wins, then name so ties render in a stable order
+    games = wins + losses
+    win_pct = wins / games if games > 0 else 0
+    return (-win_pct, -wins, team)
+
+
+def standing_rows(conn, league: str, server_id: str, teams: Optional[Iterable[str]] = None) -> List[tuple]:
+    """(team_name, wins, losses, user_id) rows for a guild's standings, or just the given teams"""
+    records_table, teams_table = LEAGUE_RECORD_TABLES[league], LEAGUE_TEAM_TABLES[league]
+    sql = f"""
+        SELECT r.team_name, r.wins, r.losses, t.user_id
+        FROM {records_table} r
+        JOIN {teams_table} t ON r.server_id = t.server_id AND r.team_name = t.team_name
+        WHERE r.server_id = ?
+    """
+    if teams is None:
+        return conn.execute(sql, (server_id,)).fetchall()
+    teams = list(teams)
+    placeholders = ", ".join("?" for _ in teams)
+    return conn.execute(f"{sql} AND r.team_name IN ({placeholders})", (server_id, *teams)).fetchall()
+
+
+class _Standings:
+    """One guild/league ranking: team -> (wins, losses, owner) plus a sorted index"""
+
+    __slots__ = ("teams", "ranking", "embed")
+
+    def __init__(self, rows: Iterable[tuple]):
+        self.teams: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        self.ranking: List[tuple] = []
+        self.embed: Optional[discord.Embed] = None
+        for team, wins, losses, owner_id in rows:
+            self.teams[team] = (wins, losses, owner_id)
+            self.ranking.append(_rank_key(team, wins, losses))
+        self.ranking.sort()
+
+    def remove(self, team: str):
+        previous = self.teams.pop(team, None)
+        if previous is None:
+            return
+        key = _rank_key(team, previous[0], previous[1])
+        index = bisect.bisect_left(self.ranking, key)
+        if index < len(self.ranking) and self.ranking[index] == key:
+            del self.ranking[index]
+
+    def upsert(self, team: str, wins: int, losses: int, owner_id):
+        self.remove(team)
+        self.teams[team] = (wins, losses, owner_id)
+        bisect.insort(self.ranking, _rank_key(team, wins, losses))
+
+    def render(self) -> discord.Embed:
+        if self.embed is None:
+            lines = []
+            for i, (_, _, team) in enumerate(self.ranking[:STANDINGS_SHOWN], start=1):
+                wins, losses, owner_id = self.teams[team]
+                user_tag = f"<@{owner_id}>" if owner_id else "CPU"
+                prefix = MEDALS[i - 1] if i <= len(MEDALS) else f"{i}."
+                lines.append(f"**{prefix} {user_tag} — {format_team_name(team)} — {wins}-{losses}**")
+            self.embed = discord.Embed(
+                title="🏆 Team Records",
+                description="\n".join(lines),
+                color=discord.Color.gold()
+            )
+        return self.embed
+
+
+class StandingsCache:
+    """LRU of materialized standings keyed by (server_id, league)"""
+
+    def __init__(self, max_entries: int = MAX_CACHED_STANDINGS):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _Standings]" = OrderedDict()
+        self._generations: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.updates = 0
+        self.invalidations = 0
+
+    def _bump(self, key: tuple):
+        # Drops any load that started before this change
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    async def _get(self, server_id: str, league: str) -> _Standings:
+        key = (server_id, league)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            generation = self._generations.get(key, 0)
+
+        rows = await db.run("teams", standing_rows, league, server_id, write=False)
+        entry = _Standings(rows)
+        with self._lock:
+            self.loads += 1
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    # --------------------
+    # Public API
+    # --------------------
+
+    async def embed(self, server_id, league: str) -> Optional[discord.Embed]:
+        """The standings embed for a guild's league, or None if it has no records"""
+        entry = await self._get(str(server_id), league.lower())
+        if not entry.teams:
+            return None
+        with self._lock:
+            return entry.render()
+
+    def apply(self, server_id, league: str, rows: Iterable[tuple], removed: Iterable[str] = ()):
+        """Apply changed standing_rows() (and removed teams) to a loaded ranking"""
+        key = (str(server_id), league.lower())
+        with self._lock:
+            self._bump(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            for team in removed:
+                entry.remove(team)
+            for team, wins, losses, owner_id in rows:
+                entry.upsert(team, wins, losses, owner_id)
+            entry.embed = None
+            self.updates += 1
+
+    def invalidate(self, server_id, league: Optional[str] = None):
+        """Forget a guild's standings (one league, or all of them)"""
+        server_id = str(server_id)
+        leagues = [league.lower()] if league else list(LEAGUE_RECORD_TABLES)
+        with self._lock:
+            for name in leagues:
+                key = (server_id, name)
+                self._bump(key)
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Return cache counters for diagnostics"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "loads": self.loads,
+                "updates": self.updates,
+                "invalidations": self.invalidations,
+                "cached": len(self._entries),
+            }
+
+
+# Global standings cache instance
+standings = StandingsCache()
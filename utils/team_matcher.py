@@ -0,0 +1,288 @@
+# File: utils/team_matcher.py
+"""
+Typo-tolerant team name resolution for Trilo
+
+Team inputs (/teams assign-user, /records check-record, matchups extracted
+from schedule screenshots) used to need an exact team_name after
+clean_team_key, so "Miami FL", "Mississippi" or "Texas AM" silently became
+CPU teams. Names are now resolved against each league's valid teams plus the
+team_aliases table:
+  - exact canonical or alias matches (after normalizing case, punctuation
+    and leading rankings like "#5") resolve directly; these are the only
+    matches applied without the user seeing them
+  - with fuzzy=True (a "did you mean" prompt, a preview the user confirms)
+    everything else goes through a character trigram index: candidates are
+    precomputed as L2-normalized trigram vectors, a batch of raw names is
+    vectorized the same way and scored with one matrix product. The best
+    candidate only counts if it clears FUZZY_THRESHOLD, beats the best other
+    team by FUZZY_MARGIN, and isn't just some of the input's words
+    ("Alabama State" is not "Alabama", "Florida A&M" is not "Florida")
+  - resolve_pairs never maps both sides of one matchup onto the same team
+
+The index is built at startup; rows added to team_aliases are picked up on
+the next load.
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.async_db import db
+from utils.autocomplete_index import LEAGUE_VALID_TEAM_TABLES, _column
+
+# --------------------
+# Matcher Settings
+# --------------------
+
+FUZZY_THRESHOLD = 0.85
+FUZZY_MARGIN = 0.1
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS team_aliases (
+        league TEXT NOT NULL,
+        alias TEXT NOT NULL,
+        team_name TEXT NOT NULL,
+        PRIMARY KEY (league, alias)
+    )
+"""
+
+_NFL_ABBREVIATIONS = {
+    "bills": "buf", "dolphins": "mia", "patriots": "ne", "jets": "nyj", "ravens": "bal", "bengals": "cin",
+    "browns": "cle", "steelers": "pit", "texans": "hou", "colts": "ind", "jaguars": "jax", "titans": "ten",
+    "broncos": "den", "chiefs": "kc", "raiders": "lv", "chargers": "lac", "cowboys": "dal", "giants": "nyg",
+    "eagles": "phi", "commanders": "was", "bears": "chi", "lions": "det", "packers": "gb", "vikings": "min",
+    "falcons": "atl", "panthers": "car", "saints": "no", "buccaneers": "tb", "cardinals": "ari", "rams": "lar",
+    "49ers": "sf", "seahawks": "sea",
+}
+
+_NFL_FULL_NAMES = {
+    "bills": "buffalo", "dolphins": "miami", "patriots": "new england", "jets": "new york",
+    "ravens": "baltimore", "bengals": "cincinnati", "browns": "cleveland", "steelers": "pittsburgh",
+    "texans": "houston", "colts": "indianapolis", "jaguars": "jacksonville", "titans": "tennessee",
+    "broncos": "denver", "chiefs": "kansas city", "raiders": "las vegas", "chargers": "los angeles",
+    "cowboys": "dallas", "giants": "new york", "eagles": "philadelphia", "commanders": "washington",
+    "bears": "chicago", "lions": "detroit", "packers": "green bay", "vikings": "minnesota",
+    "falcons": "atlanta", "panthers": "carolina", "saints": "new orleans", "buccaneers": "tampa bay",
+    "cardinals": "arizona", "rams": "los angeles", "49ers": "san francisco", "seahawks": "seattle",
+}
+
+BUILTIN_ALIASES = {
+    "cfb": {
+        "miami fl": "miami", "miami florida": "miami", "miami oh": "miami university",
+        "miami ohio": "miami university", "mississippi": "ole miss", "texas am": "texas a&m",
+        "tamu": "texas a&m", "hawaii": "hawai'i", "southern miss": "southern mississippi",
+        "app state": "appalachian state", "fiu": "florida international", "fau": "florida atlantic",
+        "middle tennessee": "middle tennessee st", "middle tennessee state": "middle tennessee st",
+        "mtsu": "middle tennessee st", "jacksonville state": "jax state", "pitt": "pittsburgh",
+        "cal": "california", "louisiana monroe": "ul monroe", "ulm": "ul monroe", "ecu": "east carolina",
+        "south florida": "usf", "central florida": "ucf", "connecticut": "uconn", "massachusetts": "umass",
+        "brigham young": "byu", "louisiana state": "lsu", "southern california": "usc", "southern cal": "usc",
+        "texas christian": "tcu", "southern methodist": "smu", "north carolina state": "nc state",
+        "unc": "north carolina", "wku": "western kentucky", "nmsu": "new mexico state",
+        "sjsu": "san jose state", "sdsu": "san diego state", "ul lafayette": "louisiana",
+        "louisiana lafayette": "louisiana", "jmu": "james madison", "odu": "old dominion",
+    },
+    "nfl": {
+        **{f"{city} {team}": team for team, city in _NFL_FULL_NAMES.items()},
+        # Schedule screenshots often show only the abbreviation or city
+        **{abbreviation: team for team, abbreviation in _NFL_ABBREVIATIONS.items()},
+        **{city: team for team, city in _NFL_FULL_NAMES.items()
+           if list(_NFL_FULL_NAMES.values()).count(city) == 1},
+        "niners": "49ers", "bucs": "buccaneers", "jags": "jaguars", "pats": "patriots",
+    },
+}
+
+_RANKING = re.compile(r"^(?:#\s*\d+|\(\d+\)|no\.\s*\d+)\s+")
+_NOT_ALNUM = re.compile(r"[^a-z0-9&]+")
+_STATE = re.compile(r"\bst\b")
+
+
+def normalize_team_name(raw: str) -> str:
+    """Lowercase, drop rankings and punctuation, spell out "St", collapse whitespace"""
+    name = raw.lower().strip()
+    if name.startswith("fw-"):
+        name = name[3:]
+    name = _RANKING.sub("", name)
+    return _STATE.sub("state", _NOT_ALNUM.sub(" ", name.replace("'", ""))).strip()
+
+
+def _trigrams(name: str) -> List[str]:
+    padded = f"  {name} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _drops_words(name: str, candidate: str) -> bool:
+    """True if candidate is the input minus some words ("oregon st" -> "oregon"), i.e. another team"""
+    words, candidate_words = set(name.split()), set(candidate.split())
+    return candidate_words < words
+
+
+class _LeagueIndex:
+    """Trigram vectors for one league's canonical names and aliases"""
+
+    __slots__ = ("exact", "keys", "labels", "team_ids", "vocabulary", "matrix")
+
+    def __init__(self, teams: Iterable[str], aliases: Dict[str, str]):
+        self.exact: Dict[str, str] = {}
+        for team in teams:
+            self.exact[normalize_team_name(team)] = team
+        for alias, team in aliases.items():
+            self.exact.setdefault(normalize_team_name(alias), team)
+
+        self.labels: List[str] = list(self.exact.values())
+        self.keys: List[str] = list(self.exact.keys())
+        # Rows that belong to the same team (canonical name + its aliases) share an ID
+        team_numbers: Dict[str, int] = {}
+        self.team_ids = np.array(
+            [team_numbers.setdefault(label, len(team_numbers)) for label in self.labels], dtype=np.int32
+        )
+        self.vocabulary: Dict[str, int] = {}
+        for key in self.keys:
+            for gram in _trigrams(key):
+                self.vocabulary.setdefault(gram, len(self.vocabulary))
+        self.matrix = np.zeros((len(self.keys), max(len(self.vocabulary), 1)), dtype=np.float32)
+        for row, key in enumerate(self.keys):
+            for gram in _trigrams(key):
+                self.matrix[row, self.vocabulary[gram]] += 1.0
+        norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+        self.matrix /= np.where(norms == 0, 1.0, norms)
+
+    def resolve(self, names: Sequence[str], fuzzy: bool) -> List[Tuple[Optional[str], float]]:
+        results: List[Tuple[Optional[str], float]] = [(None, 0.0)] * len(names)
+        pending = []
+        for i, name in enumerate(names):
+            team = self.exact.get(name)
+            if team is not None:
+                results[i] = (team, 1.0)
+            elif fuzzy and name and len(self.labels):
+                pending.append(i)
+        if not pending:
+            return results
+
+        # One (queries x trigrams) matrix for the whole batch; trigrams the index has never
+        # seen still count toward each query's norm so junk input scores low
+        queries = np.zeros((len(pending), self.matrix.shape[1]), dtype=np.float32)
+        norms = np.zeros(len(pending), dtype=np.float32)
+        for row, i in enumerate(pending):
+            grams = _trigrams(names[i])
+            counts: Dict[str, int] = {}
+            for gram in grams:
+                counts[gram] = counts.get(gram, 0) + 1
+            for gram, count in counts.items():
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    queries[row, column] = count
+            norms[row] = np.sqrt(sum(count * count for count in counts.values()))
+        scores = (queries @ self.matrix.T) / norms[:, None]
+        best = scores.argmax(axis=1)
+        for row, i in enumerate(pending):
+            column = best[row]
+            score = float(scores[row, column])
+            # Runner-up is the best-scoring row of any other team, not another alias of this one
+            others = scores[row, self.team_ids != self.team_ids[column]]
+            runner_up = float(others.max()) if others.size else 0.0
+            if (score >= FUZZY_THRESHOLD and score - runner_up >= FUZZY_MARGIN
+                    and not _drops_words(names[i], self.keys[column])):
+                results[i] = (self.labels[column], score)
+            else:
+                results[i] = (None, score)
+        return results
+
+
+class TeamMatcher:
+    """Per-league team resolution over valid teams + team_aliases"""
+
+    def __init__(self):
+        self._indexes: Dict[str, _LeagueIndex] = {}
+        self._lock = threading.Lock()
+        self.resolved = 0
+        self.fuzzy = 0
+        self.unmatched = 0
+
+    async def load(self):
+        """Seed built-in aliases and build every league's index (call from the bot's setup_hook)"""
+        def load(conn):
+            conn.execute(SCHEMA)
+            conn.executemany(
+                "INSERT OR IGNORE INTO team_aliases (league, alias, team_name) VALUES (?, ?, ?)",
+                [(league, alias, team) for league, aliases in BUILTIN_ALIASES.items() for alias, team in aliases.items()]
+            )
+            data = {}
+            for league, table in LEAGUE_VALID_TEAM_TABLES.items():
+                teams = _column(conn, f"SELECT team_name FROM {table}")
+                aliases = dict(conn.execute(
+                    "SELECT alias, team_name FROM team_aliases WHERE league = ?", (league,)
+                ).fetchall())
+                # Aliases only count for teams the league actually has
+                valid = set(teams)
+                data[league] = (teams, {alias: team for alias, team in aliases.items() if team in valid})
+            return data
+
+        data = await db.run("teams", load)
+        indexes = {league: _LeagueIndex(teams, aliases) for league, (teams, aliases) in data.items()}
+        with self._lock:
+            self._indexes = indexes
+        print(f"[Team Matcher] Indexed {', '.join(f'{league}: {len(index.labels)} names' for league, index in indexes.items())}")
+
+    async def resolve_many(self, league: str, raw_names: Sequence[str],
+                           fuzzy: bool = False) -> List[Tuple[Optional[str], float]]:
+        """(canonical team_name or None, score) for each raw name, in one pass
+
+        Only exact and alias matches unless fuzzy=True; fuzzy matches must be
+        shown to the user before they're used.
+        """
+        if not self._indexes:
+            await self.load()
+        index = self._indexes.get(league.lower())
+        if index is None:
+            return [(None, 0.0)] * len(raw_names)
+        results = index.resolve([normalize_team_name(name) for name in raw_names], fuzzy)
+        with self._lock:
+            for team, score in results:
+                if team is None:
+                    self.unmatched += 1
+                else:
+                    self.resolved += 1
+                    if score < 1.0:
+                        self.fuzzy += 1
+        return results
+
+    async def resolve(self, league: str, raw_name: str, fuzzy: bool = False) -> Optional[str]:
+        """Canonical team_name for one raw name, or None"""
+        return (await self.resolve_many(league, [raw_name], fuzzy))[0][0]
+
+    async def resolve_pairs(self, league: str, pairs: Sequence[Tuple[str, str]],
+                            fuzzy: bool = False) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Canonical team_names for both sides of each matchup, in one pass
+
+        A side is None if it didn't resolve. If both sides land on the same
+        team, a fuzzy side is dropped; if neither is fuzzy, both are.
+        """
+        results = await self.resolve_many(league, [name for pair in pairs for name in pair], fuzzy)
+        resolved = []
+        for (team1, score1), (team2, score2) in zip(results[::2], results[1::2]):
+            if team1 is not None and team1 == team2:
+                if score1 < 1.0 <= score2:
+                    team1 = None
+                elif score2 < 1.0 <= score1:
+                    team2 = None
+                else:
+                    team1 = team2 = None
+            resolved.append((team1, team2))
+        return resolved
+
+    def stats(self) -> dict:
+        """Return matcher counters for diagnostics"""
+        with self._lock:
+            return {
+                "resolved": self.resolved,
+                "fuzzy": self.fuzzy,
+                "unmatched": self.unmatched,
+                "names": {league: len(index.labels) for league, index in self._indexes.items()},
+            }
+
+
+# Global team matcher instance
+team_matcher = TeamMatcher()
@@ -0,0 +1,76 @@
+# File: utils/team_owners.py
+"""
+Team ownership lookups for matchup commands
+
+Matchup creation, listing, tagging and game-status trackers all need to know
+who owns each side of every matchup. Instead of two SELECTs per matchup, load
+the guild's whole team -> user map for its league in one query and answer
+every matchup from memory:
+
+    owners = await load_team_owners(guild.id)
+    user1_id = owners.get(team1_key)      # None means CPU
+
+Lookups go through utils.team_registry, so any spelling of a team (key,
+slug, channel-name form, alias or team ID) finds its owner.
+"""
+
+from typing import Dict, Iterable, Optional
+
+from utils.async_db import db
+from utils.settings_cache import settings_cache
+from utils.team_registry import TeamRef, team_registry
+
+LEAGUE_TEAM_TABLES = {
+    "cfb": "cfb_teams",
+    "nfl": "nfl_teams",
+}
+
+
+def resolve_league(server_id: str) -> str:
+    """Return the guild's league type (defaults to CFB if unset)"""
+    league = (settings_cache.get(str(server_id), "league_type") or "cfb").lower()
+    return league if league in LEAGUE_TEAM_TABLES else "cfb"
+
+
+class TeamOwners:
+    """Read-only team ID -> user_id map for one guild"""
+
+    def __init__(self, owners: Dict[int, str]):
+        self._owners = owners
+
+    def get(self, team: TeamRef) -> Optional[str]:
+        """Return the owning user_id for a team key or ID, or None for a CPU team"""
+        return self._owners.get(team_registry.team_id(team))
+
+    def is_cpu(self, team: TeamRef) -> bool:
+        return team_registry.team_id(team) not in self._owners
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+
+def _load_owners(conn, teams_tables: tuple, server_id: str) -> Dict[int, str]:
+    owners: Dict[int, str] = {}
+    for teams_table in teams_tables:
+        rows = conn.execute(
+            f"SELECT team_name, user_id FROM {teams_table} WHERE server_id = ? ORDER BY id",
+            (server_id,)
+        ).fetchall()
+        for team_name, user_id in rows:
+            # Earlier leagues win, matching the old "try CFB, then NFL" lookups
+            owners.setdefault(team_registry.team_id(team_name), user_id)
+    return owners
+
+
+async def load_team_owners(server_id, leagues: Optional[Iterable[str]] = None) -> TeamOwners:
+    """Load every team owner for a guild in one query per league
+
+    leagues defaults to the guild's configured league. Pass several (e.g.
+    ("cfb", "nfl")) to fall back across leagues in that order.
+    """
+    server_id = str(server_id)
+    if leagues is None:
+        leagues = (resolve_league(server_id),)
+    teams_tables = tuple(LEAGUE_TEAM_TABLES[league.lower()] for league in leagues)
+    owners = await db.run("teams", _load_owners, teams_tables, server_id, write=False)
+    return TeamOwners(owners)
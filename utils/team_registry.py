@@ -0,0 +1,188 @@
+# File: utils/team_registry.py
+"""
+Canonical team registry for Trilo
+
+Every command, tracker and reaction used to re-derive a team's key and
+display name from whatever spelling it had on hand (slash command input,
+"texas-am-vs-fw-lsu-✅" channel names, OCR'd screenshots). clean_team_key and
+format_team_name rebuilt their special-case and acronym tables on every call,
+and a few call sites normalized slightly differently. Now:
+  - each team is interned once as an integer ID with its canonical key (the
+    team_name stored in the valid-team, teams and records tables) and a
+    precomputed display name
+  - every known spelling maps to that ID: the canonical key, its hyphenated
+    slug, its Discord channel-name form, and the team_aliases rows
+  - names that aren't in any valid-team table (FCS schools, custom teams,
+    OCR noise) are not interned, so arbitrary input can't grow the registry:
+    their "ID" is the normalized key string itself, and key() / display()
+    compute it on the fly
+
+IDs are process-local; anything persisted keeps storing the canonical key.
+
+    team_id = team_registry.team_id("Texas-AM")
+    team_registry.key(team_id)       # "texas a&m"
+    team_registry.display(team_id)   # "Texas A&M"
+"""
+
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Union
+
+# --------------------
+# Registry Settings
+# --------------------
+
+LEAGUE_VALID_TEAM_TABLES = {"cfb": "cfb_valid_teams", "nfl": "nfl_valid_teams"}
+MAX_CACHED_SPELLINGS = 50000
+
+ACRONYMS = {
+    "usc", "lsu", "ucla", "fiu", "fau", "smu", "byu", "tcu", "fcs",
+    "unlv", "utsa", "uab", "usf", "ucf", "umass", "uconn"
+}
+SPECIAL_DISPLAY_NAMES = {"texas a&m": "Texas A&M"}
+# Known before any table is loaded, so channel names resolve even without valid-team data
+BUILTIN_SPELLINGS = {"texas am": "texas a&m"}
+
+# Discord drops these from channel names ("texas a&m" -> "texas-am")
+_CHANNEL_UNSAFE = re.compile(r"[^a-z0-9\- ]")
+
+TeamRef = Union[int, str]
+
+
+def _normalize(raw: str) -> str:
+    """Shared key normalization: lowercase, no force-win prefix, hyphens as spaces"""
+    key = raw.lower().strip()
+    if key.startswith("fw-"):
+        key = key[3:]
+    return key.replace("-", " ")
+
+
+def _display_name(key: str) -> str:
+    if key in SPECIAL_DISPLAY_NAMES:
+        return SPECIAL_DISPLAY_NAMES[key]
+    return " ".join(word.upper() if word in ACRONYMS else word.capitalize() for word in key.split())
+
+
+def _channel_form(key: str) -> str:
+    return _CHANNEL_UNSAFE.sub("", key).replace(" ", "-")
+
+
+class TeamRegistry:
+    """Interned team IDs with canonical keys and display names"""
+
+    def __init__(self, max_spellings: int = MAX_CACHED_SPELLINGS):
+        self.max_spellings = max_spellings
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._display: List[str] = []
+        self._spellings: Dict[str, int] = {}
+        self.loaded_teams = 0
+        for spelling, key in BUILTIN_SPELLINGS.items():
+            self._add_spelling(spelling, self._intern(key))
+
+    def _intern(self, key: str) -> int:
+        # Caller holds the lock
+        team_id = self._ids.get(key)
+        if team_id is None:
+            team_id = len(self._keys)
+            self._ids[key] = team_id
+            self._keys.append(key)
+            self._display.append(_display_name(key))
+        return team_id
+
+    def _add_spelling(self, spelling: str, team_id: int):
+        # Caller holds the lock; canonical keys always win over other spellings
+        if spelling and spelling not in self._ids and len(self._spellings) < self.max_spellings:
+            self._spellings.setdefault(spelling, team_id)
+
+    # --------------------
+    # Loading
+    # --------------------
+
+    async def load(self):
+        """Register every valid team and alias (call from the bot's setup_hook, after team_matcher.load)"""
+        from utils.async_db import db
+
+        def load(conn):
+            data = {}
+            for league, table in LEAGUE_VALID_TEAM_TABLES.items():
+                try:
+                    teams = [row[0] for row in conn.execute(f"SELECT team_name FROM {table}").fetchall()]
+                except sqlite3.OperationalError as e:
+                    # League tables not set up on this install (e.g. no NFL data yet)
+                    print(f"[Team Registry] Skipping {league}: {e}")
+                    continue
+                try:
+                    aliases = conn.execute(
+                        "SELECT alias, team_name FROM team_aliases WHERE league = ?", (league,)
+                    ).fetchall()
+                except sqlite3.OperationalError:
+                    aliases = []
+                data[league] = (teams, aliases)
+            return data
+
+        data = await db.run("teams", load, write=False)
+        with self._lock:
+            for teams, aliases in data.values():
+                valid = set()
+                for team in teams:
+                    key = _normalize(team)
+                    team_id = self._intern(key)
+                    valid.add(key)
+                    self._add_spelling(key.replace(" ", "-"), team_id)
+                    self._add_spelling(_normalize(_channel_form(key)), team_id)
+                for alias, team in aliases:
+                    key = _normalize(team)
+                    if key in valid:
+                        self._add_spelling(_normalize(alias), self._ids[key])
+            self.loaded_teams = len(self._keys)
+        print(f"[Team Registry] Registered {self.loaded_teams} teams, {len(self._spellings)} extra spellings")
+
+    # --------------------
+    # Lookups
+    # --------------------
+
+    def team_id(self, team: TeamRef) -> TeamRef:
+        """Interned ID for any spelling of a known team (or the ID itself);
+        the normalized key string for a team the registry doesn't know"""
+        if isinstance(team, int):
+            return team
+        team_id = self._ids.get(team)
+        if team_id is None:
+            team_id = self._spellings.get(team)
+        if team_id is not None:
+            return team_id
+        key = _normalize(team)
+        with self._lock:
+            team_id = self._ids.get(key)
+            if team_id is None:
+                team_id = self._spellings.get(key)
+            if team_id is None:
+                return key
+            self._add_spelling(team, team_id)
+        return team_id
+
+    def key(self, team: TeamRef) -> str:
+        """Canonical team key (what the teams/records tables store)"""
+        team_id = self.team_id(team)
+        return team_id if isinstance(team_id, str) else self._keys[team_id]
+
+    def display(self, team: TeamRef) -> str:
+        """Display name ("Texas A&M", "LSU", "Ohio State"), precomputed for known teams"""
+        team_id = self.team_id(team)
+        return _display_name(team_id) if isinstance(team_id, str) else self._display[team_id]
+
+    def stats(self) -> dict:
+        """Return registry counters for diagnostics"""
+        with self._lock:
+            return {
+                "teams": len(self._keys),
+                "loaded_teams": self.loaded_teams,
+                "spellings": len(self._spellings),
+            }
+
+
+# Global team registry instance
+team_registry = TeamRegistry()
@@ -0,0 +1,190 @@
+# File: utils/tracker_sync.py
+"""
+Game Status Tracker sync for /matchups sync-records
+
+Syncing a week used to walk the category one channel at a time: four queries
+(two records, two owners), channel.history() to find the tracker, then the
+edit. Now:
+  - records and owners for every team in the category are loaded in one
+    database call
+  - trackers are located by the IDs in the matchup store; only channels
+    created before the store fall back to a history scan (and are recorded
+    so the next sync doesn't need one)
+  - edits run concurrently under a small cap; discord.py paces each
+    channel's message bucket and retries 429s
+  - the store keeps a digest of what each tracker says, so unchanged
+    trackers are not edited at all
+"""
+
+import asyncio
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+import discord
+
+from utils.async_db import db
+from utils.matchup_store import MatchupRecord, matchup_store
+from utils.standings import LEAGUE_RECORD_TABLES
+from utils.team_owners import LEAGUE_TEAM_TABLES, TeamOwners, _load_owners
+from utils.utils import clean_team_key, format_team_name, strip_status_suffix
+
+# --------------------
+# Sync Settings
+# --------------------
+
+MAX_CONCURRENT_EDITS = 5
+LEGACY_HISTORY_LIMIT = 10
+
+
+def synced_tracker_content(pretty_team1: str, pretty_team2: str, rec1: tuple, rec2: tuple,
+                           team1_cpu: bool, team2_cpu: bool) -> str:
+    """Game Status Tracker with current records (sync-records)"""
+    return (
+        f"🏁 **Game Status Tracker**\nReact below to update this matchup's status:\n\n"
+        f"✅ Completed\n"
+        f"🎲 Fair Sim\n"
+        f"🟥 - ☑️ Force Win **{pretty_team1} {'(CPU)' if team1_cpu else f'({rec1[0]}-{rec1[1]})'}**\n"
+        f"🟦 - ☑️ Force Win **{pretty_team2} {'(CPU)' if team2_cpu else f'({rec2[0]}-{rec2[1]})'}**\n\n"
+        "*Records current as of recent sync — may not reflect live records.*"
+    )
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def _load_snapshot(conn, league: str, server_id: str, team_keys: List[str]):
+    """Records for the given teams and every owner in the guild (runs on a database thread)"""
+    records: Dict[str, tuple] = {}
+    if team_keys:
+        placeholders = ", ".join("?" for _ in team_keys)
+        rows = conn.execute(
+            f"SELECT team_name, wins, losses FROM {LEAGUE_RECORD_TABLES[league]} "
+            f"WHERE server_id = ? AND team_name IN ({placeholders})",
+            (server_id, *team_keys)
+        ).fetchall()
+        records = {team: (wins, losses) for team, wins, losses in rows}
+    owners = _load_owners(conn, (LEAGUE_TEAM_TABLES[league],), server_id)
+    return records, owners
+
+
+class _SyncJob:
+    __slots__ = ("channel", "record", "team1_key", "team2_key", "message", "content", "digest")
+
+    def __init__(self, channel, record: Optional[MatchupRecord], team1_key: str, team2_key: str):
+        self.channel = channel
+        self.record = record
+        self.team1_key = team1_key
+        self.team2_key = team2_key
+        self.message = None
+        self.content = None
+        self.digest = None
+
+
+class SyncResult:
+    """What a category sync did, for the summary embed"""
+
+    __slots__ = ("updated", "unchanged", "missing", "failed")
+
+    def __init__(self):
+        self.updated: List[str] = []
+        self.unchanged: List[str] = []
+        self.missing: List[str] = []
+        self.failed: List[str] = []
+
+
+def _build_jobs(channels: Iterable, stored: Dict[str, MatchupRecord]) -> List[_SyncJob]:
+    jobs = []
+    for channel in channels:
+        if not isinstance(channel, discord.TextChannel):
+            continue
+        record = stored.get(str(channel.id))
+        if record:
+            jobs.append(_SyncJob(channel, record, record.team1_key, record.team2_key))
+            continue
+
+        # Channel created before the matchup store: fall back to its name
+        name = strip_status_suffix(channel.name)
+        if "-vs-" not in name:
+            continue
+        team1_raw, team2_raw = name.split("-vs-", 1)
+        jobs.append(_SyncJob(channel, None, clean_team_key(team1_raw), clean_team_key(team2_raw)))
+    return jobs
+
+
+async def _find_legacy_tracker(job: _SyncJob, bot_user_id: int):
+    async for message in job.channel.history(limit=LEGACY_HISTORY_LIMIT):
+        if message.author.id == bot_user_id and "Game Status Tracker" in message.content:
+            return message
+    return None
+
+
+async def sync_category_trackers(guild: discord.Guild, category: discord.CategoryChannel, bot_user_id: int,
+                                 league: str = "cfb") -> SyncResult:
+    """Bring every tracker in a matchup category up to date with current records"""
+    server_id = str(guild.id)
+    result = SyncResult()
+    stored = {record.channel_id: record for record in await matchup_store.for_category(guild.id, category.id)}
+    jobs = _build_jobs(category.channels, stored)
+    if not jobs:
+        return result
+
+    team_keys = sorted({key for job in jobs for key in (job.team1_key, job.team2_key)})
+    records, owner_map = await db.run("teams", _load_snapshot, league, server_id, team_keys, write=False)
+    owners = TeamOwners(owner_map)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_EDITS)
+    found_legacy = []
+
+    async def sync(job: _SyncJob):
+        job.content = synced_tracker_content(
+            format_team_name(job.team1_key), format_team_name(job.team2_key),
+            records.get(job.team1_key, (0, 0)), records.get(job.team2_key, (0, 0)),
+            owners.is_cpu(job.team1_key), owners.is_cpu(job.team2_key)
+        )
+        job.digest = content_digest(job.content)
+
+        if job.record:
+            # Tracker already consumed by a status reaction: nothing to update
+            if not job.record.tracker_message_id:
+                result.missing.append(job.channel.name)
+                return
+            if job.record.tracker_digest == job.digest:
+                result.unchanged.append(job.channel.name)
+                return
+            job.message = job.channel.get_partial_message(int(job.record.tracker_message_id))
+
+        async with semaphore:
+            try:
+                if job.message is None:
+                    job.message = await _find_legacy_tracker(job, bot_user_id)
+                    if job.message is None:
+                        result.missing.append(job.channel.name)
+                        return
+                    found_legacy.append(job)
+                    if job.message.content == job.content:
+                        result.unchanged.append(job.channel.name)
+                        return
+                await job.message.edit(content=job.content)
+                result.updated.append(job.channel.name)
+            except Exception as e:
+                print(f"[Update Error] Failed in {job.channel.name}: {e}")
+                result.failed.append(job.channel.name)
+                job.digest = None
+
+    await asyncio.gather(*(sync(job) for job in jobs))
+
+    # Legacy channels become regular store entries, so the next sync skips the history scan
+    if found_legacy:
+        await matchup_store.record_channels(guild.id, category, league, [
+            (job.channel.id, job.team1_key, job.team2_key, job.message.id) for job in found_legacy
+        ])
+    await matchup_store.set_tracker_digests(
+        (job.channel.id, job.digest) for job in jobs if job.digest and job.message is not None
+    )
+
+    # Keep the category's channel order in the summary
+    order = {channel.name: index for index, channel in enumerate(category.channels)}
+    for names in (result.updated, result.unchanged, result.missing, result.failed):
+        names.sort(key=lambda name: order.get(name, 0))
+    return result
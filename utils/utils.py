@@ -4,21 +4,19 @@ import os
 import sqlite3
 import discord
 from discord import app_commands
-from config.database import DatabaseConfig
+from utils.db_pool import connection_pool
+from utils.team_registry import team_registry
 
 # --------------------
 # Path & DB Management
 # --------------------
 
 def get_db_connection(db_name: str) -> sqlite3.Connection:
-    """Get a database connection using the centralized configuration"""
+    """Get this thread's pooled database connection using the centralized configuration"""
     try:
-        db_path = DatabaseConfig.get_db_path(db_name)
-        conn = sqlite3.connect(db_path)
-        # Enable foreign keys and set timeout
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA busy_timeout = 30000")  # 30 second timeout
-        return conn
+        # Connections are long-lived and shared per thread; close() is a no-op
+        # and `with` still commits/rolls back as before.
+        return connection_pool.get(db_name)
     except Exception as e:
         print(f"Error connecting to database {db_name}: {e}")
         raise
@@ -62,28 +60,11 @@ def apply_status_suffix(base: str, emoji: str) -> str:
 # --------------------
 
 def format_team_name(name: str) -> str:
-    special_cases = {
-        "texas a&m": "Texas A&M",
-        "texas-am": "Texas A&M",
-    }
-
-    name = name.lower().strip()
-    if name in special_cases:
-        return special_cases[name]
-
-    acronyms = {
-        "usc", "lsu", "ucla", "fiu", "fau", "smu", "byu", "tcu",
-        "unlv", "utsa", "uab", "usf", "ucf", "umass", "uconn"
-    }
-
-    words = name.split()
-    return " ".join([word.upper() if word in acronyms else word.capitalize() for word in words])
+    """Display name for any spelling of a team (see utils.team_registry)"""
+    return team_registry.display(name)
 
 def clean_team_key(raw: str) -> str:
-    raw = raw.lower().strip()
-    if raw.startswith("fw-"):
-        raw = raw[3:]
-    key = raw.replace("-", " ")
-    return {"texas am": "texas a&m"}.get(key, key)
+    """Canonical team key for any spelling of a team (see utils.team_registry)"""
+    return team_registry.key(raw)
 
 
@@ -0,0 +1,113 @@
+# File: utils/vision_cache.py
+"""
+Persistent cache of schedule-image extractions
+
+Commissioners often re-upload the same screenshot (after cancelling the
+create-from-image preview) and several leagues share one weekly schedule
+graphic. Results are keyed by the SHA-256 of the downloaded image bytes plus
+the extraction prompt version, so a repeat upload skips the OpenAI call
+entirely. Discord serves attachments byte-for-byte, so a content hash catches
+every exact re-upload; bump the prompt version whenever the prompt, model or
+parser changes so stale extractions stop matching.
+
+The cache lives in its own SQLite file and keeps at most MAX_CACHED_EXTRACTIONS
+rows, evicting the least recently used.
+"""
+
+import hashlib
+import json
+import time
+from typing import List, Optional, Tuple
+
+from utils.async_db import db
+
+# --------------------
+# Cache Settings
+# --------------------
+
+MAX_CACHED_EXTRACTIONS = 2000
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS vision_extractions (
+        cache_key TEXT PRIMARY KEY,
+        prompt_version TEXT NOT NULL,
+        category TEXT,
+        matchups TEXT NOT NULL,
+        created_at DATETIME DEFAULT (datetime('now', 'localtime')),
+        last_used REAL NOT NULL,
+        hits INTEGER DEFAULT 0
+    )
+"""
+
+
+def image_cache_key(image_bytes: bytes, prompt_version: str) -> str:
+    """Cache key for an image under a given prompt version"""
+    return f"{prompt_version}:{hashlib.sha256(image_bytes).hexdigest()}"
+
+
+class VisionCache:
+    """SQLite-backed LRU cache of (category, matchups) extractions"""
+
+    def __init__(self, db_name: str = "vision_cache", max_entries: int = MAX_CACHED_EXTRACTIONS):
+        self.db_name = db_name
+        self.max_entries = max_entries
+        self._schema_ready = False
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _ensure_schema(self, conn):
+        if not self._schema_ready:
+            conn.execute(SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_vision_extractions_last_used ON vision_extractions(last_used)")
+            self._schema_ready = True
+
+    def _lookup(self, conn, cache_key: str):
+        self._ensure_schema(conn)
+        row = conn.execute(
+            "SELECT category, matchups FROM vision_extractions WHERE cache_key = ?",
+            (cache_key,)
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE vision_extractions SET last_used = ?, hits = hits + 1 WHERE cache_key = ?",
+                (time.time(), cache_key)
+            )
+        return row
+
+    def _store(self, conn, cache_key: str, prompt_version: str, category: Optional[str], matchups: List[str]):
+        self._ensure_schema(conn)
+        conn.execute(
+            "INSERT OR REPLACE INTO vision_extractions (cache_key, prompt_version, category, matchups, last_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (cache_key, prompt_version, category, json.dumps(matchups), time.time())
+        )
+        conn.execute(
+            "DELETE FROM vision_extractions WHERE cache_key IN ("
+            "  SELECT cache_key FROM vision_extractions ORDER BY last_used DESC LIMIT -1 OFFSET ?"
+            ")",
+            (self.max_entries,)
+        )
+
+    async def get(self, cache_key: str) -> Optional[Tuple[Optional[str], List[str]]]:
+        """Return a cached (category, matchups) pair, or None on a miss"""
+        row = await db.run(self.db_name, self._lookup, cache_key)
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        category, matchups = row
+        return category, json.loads(matchups)
+
+    async def put(self, cache_key: str, prompt_version: str, category: Optional[str], matchups: List[str]):
+        """Store an extraction and evict the least recently used rows over the limit"""
+        await db.run(self.db_name, self._store, cache_key, prompt_version, category, matchups)
+        self.stores += 1
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for diagnostics"""
+        return {"hits": self.hits, "misses": self.misses, "stores": self.stores}
+
+
+# Global vision cache instance
+vision_cache = VisionCache()
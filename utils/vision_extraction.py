@@ -0,0 +1,234 @@
+# File: utils/vision_extraction.py
+"""
+Streaming, schema-constrained matchup extraction for schedule screenshots
+
+The old extraction asked gpt-4o-mini for free text, waited for the whole
+completion and then parsed CATEGORY:/MATCHUPS: lines by hand. The prompt also
+carried the full NFL nickname list on every call. Now:
+  - the request uses Structured Outputs with a strict JSON schema
+    ({"category": ..., "matchups": [{"away": ..., "home": ...}]}), so the
+    prompt only describes what to read, not how to format it
+  - team names come back as printed; canonicalization (nicknames, "Miami FL",
+    typos) is left to the local alias tables in utils.team_matcher, which
+    drops the NFL name list from the prompt
+  - the response is streamed over SSE and MatchupStreamParser emits each
+    matchup the moment its JSON object closes, so callers can validate and
+    queue channel creation while the model is still writing the rest
+
+Calls are admitted by utils.vision_scheduler, which retries VisionAPIError
+responses that are retryable (429/5xx).
+"""
+
+import json
+import re
+from typing import AsyncIterator, List, Optional
+
+import aiohttp
+
+# --------------------
+# Extraction Settings
+# --------------------
+
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+EXTRACTION_MAX_TOKENS = 1000
+
+EXTRACTION_PROMPT = """Read the football schedule in this image.
+
+- category: the most prominent label (Week N, Playoffs, Bowl Games, Championship); "Matchups" if none is shown.
+- matchups: every game, away (left / before AT or @) then home. Read the left column top to bottom, then the right column.
+- Copy team names as printed, without rankings, seeds, scores or records. Don't expand abbreviations.
+- Skip rows that are incomplete or unreadable instead of guessing, and list a repeated game once."""
+
+EXTRACTION_SCHEMA = {
+    "name": "matchup_extraction",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "category": {"type": "string"},
+            "matchups": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "away": {"type": "string"},
+                        "home": {"type": "string"},
+                    },
+                    "required": ["away", "home"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["category", "matchups"],
+        "additionalProperties": False,
+    },
+}
+
+
+class VisionAPIError(RuntimeError):
+    """Non-200 response from the chat completions endpoint"""
+
+    def __init__(self, status: int, body: str, retry_after: Optional[float] = None):
+        super().__init__(f"OpenAI API error: {status} - {body[:300]}")
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status == 429 or self.status >= 500
+
+
+def _retry_after(headers) -> Optional[float]:
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+_CATEGORY = re.compile(r'"category"\s*:\s*("(?:[^"\\]|\\.)*")')
+_RANKING = re.compile(r"^(?:#\s*\d+|\(\d+\)|\d+)\s+")
+
+
+def build_extraction_payload(model: str, image_data_url: str) -> dict:
+    """Chat completions body for one streamed, schema-constrained extraction"""
+    return {
+        "model": model,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": EXTRACTION_PROMPT},
+                    {"type": "image_url", "image_url": {"url": image_data_url}},
+                ],
+            }
+        ],
+        "response_format": {"type": "json_schema", "json_schema": EXTRACTION_SCHEMA},
+        "max_tokens": EXTRACTION_MAX_TOKENS,
+        "temperature": 0.1,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+
+
+def _clean_side(name) -> str:
+    if not isinstance(name, str):
+        return ""
+    return _RANKING.sub("", " ".join(name.split()))
+
+
+class MatchupStreamParser:
+    """Incrementally parses the extraction JSON as content deltas arrive
+
+    Matchup objects are the only depth-2 objects in the schema, so each one is
+    complete as soon as its closing brace arrives. Invalid rows (missing side,
+    a team playing itself) and repeats are dropped here.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.category: Optional[str] = None
+        self.matchups: List[str] = []
+        self.rejected = 0
+        self.usage: Optional[dict] = None
+        self._seen = set()
+        self._scan = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[str]:
+        """Add a content delta; return matchups ("Away vs Home") completed by it"""
+        self.buffer += text
+        if self.category is None:
+            match = _CATEGORY.search(self.buffer)
+            if match:
+                self.category = json.loads(match.group(1)).strip() or None
+
+        completed = []
+        buffer = self.buffer
+        for index in range(self._scan, len(buffer)):
+            char = buffer[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+                if self._depth == 2:
+                    self._object_start = index
+            elif char == "}":
+                if self._depth == 2 and self._object_start is not None:
+                    matchup = self._accept(buffer[self._object_start:index + 1])
+                    if matchup:
+                        completed.append(matchup)
+                    self._object_start = None
+                self._depth -= 1
+        self._scan = len(buffer)
+        return completed
+
+    def _accept(self, raw: str) -> Optional[str]:
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            self.rejected += 1
+            return None
+        away, home = _clean_side(item.get("away")), _clean_side(item.get("home"))
+        if not away or not home or away.lower() == home.lower():
+            self.rejected += 1
+            return None
+        key = (away.lower(), home.lower())
+        if key in self._seen:
+            return None
+        self._seen.add(key)
+        matchup = f"{away} vs {home}"
+        self.matchups.append(matchup)
+        return matchup
+
+
+async def stream_matchup_extraction(
+    session: aiohttp.ClientSession,
+    api_key: str,
+    model: str,
+    image_data_url: str,
+    parser: MatchupStreamParser,
+) -> AsyncIterator[str]:
+    """Yield validated matchups while the completion streams in
+
+    parser.category is set as soon as the category field has arrived and
+    parser.usage once the final chunk reports it. Raises VisionAPIError on a
+    non-200 response (before anything is yielded).
+    """
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+    payload = build_extraction_payload(model, image_data_url)
+    async with session.post(OPENAI_CHAT_URL, headers=headers, json=payload) as response:
+        if response.status != 200:
+            raise VisionAPIError(response.status, await response.text(), _retry_after(response.headers))
+
+        async for raw_line in response.content:
+            line = raw_line.decode("utf-8").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            parser.usage = chunk.get("usage") or parser.usage
+            for choice in chunk.get("choices") or ():
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    for matchup in parser.feed(delta):
+                        yield matchup
+
+    if parser.usage:
+        print(f"[Vision] {len(parser.matchups)} matchups, {parser.usage.get('prompt_tokens')} prompt + "
+              f"{parser.usage.get('completion_tokens')} completion tokens")
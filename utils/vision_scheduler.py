@@ -0,0 +1,341 @@
+# File: utils/vision_scheduler.py
+"""
+Process-wide scheduler for OpenAI vision extractions
+
+/matchups create-from-image used to fire up to five extractions at once with
+asyncio.gather and no global limit, so when hundreds of leagues advance on the
+same night every call hit OpenAI together and a wave of 429s followed. Every
+extraction now goes through one scheduler that:
+  - caps concurrent calls (MAX_CONCURRENT_JOBS)
+  - spends from a tokens-per-minute bucket: each job is admitted against an
+    estimate and settled against the usage the stream reports
+  - picks the next job round-robin across guilds, so one league uploading
+    five screenshots can't starve the rest
+  - retries 429/5xx with jittered exponential backoff (honouring
+    Retry-After), pausing all admissions on a 429
+  - reports each waiting job's queue position, which QueuePositionReporter
+    shows in the command's deferred response
+
+Cache hits never reach the scheduler.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+
+import discord
+
+from utils.vision_extraction import VisionAPIError
+
+# --------------------
+# Scheduler Settings
+# --------------------
+
+MAX_CONCURRENT_JOBS = 8
+TOKENS_PER_MINUTE = 150_000
+ESTIMATED_TOKENS_PER_JOB = 2_000   # trimmed prompt + one high-detail image + streamed JSON
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+POSITION_EDIT_INTERVAL_SECONDS = 2.0
+SERVED_MEMORY_SECONDS = 600   # how long an idle guild keeps its place in the rotation
+
+
+class VisionJob:
+    """One queued extraction"""
+
+    __slots__ = ("guild_id", "fn", "future", "estimated_tokens", "tokens_used",
+                 "attempts", "enqueued_at", "on_position")
+
+    def __init__(self, guild_id: str, fn, estimated_tokens: int, on_position):
+        self.guild_id = guild_id
+        self.fn = fn
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.estimated_tokens = estimated_tokens
+        self.tokens_used: Optional[int] = None  # set by fn once the response reports usage
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+        self.on_position = on_position
+
+
+class VisionScheduler:
+    """Global concurrency + TPM budget with per-guild round-robin"""
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_JOBS,
+        tokens_per_minute: int = TOKENS_PER_MINUTE,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.max_concurrent = max_concurrent
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self._queues: Dict[str, Deque[VisionJob]] = {}
+        # Guild -> (dispatch sequence number of its last job, when); least recently served goes next.
+        # Kept after a guild's queue empties, so resubmitting one job at a time can't jump the line
+        self._served: Dict[str, Tuple[int, float]] = {}
+        self._sequence = 0
+        self._running = 0
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Running _execute tasks (referenced so they can't be garbage-collected mid-call)
+        self._tasks: Set[asyncio.Task] = set()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.max_wait = 0.0
+
+    # --------------------
+    # Public API
+    # --------------------
+
+    async def submit(
+        self,
+        guild_id,
+        fn: Callable[[VisionJob], Awaitable],
+        estimated_tokens: int = ESTIMATED_TOKENS_PER_JOB,
+        on_position: Optional[Callable[[VisionJob, int], None]] = None,
+    ):
+        """Queue fn(job) for a guild and return its result once it has run
+
+        on_position(job, n) is called with the job's 1-based queue position
+        while it waits, and with 0 when it starts.
+        """
+        self._ensure_worker()
+        job = VisionJob(str(guild_id), fn, estimated_tokens, on_position)
+        # A guild the scheduler hasn't served recently joins the back of the rotation
+        self._served.setdefault(job.guild_id, (self._sequence, job.enqueued_at))
+        self._queues.setdefault(job.guild_id, deque()).append(job)
+        self.submitted += 1
+        self._wake()
+        return await job.future
+
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def close(self):
+        """Stop dispatching; queued and running jobs fail with CancelledError"""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        for queue in self._queues.values():
+            for job in queue:
+                if not job.future.done():
+                    job.future.cancel()
+        self._queues.clear()
+
+    def stats(self) -> dict:
+        """Return scheduler counters for diagnostics"""
+        return {
+            "queue_depth": self.queue_depth(),
+            "running": self._running,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "max_wait_seconds": round(self.max_wait, 1),
+        }
+
+    # --------------------
+    # Dispatch
+    # --------------------
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+
+    def _wake(self):
+        if self._wakeup:
+            self._wakeup.set()
+
+    def _wake_after(self, delay: float):
+        asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _refill(self, now: float):
+        rate = self.tokens_per_minute / 60.0
+        self._tokens = min(float(self.tokens_per_minute), self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+
+    def _rotation(self) -> list:
+        """Guilds with waiting jobs, least recently served first"""
+        for guild_id, queue in list(self._queues.items()):
+            # Drop jobs whose caller already gave up
+            while queue and queue[0].future.done():
+                queue.popleft()
+            if not queue:
+                del self._queues[guild_id]
+        return sorted(self._queues, key=lambda guild_id: self._served.get(guild_id, (0, 0.0))[0])
+
+    def _prune_served(self, now: float):
+        # Idle guilds are forgotten once their last job is old enough
+        cutoff = now - SERVED_MEMORY_SECONDS
+        for guild_id, (_, served_at) in list(self._served.items()):
+            if served_at < cutoff and guild_id not in self._queues:
+                del self._served[guild_id]
+
+    def _next_guild(self) -> Optional[str]:
+        rotation = self._rotation()
+        return rotation[0] if rotation else None
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            self._dispatch()
+
+    def _dispatch(self):
+        while self._running < self.max_concurrent:
+            guild_id = self._next_guild()
+            if guild_id is None:
+                break
+            now = time.monotonic()
+            if now < self._paused_until:
+                self._wake_after(self._paused_until - now)
+                break
+            self._refill(now)
+            job = self._queues[guild_id][0]
+            # A job bigger than the whole bucket still runs once the bucket is full
+            needed = min(job.estimated_tokens, self.tokens_per_minute)
+            if self._tokens < needed:
+                self._wake_after((needed - self._tokens) / (self.tokens_per_minute / 60.0))
+                break
+
+            self._queues[guild_id].popleft()
+            # Round-robin: this guild goes to the back of the rotation
+            self._sequence += 1
+            self._served[guild_id] = (self._sequence, now)
+            if not self._queues[guild_id]:
+                del self._queues[guild_id]
+            self._tokens -= job.estimated_tokens
+            self._running += 1
+            self.max_wait = max(self.max_wait, now - job.enqueued_at)
+            if job.on_position:
+                job.on_position(job, 0)
+            task = asyncio.create_task(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        self._prune_served(time.monotonic())
+        self._report_positions()
+
+    def _report_positions(self):
+        # Positions follow the round-robin order: one job per guild per round
+        rounds = [list(self._queues[guild_id]) for guild_id in self._rotation()]
+        position = 0
+        for depth in range(max(map(len, rounds), default=0)):
+            for queue in rounds:
+                if depth < len(queue):
+                    position += 1
+                    job = queue[depth]
+                    if job.on_position:
+                        job.on_position(job, position)
+
+    async def _execute(self, job: VisionJob):
+        retry_delay = None
+        try:
+            job.attempts += 1
+            result = await job.fn(job)
+        except VisionAPIError as e:
+            if e.retryable and job.attempts <= self.max_retries:
+                retry_delay = self._backoff(job, e)
+            else:
+                self.failed += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+        except asyncio.CancelledError:
+            # close() cancelled a running job: its caller gets CancelledError too
+            if not job.future.done():
+                job.future.cancel()
+            raise
+        except Exception as e:
+            self.failed += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            self.completed += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._running -= 1
+            if job.tokens_used is not None:
+                # Settle the estimate against what the call actually used
+                self._tokens += job.estimated_tokens - job.tokens_used
+            self._wake()
+
+        if retry_delay is not None:
+            self.retries += 1
+            print(f"[Vision Scheduler] Retrying guild {job.guild_id} job in {retry_delay:.1f}s (attempt {job.attempts + 1})")
+            await asyncio.sleep(retry_delay)
+            # Back to the front of its guild's queue so a retry doesn't lose its place
+            self._queues.setdefault(job.guild_id, deque()).appendleft(job)
+            self._wake()
+
+    def _backoff(self, job: VisionJob, error: VisionAPIError) -> float:
+        delay = random.uniform(0.5, 1.0) * min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (job.attempts - 1))
+        if error.status == 429:
+            self.rate_limited += 1
+            delay = max(delay, error.retry_after or 0.0)
+            # Everyone else would hit the same limit: pause admissions too
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+
+class QueuePositionReporter:
+    """Shows the best queue position of an interaction's vision jobs in its deferred response"""
+
+    def __init__(self, interaction: discord.Interaction, interval: float = POSITION_EDIT_INTERVAL_SECONDS):
+        self.interaction = interaction
+        self.interval = interval
+        self._positions: Dict[int, int] = {}
+        self._shown: Optional[str] = None
+        self._last_edit = 0.0
+        self._pending: Optional[asyncio.Task] = None
+
+    def __call__(self, job: VisionJob, position: int):
+        if position:
+            self._positions[id(job)] = position
+        else:
+            self._positions.pop(id(job), None)
+        if self._pending and not self._pending.done():
+            return
+        delay = max(0.0, self._last_edit + self.interval - time.monotonic())
+        self._pending = asyncio.create_task(self._edit_after(delay))
+
+    def _render(self) -> Optional[str]:
+        if self._positions:
+            return f"⏳ Busy right now — your screenshot is #{min(self._positions.values())} in line to be read..."
+        if self._shown:
+            return "🔍 Reading your screenshot(s)..."
+        return None
+
+    async def _edit_after(self, delay: float):
+        await asyncio.sleep(delay)
+        text = self._render()
+        if text is None or text == self._shown:
+            return
+        self._last_edit = time.monotonic()
+        self._shown = text
+        try:
+            await self.interaction.edit_original_response(content=text)
+        except discord.HTTPException:
+            pass
+
+
+# Global vision scheduler instance
+vision_scheduler = VisionScheduler()